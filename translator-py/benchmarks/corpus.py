@@ -0,0 +1,71 @@
+import os
+import random
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog translation engine document page "
+    "server client request response network cache memory product feature user "
+    "settings account profile search results download upload report summary "
+    "welcome contact about privacy terms help support pricing blog news"
+).split()
+
+
+def _sentence(rng, min_words=4, max_words=14):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def html_page(rng, paragraphs):
+    """Gera uma página HTML com navegação e rodapé repetidos, como num site exportado."""
+    body = "\n".join(
+        f'<p>{_sentence(rng)} <b>{_sentence(rng, 2, 4)}</b> {_sentence(rng)}</p>'
+        for _ in range(paragraphs)
+    )
+    return (
+        "<!DOCTYPE html>\n<html><head><title>" + _sentence(rng, 2, 5) + "</title>"
+        '<meta name="description" content="' + _sentence(rng) + '"></head>\n<body>\n'
+        '<nav><a href="/" title="Home page">Home</a> <a href="/about">About us</a> '
+        '<a href="/contact">Contact</a></nav>\n'
+        f'<img src="logo.png" alt="Company logo">\n{body}\n'
+        '<input type="search" placeholder="Search the site">\n'
+        '<script>var x = 1;</script>\n'
+        '<footer><p>All rights reserved.</p><p>Privacy policy</p></footer>\n'
+        "</body></html>\n"
+    )
+
+
+def xml_document(rng, items):
+    """Gera um catálogo XML com atributos e textos traduzíveis."""
+    entries = "\n".join(
+        f'  <item id="{i}" label="{_sentence(rng, 1, 3)}"><name>{_sentence(rng, 2, 5)}</name>'
+        f'<description>{_sentence(rng)}</description></item>'
+        for i in range(items)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<catalog>\n{entries}\n</catalog>\n'
+
+
+def build_corpus(directory, html_files, xml_files, paragraphs=20, items=50, assets=0,
+                 asset_size=64 * 1024, seed=1234):
+    """Cria um corpus sintético e determinístico em `directory`.
+
+    Os arquivos são distribuídos em subpastas de 50 para reproduzir árvores
+    reais. Devolve o total de bytes gerados.
+    """
+    rng = random.Random(seed)
+    total = 0
+
+    def write(relative, content):
+        nonlocal total
+        path = os.path.join(directory, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        mode = 'wb' if isinstance(content, bytes) else 'w'
+        with open(path, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as file:
+            file.write(content)
+        total += len(content)
+
+    for i in range(html_files):
+        write(f"section{i // 50}/page{i}.html", html_page(rng, paragraphs))
+    for i in range(xml_files):
+        write(f"data{i // 50}/feed{i}.xml", xml_document(rng, items))
+    for i in range(assets):
+        write(f"static/asset{i}.bin", rng.getrandbits(asset_size * 8).to_bytes(asset_size, "little"))
+    return total
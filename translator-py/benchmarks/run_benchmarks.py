@@ -0,0 +1,237 @@
+"""Benchmark do motor de tradução com backend falso e offline.
+
+Uso:
+    python -m benchmarks.run_benchmarks --sizes 10 100 1000 --latency 0.05 --output bench.json
+    python -m benchmarks.run_benchmarks --backend stub --stub-rate 20 --rate 15 --io-workers 4
+    python -m benchmarks.run_benchmarks --backend stub --record bench.jsonl
+    python -m benchmarks.run_benchmarks --backend replay --recording bench.jsonl
+
+Cada cenário roda num processo novo, para que o pico de RSS medido seja só
+dele. O resultado é gravado em JSON para comparar versões.
+
+Com --backend stub, o GoogleBackend real (HTTP keep-alive, 429, retries)
+fala com o servidor local de stub_server.py; --backend replay reproduz
+traduções gravadas antes com --record. Nenhum dos dois usa a rede.
+"""
+import argparse
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import build_corpus
+from benchmarks.stub_server import StubTranslationServer
+from translator.backends import FakeBackend, GoogleBackend, RecordReplayBackend
+from translator.ratelimit import AdaptiveRateLimiter
+from translator.splice import scan_html, scan_xml
+from translator.translator import HTMLXMLTranslator
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_rss_bytes(who=None):
+    """Pico de RSS do processo atual (ou dos filhos, com who=RUSAGE_CHILDREN)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF if who is None else who).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure_stages(source_dir, lossless=True):
+    """Mede separadamente o parse e a serialização de todos os arquivos do corpus.
+
+    Com lossless (o padrão do motor), mede a varredura de scan_html/scan_xml
+    e a reescrita trecho a trecho do SpanDocument; sem ele, ou quando a
+    varredura não aceita o arquivo, mede o BeautifulSoup e o ElementTree.
+    """
+    parse_seconds = 0.0
+    serialize_seconds = 0.0
+    for root, _, files in os.walk(source_dir):
+        for file in files:
+            path = os.path.join(root, file)
+            if lossless and file.endswith(('.html', '.xml')):
+                start = time.perf_counter()
+                document = scan_html(path) if file.endswith('.html') else scan_xml(path)
+                parse_seconds += time.perf_counter() - start
+                if document is not None:
+                    translations = [segment.text for segment in document.segments]
+                    start = time.perf_counter()
+                    document.render(translations)
+                    serialize_seconds += time.perf_counter() - start
+                    continue
+            if file.endswith('.html'):
+                with open(path, 'r', encoding='utf-8') as handle:
+                    content = handle.read()
+                start = time.perf_counter()
+                document = BeautifulSoup(content, 'html.parser')
+                parse_seconds += time.perf_counter() - start
+                start = time.perf_counter()
+                str(document)
+                serialize_seconds += time.perf_counter() - start
+            elif file.endswith('.xml'):
+                start = time.perf_counter()
+                tree = ET.parse(path)
+                parse_seconds += time.perf_counter() - start
+                start = time.perf_counter()
+                ET.tostring(tree.getroot(), encoding='utf-8')
+                serialize_seconds += time.perf_counter() - start
+    return parse_seconds, serialize_seconds
+
+
+def run_scenario(scenario):
+    """Executa um cenário e devolve suas métricas (roda num processo próprio)."""
+    workdir = tempfile.mkdtemp(prefix="translator-bench-")
+    try:
+        source_dir = os.path.join(workdir, "source")
+        target_dir = os.path.join(workdir, "target")
+        corpus_bytes = build_corpus(
+            source_dir,
+            scenario["html_files"],
+            scenario["xml_files"],
+            assets=scenario["assets"]
+        )
+        parse_seconds, serialize_seconds = measure_stages(source_dir, scenario["lossless"])
+
+        server = None
+        if scenario["backend"] == "stub":
+            server = StubTranslationServer(
+                latency=scenario["latency"],
+                item_latency=scenario["item_latency"],
+                error_rate=scenario["error_rate"],
+                rate=scenario["stub_rate"],
+                burst=scenario["stub_burst"]
+            ).start()
+            backend = GoogleBackend(pool_size=max(10, scenario["io_workers"]), endpoint=server.url)
+        elif scenario["backend"] == "replay":
+            backend = RecordReplayBackend(scenario["recording"], mode="replay",
+                                          replay_latency=scenario["replay_latency"])
+        else:
+            backend = FakeBackend(latency=scenario["latency"], item_latency=scenario["item_latency"],
+                                  error_rate=scenario["error_rate"])
+        if scenario["record"]:
+            backend = RecordReplayBackend(scenario["record"], backend=backend, mode="auto")
+        rate_limiter = AdaptiveRateLimiter(rate=scenario["rate"]) if scenario["rate"] else None
+        translator = HTMLXMLTranslator(backend=backend, io_workers=scenario["io_workers"],
+                                       rate_limiter=rate_limiter, lossless=scenario["lossless"])
+        start = time.perf_counter()
+        try:
+            translator.translate_directory(
+                source_dir,
+                target_dir,
+                "pt-br",
+                workers=scenario["workers"],
+                incremental=False
+            )
+        finally:
+            translator.close()
+            if server is not None:
+                server.stop()
+        elapsed = time.perf_counter() - start
+        stats = translator.stats
+        files = stats["files"]
+        return dict(
+            scenario,
+            corpus_bytes=corpus_bytes,
+            elapsed_seconds=elapsed,
+            files_per_sec=files / elapsed if elapsed else 0.0,
+            segments_per_sec=stats["segments"] / elapsed if elapsed else 0.0,
+            parse_seconds=parse_seconds,
+            serialize_seconds=serialize_seconds,
+            backend_calls=stats["backend_calls"],
+            stub=server.stats() if server is not None else None,
+            peak_rss_bytes=peak_rss_bytes(),
+            peak_rss_workers_bytes=peak_rss_bytes(resource.RUSAGE_CHILDREN) if resource else None,
+            stats=stats
+        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def build_scenarios(args):
+    scenarios = []
+    for size in args.sizes:
+        for workers in args.workers:
+            scenarios.append({
+                "name": f"html{size}-xml{size // 4}-w{workers}",
+                "html_files": size,
+                "xml_files": size // 4,
+                "assets": args.assets,
+                "latency": args.latency,
+                "item_latency": args.item_latency,
+                "workers": workers,
+                "io_workers": args.io_workers,
+                "backend": args.backend,
+                "error_rate": args.error_rate,
+                "rate": args.rate,
+                "stub_rate": args.stub_rate,
+                "stub_burst": args.stub_burst,
+                "record": args.record,
+                "recording": args.recording,
+                "replay_latency": args.replay_latency,
+                "lossless": not args.no_lossless
+            })
+    return scenarios
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do HTMLXMLTranslator com backends offline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100], help="arquivos HTML por cenário")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="tamanhos do pool de arquivos")
+    parser.add_argument("--io-workers", type=int, default=1, help="threads para chamadas ao backend")
+    parser.add_argument("--assets", type=int, default=0, help="arquivos binários copiados por cenário")
+    parser.add_argument("--latency", type=float, default=0.0, help="latência simulada por chamada (s)")
+    parser.add_argument("--item-latency", type=float, default=0.0, help="latência simulada por segmento (s)")
+    parser.add_argument("--backend", choices=["fake", "stub", "replay"], default="fake",
+                        help="backend falso, servidor HTTP local ou traduções gravadas")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração das chamadas com erro")
+    parser.add_argument("--rate", type=float, default=None, help="limite adaptativo do cliente (req/s)")
+    parser.add_argument("--stub-rate", type=float, default=None, help="req/s aceitas pelo servidor local")
+    parser.add_argument("--stub-burst", type=int, default=1, help="rajada aceita pelo servidor local")
+    parser.add_argument("--record", default=None, help="grava as traduções do backend neste JSONL")
+    parser.add_argument("--recording", default=None, help="JSONL reproduzido por --backend replay")
+    parser.add_argument("--replay-latency", action="store_true",
+                        help="reproduz também a latência gravada")
+    parser.add_argument("--no-lossless", action="store_true",
+                        help="traduz e mede o parse e a serialização pela árvore (BeautifulSoup/ElementTree)")
+    parser.add_argument("--output", default="bench_results.json", help="arquivo JSON de saída")
+    args = parser.parse_args(argv)
+    if args.backend == "replay" and not args.recording:
+        parser.error("--backend replay precisa de --recording")
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for scenario in build_scenarios(args):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(run_scenario, scenario).result()
+        results.append(result)
+        print(f"{result['name']}: {result['files_per_sec']:.1f} arquivos/s, "
+              f"{result['segments_per_sec']:.1f} segmentos/s, "
+              f"{result['elapsed_seconds']:.2f}s")
+
+    report = {
+        "engine_version": HTMLXMLTranslator.engine_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"Resultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
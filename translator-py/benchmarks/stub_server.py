@@ -0,0 +1,188 @@
+"""Servidor HTTP local que imita o endpoint do Google Tradutor usado pelo GoogleBackend.
+
+Uso:
+    python -m benchmarks.stub_server --port 8765 --latency 0.05 --rate 20 --error-rate 0.01
+    python cli.py origem destino --lang es --endpoint http://127.0.0.1:8765/m
+
+Responde GET /m?tl=<idioma>&q=<texto> com o mesmo HTML da página móvel do
+Google, traduzindo cada linha como o FakeBackend ("[idioma] texto"). A
+latência, a fração de erros 5xx e um limite de requisições por segundo
+(429 quando esgotado) são configuráveis, para reproduzir throttling e
+ajustar a concorrência sem rede e sem gastar cota. GET /stats devolve os
+contadores em JSON.
+"""
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class TokenBucket:
+    """Limite de rate requisições por segundo, com rajadas de até burst."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1.0:
+                return False
+            self.tokens -= 1.0
+            return True
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/stats":
+            self._reply(200, json.dumps(self.server.stub.stats()), "application/json")
+            return
+        if url.path != "/m":
+            self._reply(404, "not found")
+            return
+        params = parse_qs(url.query, keep_blank_values=True)
+        text = params.get("q", [None])[0]
+        if text is None:
+            self._reply(400, "missing q")
+            return
+        status, body = self.server.stub.handle(text, params.get("tl", ["en"])[0])
+        self._reply(status, body, "text/html; charset=utf-8")
+
+    def _reply(self, status, body, content_type="text/plain; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubTranslationServer:
+    """Servidor de tradução falso numa thread, para testes de carga locais.
+
+    - latency / item_latency: espera por requisição e por linha do texto;
+    - jitter: variação aleatória da espera, como fração dela (0.2 = ±20%);
+    - error_rate: fração das requisições respondidas com 503;
+    - rate / burst: requisições por segundo aceitas antes de responder 429.
+
+    seed torna a sequência de erros e de jitter reproduzível. Com port=0 o
+    sistema escolhe uma porta livre; o endereço final fica em url.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, item_latency=0.0, jitter=0.0, error_rate=0.0,
+                 rate=None, burst=1, seed=0):
+        self.latency = latency
+        self.item_latency = item_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.limiter = TokenBucket(rate, burst) if rate else None
+        self.counters = {"requests": 0, "translated": 0, "segments": 0, "throttled": 0, "errors": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/m"
+
+    def handle(self, text, target):
+        """Devolve (status, corpo) da resposta para o texto pedido."""
+        lines = text.split("\n")
+        with self._lock:
+            self.counters["requests"] += 1
+            failed = self.error_rate and self._random.random() < self.error_rate
+            variation = 1.0 + self.jitter * (2 * self._random.random() - 1) if self.jitter else 1.0
+        if self.limiter is not None and not self.limiter.take():
+            self._count("throttled")
+            return 429, "Too Many Requests"
+        delay = (self.latency + self.item_latency * len(lines)) * variation
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            self._count("errors")
+            return 503, "Service Unavailable"
+        with self._lock:
+            self.counters["translated"] += 1
+            self.counters["segments"] += len(lines)
+        translated = "\n".join(f"[{target}] {line}" if line.strip() else line for line in lines)
+        return 200, f'<html><body><div class="result-container">{html.escape(translated)}</div></body></html>'
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+    def serve_forever(self):
+        """Atende na thread atual até ser interrompido."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local que imita o Google Tradutor.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="espera por requisição (s)")
+    parser.add_argument("--item-latency", type=float, default=0.0, help="espera por linha do texto (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="variação da espera, como fração dela")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração das requisições com 503")
+    parser.add_argument("--rate", type=float, default=None, help="requisições por segundo antes do 429")
+    parser.add_argument("--burst", type=int, default=1, help="rajada aceita pelo limite de requisições")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = StubTranslationServer(args.host, args.port, args.latency, args.item_latency, args.jitter,
+                                   args.error_rate, args.rate, args.burst, args.seed)
+    print(f"Servidor de tradução falso em {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(server.stats()))
+
+
+if __name__ == "__main__":
+    main()
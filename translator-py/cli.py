@@ -0,0 +1,216 @@
+"""Interface de linha de comando, sem dependência do PyQt5.
+
+Exemplo:
+    python cli.py origem destino --lang es --workers 4 --cache ~/.cache/tm.sqlite
+"""
+import argparse
+import json
+import sys
+import time
+
+from translator.backends import FakeBackend, GoogleBackend, RecordReplayBackend
+from translator.cache import TranslationMemory
+from translator.instrument import Instrumentation
+from translator.langid import LanguageDetector
+from translator.local_model import LocalModelBackend
+from translator.ratelimit import AdaptiveRateLimiter
+from translator.rules import TranslationRules
+from translator.scan import scan_directory
+from translator.translator import HTMLXMLTranslator
+
+
+class ConsoleProgress:
+    """Mostra o progresso em stderr, no máximo algumas vezes por segundo."""
+
+    def __init__(self, total, interval=0.5, stream=sys.stderr):
+        self.total = total
+        self.interval = interval
+        self.stream = stream
+        self.done = 0
+        self._last = 0.0
+
+    def __call__(self):
+        self.done += 1
+        now = time.monotonic()
+        if now - self._last >= self.interval or self.done == self.total:
+            self._last = now
+            percent = int(self.done / self.total * 100) if self.total else 100
+            self.stream.write(f"\r{self.done}/{self.total} arquivos ({percent}%)")
+            if self.done == self.total:
+                self.stream.write("\n")
+            self.stream.flush()
+
+
+def add_engine_arguments(parser):
+    """Opções do backend e do tradutor, comuns à linha de comando e ao server.py."""
+    parser.add_argument("--backend", choices=["google", "fake", "local"], default="google",
+                        help="serviço de tradução (fake e local não usam rede)")
+    parser.add_argument("--endpoint", default=None,
+                        help="URL usada pelo backend google no lugar do Google (ex.: benchmarks/stub_server.py)")
+    parser.add_argument("--record", default=None,
+                        help="grava as respostas do backend neste arquivo JSONL")
+    parser.add_argument("--replay", default=None,
+                        help="responde só com as traduções gravadas neste arquivo, sem rede")
+    parser.add_argument("--model-dir", default=None,
+                        help="modelos do backend local, uma subpasta por idioma (pt, es...)")
+    parser.add_argument("--model-workers", type=int, default=None,
+                        help="processos do backend local (padrão: um por núcleo)")
+    parser.add_argument("--io-workers", type=int, default=1, help="lotes simultâneos no backend")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="segmentos por lote (padrão: o do motor, 200)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="requisições por segundo iniciais do limitador adaptativo")
+    parser.add_argument("--cache", default=None, help="arquivo SQLite da memória de tradução")
+    parser.add_argument("--cache-size", type=int, default=500000, help="máximo de entradas da memória")
+    parser.add_argument("--link-assets", choices=["hardlink", "reflink"], default=None,
+                        help="liga os arquivos não traduzíveis em vez de copiá-los")
+    parser.add_argument("--rules", default=None,
+                        help="arquivo JSON com glossário, termos e seletores que não devem ser traduzidos")
+    parser.add_argument("--no-lossless", action="store_true",
+                        help="reserializa o documento inteiro em vez de trocar só os trechos traduzidos")
+    parser.add_argument("--skip-target-language", action="store_true",
+                        help="não envia ao backend textos que já estão no idioma de destino")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Traduz uma árvore de arquivos HTML/XML.")
+    parser.add_argument("source", help="diretório de origem")
+    parser.add_argument("target", help="diretório de destino")
+    parser.add_argument("--lang", default="pt-br",
+                        help="idioma de destino (padrão: pt-br); vários separados por vírgula, "
+                             "gravados em destino/<idioma>")
+    add_engine_arguments(parser)
+    parser.add_argument("--workers", type=int, default=1, help="processos para parse e gravação")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process",
+                        help="tipo de pool usado por --workers")
+    parser.add_argument("--no-dedupe", action="store_true", help="desativa a passagem de deduplicação")
+    parser.add_argument("--no-incremental", action="store_true", help="reprocessa todos os arquivos")
+    parser.add_argument("--resume", action="store_true",
+                        help="continua um trabalho interrompido a partir do diário no destino")
+    parser.add_argument("--deterministic", action="store_true", help="executa tudo em série e em ordem")
+    parser.add_argument("--quiet", action="store_true", help="não mostra o progresso")
+    parser.add_argument("--stats-file", default=None, help="grava as estatísticas em JSON neste arquivo")
+    parser.add_argument("--timings", default=None,
+                        help="grava os tempos por etapa neste arquivo (.prom para o formato do Prometheus, senão JSON)")
+    parser.add_argument("--profile", default=None,
+                        help="executa sob o cProfile e grava os dados neste arquivo (.prof)")
+    return parser
+
+
+def build_backend(args):
+    if args.replay:
+        if args.record:
+            raise ValueError("Use --record ou --replay, não os dois")
+        return RecordReplayBackend(args.replay, mode="replay")
+    if args.backend == "fake":
+        backend = FakeBackend()
+    elif args.backend == "local":
+        if not args.model_dir:
+            raise ValueError("--backend local precisa de --model-dir")
+        backend = LocalModelBackend.from_directory(args.model_dir, workers=args.model_workers)
+    else:
+        backend = GoogleBackend(pool_size=max(10, args.io_workers), endpoint=args.endpoint)
+    if args.record:
+        backend = RecordReplayBackend(args.record, backend=backend, mode="record")
+    return backend
+
+
+def translator_options(args):
+    """Parâmetros do HTMLXMLTranslator vindos de add_engine_arguments, exceto backend e cache.
+
+    Sem --batch-size, o tamanho do lote fica com o padrão do motor.
+    """
+    options = {
+        "io_workers": args.io_workers,
+        "rate_limiter": AdaptiveRateLimiter(rate=args.rate) if args.rate else None,
+        "asset_link": args.link_assets,
+        "language_detector": LanguageDetector() if args.skip_target_language else None,
+        "lossless": not args.no_lossless,
+        "rules": TranslationRules.load(args.rules) if args.rules else None
+    }
+    if args.batch_size is not None:
+        options["batch_size"] = args.batch_size
+    return options
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    backend = build_backend(args)
+    cache = TranslationMemory(args.cache, max_entries=args.cache_size) if args.cache else None
+    instrumentation = None
+    if args.timings or args.profile:
+        instrumentation = Instrumentation(profile=bool(args.profile))
+    translator = HTMLXMLTranslator(
+        backend=backend,
+        cache=cache,
+        instrumentation=instrumentation,
+        **translator_options(args)
+    )
+
+    file_index = scan_directory(args.source)
+    progress = None
+    if not args.quiet:
+        progress = ConsoleProgress(file_index.translatable_count)
+
+    start = time.perf_counter()
+    try:
+        languages = [language.strip() for language in args.lang.split(",") if language.strip()]
+        if len(languages) > 1:
+            translator.translate_languages(
+                args.source,
+                args.target,
+                languages,
+                progress,
+                dedupe=not args.no_dedupe,
+                workers=args.workers,
+                executor=args.executor,
+                deterministic=args.deterministic,
+                incremental=not args.no_incremental,
+                resume=args.resume,
+                file_index=file_index
+            )
+        else:
+            translator.translate_directory(
+                args.source,
+                args.target,
+                args.lang,
+                progress,
+                dedupe=not args.no_dedupe,
+                workers=args.workers,
+                executor=args.executor,
+                deterministic=args.deterministic,
+                incremental=not args.no_incremental,
+                resume=args.resume,
+                file_index=file_index
+            )
+    finally:
+        translator.close()
+        if cache is not None:
+            cache.close()
+    elapsed = time.perf_counter() - start
+
+    stats = dict(translator.stats)
+    stats["elapsed_seconds"] = elapsed
+    stats["files_per_sec"] = stats["files"] / elapsed if elapsed else 0.0
+    stats["segments_per_sec"] = stats["segments"] / elapsed if elapsed else 0.0
+    report = json.dumps(stats, indent=2)
+    if args.timings:
+        if args.timings.endswith('.prom'):
+            with open(args.timings, 'w', encoding='utf-8') as file:
+                file.write(instrumentation.to_prometheus())
+        else:
+            instrumentation.to_json(args.timings)
+    if args.profile:
+        instrumentation.dump_profile(args.profile)
+        if not args.quiet:
+            sys.stderr.write(instrumentation.profile_report(limit=20))
+    if args.stats_file:
+        with open(args.stats_file, 'w', encoding='utf-8') as file:
+            file.write(report)
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
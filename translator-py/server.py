@@ -0,0 +1,64 @@
+"""Modo serviço: mantém o tradutor carregado e atende traduções por HTTP.
+
+Exemplo:
+    python server.py --port 8080 --cache ~/.cache/tm.sqlite --root /srv/sites
+    curl -d '{"content": "<p>Olá</p>", "lang": "es"}' http://127.0.0.1:8080/fragment
+
+Endpoints: POST /fragment {"content", "lang", "kind": "html"|"xml"},
+POST /file e /directory {"source", "target", "lang"} (caminhos relativos a
+--root), GET /stats, /metrics e /health. Com --socket, o serviço atende
+num socket Unix em vez de TCP.
+"""
+import argparse
+import sys
+
+from cli import add_engine_arguments, build_backend, translator_options
+from translator.cache import TranslationMemory
+from translator.service import TranslationService, make_server
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serviço HTTP de tradução de HTML/XML.")
+    parser.add_argument("--host", default="127.0.0.1", help="endereço de escuta (padrão: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="porta TCP (padrão: 8080)")
+    parser.add_argument("--socket", default=None, help="atende num socket Unix neste caminho em vez de TCP")
+    parser.add_argument("--root", default=None,
+                        help="diretório permitido para /file e /directory (sem ele, ficam desativados)")
+    parser.add_argument("--lang", default="pt-br", help="idioma de destino padrão (padrão: pt-br)")
+    parser.add_argument("--memory-entries", type=int, default=200000,
+                        help="traduções mantidas em memória entre requisições")
+    parser.add_argument("--max-workers", type=int, default=None,
+                        help="limite de workers por requisição /directory (padrão: um por núcleo)")
+    add_engine_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    cache = TranslationMemory(args.cache or ":memory:", max_entries=args.cache_size)
+    service = TranslationService(
+        backend=build_backend(args),
+        cache=cache,
+        root=args.root,
+        default_language=args.lang,
+        max_memory_entries=args.memory_entries,
+        max_workers=args.max_workers,
+        **translator_options(args)
+    )
+    server = make_server(service, args.host, args.port, args.socket)
+    address = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"Serviço de tradução em {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
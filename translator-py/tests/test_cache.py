@@ -0,0 +1,41 @@
+import unittest
+
+from translator.cache import TranslationMemory
+
+
+class EvictionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.memory = TranslationMemory(":memory:", max_entries=100)
+        self.addCleanup(self.memory.close)
+        self.statements = []
+        self.memory._conn.set_trace_callback(self.statements.append)
+
+    def counts(self):
+        return sum(1 for statement in self.statements if "COUNT(*)" in statement)
+
+    def test_writes_below_the_limit_do_not_count_rows(self):
+        for index in range(50):
+            self.memory.put(f"texto {index}", f"text {index}", "en")
+        self.assertEqual(self.counts(), 0)
+
+    def test_eviction_keeps_the_most_recently_used(self):
+        for index in range(300):
+            self.memory.put(f"texto {index}", f"text {index}", "en")
+            self.assertLessEqual(len(self.memory), 100)
+        self.assertEqual(self.memory.get("texto 299", "en"), "text 299")
+        self.assertIsNone(self.memory.get("texto 0", "en"))
+
+    def test_rows_are_recounted_only_after_the_margin_fills(self):
+        for index in range(300):
+            self.memory.put(f"texto {index}", f"text {index}", "en")
+        self.assertLessEqual(self.counts(), 300 // 5)
+
+    def test_replacements_do_not_evict(self):
+        for _ in range(5):
+            self.memory.put_many([(f"texto {index}", f"text {index}") for index in range(80)], "en")
+        self.assertEqual(len(self.memory), 80)
+
+
+if __name__ == "__main__":
+    unittest.main()
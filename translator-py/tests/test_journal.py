@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from translator.journal import JobJournal
+
+
+class JobJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.target = tempfile.mkdtemp(prefix="translator-test-")
+        self.addCleanup(shutil.rmtree, self.target, ignore_errors=True)
+
+    def journal(self):
+        return JobJournal("source", self.target, "pt", "2.1")
+
+    def write_job(self):
+        journal = self.journal()
+        journal.open()
+        journal.record_segments([("Hello", "Olá")], "pt")
+        journal.record_file(os.path.join("source", "page.html"))
+        journal.close()
+        return journal.path
+
+    def test_resume_reads_segments_and_completed_files(self):
+        self.write_job()
+        with open(self.journal().path, "a", encoding="utf-8") as file:
+            file.write('{"type": "file", "pa')
+        self.assertEqual(self.journal().load(), ({"page.html"}, {"pt": {"Hello": "Olá"}}))
+
+    def test_unreadable_header_is_not_resumed(self):
+        path = self.write_job()
+        with open(path, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join([lines[0][:-5]] + lines[1:]) + "\n")
+        self.assertIsNone(self.journal().load())
+
+        journal = self.journal()
+        self.assertEqual(journal.open(resume=True), (set(), {}))
+        journal.close()
+
+    def test_journal_of_another_job_is_not_resumed(self):
+        self.write_job()
+        self.assertIsNone(JobJournal("source", self.target, "en", "2.1").load())
+
+
+if __name__ == "__main__":
+    unittest.main()
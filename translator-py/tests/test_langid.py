@@ -0,0 +1,99 @@
+import unittest
+
+from translator.langid import LanguageDetector
+
+# Frases rotuladas fora dos textos de referência, com pares próximos
+# (pt/es, fr/it, es/it) dizendo a mesma coisa.
+CORPUS = [
+    ("pt", "A reunião foi adiada para a próxima semana por causa da chuva."),
+    ("pt", "Clique aqui para baixar o relatório completo em formato PDF."),
+    ("pt", "Nossa loja fica aberta de segunda a sábado, das nove às dezoito horas."),
+    ("pt", "O prazo para entregar os documentos termina no fim do mês."),
+    ("pt", "Esqueceu a sua senha? Enviaremos um link para o seu e-mail."),
+    ("pt", "Os alunos precisam trazer o material escolar no primeiro dia de aula."),
+    ("pt", "Não foi possível salvar as alterações porque o arquivo está bloqueado."),
+    ("pt", "A empresa contratou mais de duzentos funcionários no último ano."),
+    ("pt", "Você pode alterar as configurações da conta a qualquer momento."),
+    ("pt", "O jogo terminou empatado e os torcedores saíram decepcionados do estádio."),
+    ("es", "La reunión se aplazó hasta la próxima semana por culpa de la lluvia."),
+    ("es", "Haga clic aquí para descargar el informe completo en formato PDF."),
+    ("es", "Nuestra tienda abre de lunes a sábado, de nueve a seis de la tarde."),
+    ("es", "El plazo para entregar los documentos termina a final de mes."),
+    ("es", "¿Ha olvidado su contraseña? Le enviaremos un enlace a su correo."),
+    ("es", "Los alumnos tienen que traer el material escolar el primer día de clase."),
+    ("es", "No se han podido guardar los cambios porque el archivo está bloqueado."),
+    ("es", "La empresa contrató a más de doscientos empleados el año pasado."),
+    ("es", "Puede cambiar la configuración de la cuenta en cualquier momento."),
+    ("es", "El partido terminó en empate y los aficionados salieron decepcionados del estadio."),
+    ("fr", "La réunion a été reportée à la semaine prochaine à cause de la pluie."),
+    ("fr", "Cliquez ici pour télécharger le rapport complet au format PDF."),
+    ("fr", "Notre magasin est ouvert du lundi au samedi, de neuf heures à dix-huit heures."),
+    ("fr", "Le délai pour remettre les documents se termine à la fin du mois."),
+    ("fr", "Vous avez oublié votre mot de passe ? Nous vous enverrons un lien par courriel."),
+    ("fr", "Les élèves doivent apporter leurs fournitures scolaires le premier jour."),
+    ("fr", "Impossible d'enregistrer les modifications parce que le fichier est verrouillé."),
+    ("fr", "L'entreprise a embauché plus de deux cents salariés l'année dernière."),
+    ("fr", "Vous pouvez modifier les paramètres de votre compte à tout moment."),
+    ("fr", "Le match s'est terminé sur un nul et les supporters ont quitté le stade déçus."),
+    ("it", "La riunione è stata rinviata alla prossima settimana a causa della pioggia."),
+    ("it", "Fai clic qui per scaricare la relazione completa in formato PDF."),
+    ("it", "Il nostro negozio è aperto dal lunedì al sabato, dalle nove alle diciotto."),
+    ("it", "Il termine per consegnare i documenti scade alla fine del mese."),
+    ("it", "Hai dimenticato la password? Ti invieremo un collegamento via posta elettronica."),
+    ("it", "Gli studenti devono portare il materiale scolastico il primo giorno di lezione."),
+    ("it", "Non è stato possibile salvare le modifiche perché il file è bloccato."),
+    ("it", "L'azienda ha assunto più di duecento dipendenti nell'ultimo anno."),
+    ("it", "Puoi modificare le impostazioni dell'account in qualsiasi momento."),
+    ("it", "La partita è finita in pareggio e i tifosi sono usciti delusi dallo stadio."),
+    ("en", "The meeting has been postponed until next week because of the rain."),
+    ("en", "Click here to download the full report in PDF format."),
+    ("en", "Our shop is open from Monday to Saturday, from nine to six."),
+    ("en", "The deadline for handing in the documents is the end of the month."),
+    ("en", "Forgot your password? We will send a link to your email address."),
+    ("en", "Students need to bring their school supplies on the first day of class."),
+    ("en", "The changes could not be saved because the file is locked."),
+    ("en", "The company hired more than two hundred employees last year."),
+    ("en", "You can change your account settings at any time."),
+    ("en", "The match ended in a draw and the fans left the stadium disappointed."),
+    ("de", "Die Besprechung wurde wegen des Regens auf nächste Woche verschoben."),
+    ("de", "Klicken Sie hier, um den vollständigen Bericht als PDF herunterzuladen."),
+    ("de", "Unser Geschäft ist von Montag bis Samstag von neun bis achtzehn Uhr geöffnet."),
+    ("de", "Die Frist für die Abgabe der Unterlagen endet am Monatsende."),
+    ("de", "Passwort vergessen? Wir schicken Ihnen einen Link an Ihre E-Mail-Adresse."),
+    ("de", "Die Schüler müssen am ersten Schultag ihre Schulsachen mitbringen."),
+    ("de", "Die Änderungen konnten nicht gespeichert werden, weil die Datei gesperrt ist."),
+    ("de", "Das Unternehmen hat im letzten Jahr mehr als zweihundert Mitarbeiter eingestellt."),
+    ("de", "Sie können die Kontoeinstellungen jederzeit ändern."),
+    ("de", "Das Spiel endete unentschieden und die Fans verließen enttäuscht das Stadion."),
+]
+
+
+class LanguageDetectorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.detector = LanguageDetector()
+
+    def test_never_confirms_the_wrong_language(self):
+        for language, text in CORPUS:
+            detected = self.detector.detect(text)
+            self.assertIn(detected, (language, None), text)
+            for other in self.detector.languages:
+                if other != language:
+                    self.assertFalse(self.detector.is_language(text, other), (other, text))
+
+    def test_identifies_most_of_each_language(self):
+        for language in self.detector.languages:
+            texts = [text for label, text in CORPUS if label == language]
+            found = sum(1 for text in texts if self.detector.detect(text) == language)
+            self.assertGreaterEqual(found / len(texts), 0.8, language)
+
+    def test_regional_code_uses_base_profile(self):
+        self.assertTrue(self.detector.is_language("Clique aqui para baixar o relatório completo em formato PDF.",
+                                                  "pt-br"))
+
+    def test_short_text_is_left_to_the_backend(self):
+        self.assertIsNone(self.detector.detect("Olá mundo"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from translator.backends import FakeBackend
+from translator.rules import TranslationRules
+from translator.translator import HTMLXMLTranslator
+
+
+class GlossaryLanguageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="translator-test-")
+        self.source = os.path.join(self.workdir, "source")
+        os.makedirs(self.source)
+        for index in range(2):
+            with open(os.path.join(self.source, f"page{index}.html"), "w", encoding="utf-8") as file:
+                file.write(f"<html><body><p>free</p><p>Get it free today</p><p>Page {index}</p></body></html>")
+        self.rules = TranslationRules(glossary={"free": {"pt-br": "GRATIS", "es": "GRATIS-ES"}})
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def translate(self, language, **options):
+        target = os.path.join(self.workdir, "target")
+        translator = HTMLXMLTranslator(backend=FakeBackend(), rules=self.rules)
+        translator.translate_directory(self.source, target, language, incremental=False, **options)
+        with open(os.path.join(target, "page0.html"), encoding="utf-8") as file:
+            return translator, file.read()
+
+    def test_regional_code_uses_its_glossary_entry(self):
+        _, output = self.translate("pt-br")
+        self.assertIn("<p>GRATIS</p>", output)
+        self.assertIn("[pt] Get it GRATIS today", output)
+
+    def test_backend_code_still_matches(self):
+        _, output = self.translate("es")
+        self.assertIn("[es] Get it GRATIS-ES today", output)
+
+    def test_protected_segments_counted_once(self):
+        for options in ({"dedupe": True}, {"dedupe": False}, {"workers": 2, "executor": "process"}):
+            translator, _ = self.translate("pt-br", **options)
+            self.assertEqual(translator.stats["protected_segments"], 2, options)
+            self.assertEqual(translator.stats["glossary_terms"], 4, options)
+
+    def test_restore_accepts_aliases(self):
+        protected, terms = self.rules.protect("free")
+        self.assertEqual(self.rules.restore(protected, terms, "pt"), "free")
+        self.assertEqual(self.rules.restore(protected, terms, "pt", ["pt-br"]), "GRATIS")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+from translator.segmentation import PLACEHOLDER, decode_inline, encode_inline, pack_payloads, split_sentences
+
+
+class SplitSentencesTest(unittest.TestCase):
+
+    def test_short_sentences_are_grouped_up_to_the_limit(self):
+        text = "Primeira frase curta. Segunda frase curta. Terceira frase curta."
+        parts = split_sentences(text, 45)
+        self.assertEqual(parts, ["Primeira frase curta. Segunda frase curta.", "Terceira frase curta."])
+
+    def test_long_sentence_is_cut_at_spaces(self):
+        parts = split_sentences("palavra " * 20, 30)
+        self.assertTrue(all(len(part) <= 30 for part in parts))
+        self.assertEqual(" ".join(parts).split(), ["palavra"] * 20)
+
+    def test_sentence_end_inside_placeholder_does_not_split(self):
+        text = "Veja <x1>o aviso. Depois continue</x1> a leitura. Fim do texto."
+        for part in split_sentences(text, 30):
+            self.assertEqual(part.count("<x1>"), part.count("</x1>"), part)
+
+    def test_hard_cut_never_leaves_a_placeholder_open(self):
+        texts = [
+            "palavra " * 5 + "<x1>texto dentro do placeholder aberto</x1> fim da frase",
+            "a" * 10 + "<x1>" + "b" * 40 + "</x1>" + "c" * 10,
+            "<x1>" + "semespaco" * 10 + "</x1><x2>outro</x2>" + "d" * 30,
+        ]
+        for text in texts:
+            parts = split_sentences(text, 20)
+            for part in parts:
+                self.assertNotRegex(PLACEHOLDER.sub("", part), r"</?x\d+>")
+            self.assertIsNotNone(decode_inline(" ".join(parts), text.count("</x")))
+            self.assertEqual("".join(parts).replace(" ", ""), text.replace(" ", ""))
+
+    def test_hard_cut_keeps_entities_whole(self):
+        parts = split_sentences("a&amp;b&lt;c" * 4, 5)
+        self.assertEqual("".join(parts), "a&amp;b&lt;c" * 4)
+        for part in parts:
+            self.assertNotRegex(part, r"&(?!amp;|lt;)")
+
+
+class InlineEncodingTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        pieces = ["Leia o ", (1, "manual"), " e a ", (2, "nota <1> & cia"), " antes."]
+        encoded = encode_inline(pieces)
+        self.assertEqual(encoded, "Leia o <x1>manual</x1> e a <x2>nota &lt;1> &amp; cia</x2> antes.")
+        self.assertEqual(decode_inline(encoded, 2), pieces)
+
+    def test_text_that_looks_like_a_placeholder_round_trips(self):
+        pieces = ["use <x1>literal</x1> aqui ", (1, "ok")]
+        self.assertEqual(decode_inline(encode_inline(pieces), 1), pieces)
+
+    def test_reordered_placeholders_are_accepted(self):
+        self.assertEqual(decode_inline("<x2>b</x2> e <x1>a</x1>", 2), [(2, "b"), " e ", (1, "a")])
+
+    def test_lost_repeated_or_broken_placeholders_are_rejected(self):
+        self.assertIsNone(decode_inline("sem marcação", 1))
+        self.assertIsNone(decode_inline("<x1>a</x1> <x1>b</x1>", 1))
+        self.assertIsNone(decode_inline("<x1>a</x1> <x3>b</x3>", 2))
+        self.assertIsNone(decode_inline("<x1>a</x1> <x2>b", 2))
+
+
+class PackPayloadsTest(unittest.TestCase):
+
+    def test_payloads_respect_the_limit(self):
+        texts = ["texto %d" % index * (index % 5 + 1) for index in range(40)]
+        payloads = pack_payloads(texts, 50)
+        self.assertEqual([index for payload in payloads for index in payload], list(range(40)))
+        for payload in payloads:
+            size = sum(len(texts[index]) for index in payload) + len(payload) - 1
+            self.assertLessEqual(size, 50)
+
+    def test_separator_counts_towards_the_limit(self):
+        self.assertEqual(pack_payloads(["a" * 5, "b" * 5], 10), [[0], [1]])
+        self.assertEqual(pack_payloads(["a" * 5, "b" * 5], 11), [[0, 1]])
+        self.assertEqual(pack_payloads(["a" * 5, "b" * 5], 12, separator="||"), [[0, 1]])
+
+    def test_oversized_text_gets_its_own_payload(self):
+        self.assertEqual(pack_payloads(["a", "b" * 30, "c"], 10), [[0], [1], [2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
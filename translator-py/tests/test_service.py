@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.corpus import build_corpus
+from translator.backends import FakeBackend
+from translator.service import ServiceError, TranslationService
+
+
+class DirectoryWorkersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="translator-test-")
+        build_corpus(os.path.join(self.root, "site"), html_files=2, xml_files=1)
+        self.service = TranslationService(backend=FakeBackend(), root=self.root, max_workers=2)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.addCleanup(self.service.close)
+        self.requested = []
+        translate_directory = self.service.job_translator.translate_directory
+
+        def record(*args, **kwargs):
+            self.requested.append(kwargs["workers"])
+            return translate_directory(*args, **kwargs)
+
+        self.service.job_translator.translate_directory = record
+
+    def directory(self, workers):
+        return self.service.handle("directory", {"source": "site", "target": "site-pt", "workers": workers})
+
+    def test_workers_are_clamped_to_the_configured_maximum(self):
+        self.directory(64)
+        self.assertEqual(self.requested, [2])
+
+    def test_smaller_requests_are_kept(self):
+        self.directory(1)
+        self.assertEqual(self.requested, [1])
+
+    def test_invalid_workers_are_rejected(self):
+        for workers in (0, -3, "4", 2.5, True, None):
+            with self.assertRaises(ServiceError) as raised:
+                self.directory(workers)
+            self.assertEqual(raised.exception.status_code, 400)
+        self.assertEqual(self.requested, [])
+
+
+class LanguageFieldTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="translator-test-")
+        build_corpus(os.path.join(self.root, "site"), html_files=1, xml_files=0)
+        self.service = TranslationService(backend=FakeBackend(), root=self.root)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.addCleanup(self.service.close)
+        self.page = os.path.relpath(next(os.path.join(root, name) for root, _, files in os.walk(
+            os.path.join(self.root, "site")) for name in files if name.endswith(".html")), self.root)
+
+    def requests(self, language):
+        return [
+            ("fragment", {"content": "<p>Olá mundo bonito</p>", "lang": language}),
+            ("file", {"source": self.page, "target": "page-out.html", "lang": language}),
+            ("directory", {"source": "site", "target": "site-out", "lang": language}),
+        ]
+
+    def test_invalid_language_is_rejected(self):
+        for language in ("", "   ", 42, ["en"], {"code": "en"}, True):
+            for endpoint, payload in self.requests(language):
+                with self.assertRaises(ServiceError) as raised:
+                    self.service.handle(endpoint, payload)
+                self.assertEqual(raised.exception.status_code, 400, (endpoint, language))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "site-out")))
+
+    def test_missing_language_uses_the_default(self):
+        result = self.service.handle("fragment", {"content": "<p>Olá mundo bonito</p>"})
+        self.assertIn("[pt]", result["content"])
+        result = self.service.handle("fragment", {"content": "<p>Olá mundo bonito</p>", "lang": "en"})
+        self.assertIn("[en]", result["content"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+from translator import splice
+from translator.backends import FakeBackend
+from translator.splice import scan_html, scan_html_text, scan_xml, scan_xml_bytes
+from translator.translator import HTMLXMLTranslator
+
+HTML = (
+    '<!DOCTYPE html>\r\n<html><head><title>Página de teste</title></head>\r\n'
+    '<body>\r\n<!-- comentário que não muda -->\r\n'
+    '<p class=intro>Tom &amp; Jerry &eacute; um desenho antigo</p>\r\n'
+    '<a href="/busca?a=1&amp;b=2" title="Abrir a busca">Buscar no site inteiro</a>\r\n'
+    '<p>Leia o <B class="forte">manual completo</B > antes de começar</p>\r\n'
+    '</body></html>\r\n'
+)
+XML = (
+    '<?xml version="1.0" encoding="utf-8"?>\r\n<!-- comentário que não muda -->\r\n'
+    '<doc lang="pt">\r\n  <item label="Nome do produto">Caneta azul &amp; caderno</item>\r\n'
+    '  <nota><![CDATA[Texto dentro de CDATA com <marcação>]]></nota>\r\n'
+    '  <codigo><![CDATA[12345]]></codigo>\r\n'
+    '  <vazio/>\r\n</doc>\r\n'
+)
+
+
+def prefixed(document):
+    return ["[pt] " + segment.text for segment in document.segments]
+
+
+class HTMLSpliceTest(unittest.TestCase):
+
+    def test_identity_translation_is_byte_identical(self):
+        document = scan_html_text(HTML)
+        self.assertEqual(document.render([segment.text for segment in document.segments]), HTML)
+
+    def test_markup_outside_segments_survives(self):
+        document = scan_html_text(HTML)
+        rendered = document.render(prefixed(document))
+        self.assertIn('<title>[pt] Página de teste</title>', rendered)
+        self.assertIn('<!-- comentário que não muda -->\r\n', rendered)
+        self.assertIn('<a href="/busca?a=1&amp;b=2" title="[pt] Abrir a busca">', rendered)
+        self.assertIn('[pt] Tom &amp; Jerry é um desenho antigo', rendered)
+        self.assertIn('<B class="forte">manual completo</B > antes', rendered)
+        self.assertEqual(rendered.count('\r\n'), HTML.count('\r\n'))
+        self.assertNotIn('\n', rendered.replace('\r\n', ''))
+
+    def test_scan_across_chunk_boundaries(self):
+        expected = scan_html_text(HTML)
+        for size in (1, 3, 7, 16):
+            with mock.patch.object(splice, '_CHUNK_SIZE', size):
+                document = scan_html_text(HTML)
+                self.assertEqual([(s.kind, s.start, s.end) for s in document.segments],
+                                 [(s.kind, s.start, s.end) for s in expected.segments], size)
+                self.assertEqual(document.render(prefixed(document)), expected.render(prefixed(expected)))
+
+    def test_implicitly_closed_inline_element_gets_no_closing_tag(self):
+        source = '<p>Leia o <b>manual completo antes de começar</p>'
+        document = scan_html_text(source)
+        self.assertEqual([segment.kind for segment in document.segments], ['text', 'text'])
+        rendered = document.render(prefixed(document))
+        self.assertEqual(rendered, '<p>[pt] Leia o <b>[pt] manual completo antes de começar</p>')
+
+
+class XMLSpliceTest(unittest.TestCase):
+
+    def test_identity_translation_is_byte_identical(self):
+        content = XML.encode('utf-8')
+        document = scan_xml_bytes(content)
+        self.assertEqual(document.render([segment.text for segment in document.segments]), content)
+
+    def test_entities_comments_and_cdata_survive(self):
+        document = scan_xml_bytes(XML.encode('utf-8'))
+        rendered = document.render(prefixed(document)).decode('utf-8')
+        self.assertIn('<item label="[pt] Nome do produto">[pt] Caneta azul &amp; caderno</item>', rendered)
+        self.assertIn('<!-- comentário que não muda -->\r\n', rendered)
+        self.assertIn('<codigo><![CDATA[12345]]></codigo>\r\n', rendered)
+        self.assertEqual(ET.fromstring(rendered.encode('utf-8')).find('nota').text,
+                         '[pt] Texto dentro de CDATA com <marcação>')
+        self.assertIn('<vazio/>\r\n</doc>\r\n', rendered)
+
+    def test_scan_across_chunk_boundaries(self):
+        content = XML.encode('utf-8')
+        expected = scan_xml_bytes(content)
+        for size in (1, 3, 7, 16):
+            with mock.patch.object(splice, '_CHUNK_SIZE', size):
+                document = scan_xml_bytes(content)
+                self.assertEqual([(s.kind, s.start, s.end) for s in document.segments],
+                                 [(s.kind, s.start, s.end) for s in expected.segments], size)
+                self.assertEqual(document.render(prefixed(document)), expected.render(prefixed(expected)))
+
+    def test_single_byte_encoding_is_kept(self):
+        content = XML.replace('utf-8', 'iso-8859-1').encode('iso-8859-1')
+        document = scan_xml_bytes(content)
+        self.assertEqual(document.encoding, 'iso-8859-1')
+        self.assertEqual(document.render([segment.text for segment in document.segments]), content)
+        rendered = document.render([segment.text + " 10 €" for segment in document.segments])
+        self.assertIn('Nome do produto 10 &#8364;'.encode('iso-8859-1'), rendered)
+        self.assertIn('comentário'.encode('iso-8859-1'), rendered)
+
+    def test_utf16_is_left_to_the_tree(self):
+        self.assertIsNone(scan_xml_bytes(XML.replace('utf-8', 'utf-16').encode('utf-16')))
+
+
+class FallbackTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="splice-test-")
+        self.source = os.path.join(self.workdir, "source")
+        self.target = os.path.join(self.workdir, "target")
+        os.makedirs(self.source)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def write(self, name, content):
+        path = os.path.join(self.source, name)
+        with open(path, 'wb') as file:
+            file.write(content)
+        return path
+
+    def test_unscannable_files_use_the_tree(self):
+        html = self.write("latin.html", '<html><head><title>Preço</title></head><body>'
+                          '<p>Produto em oferta hoje</p></body></html>'.encode('latin-1'))
+        xml = self.write("wide.xml", XML.replace('utf-8', 'utf-16').encode('utf-16'))
+        self.assertIsNone(scan_html(html))
+        self.assertIsNone(scan_xml(xml))
+
+        HTMLXMLTranslator(backend=FakeBackend()).translate_directory(self.source, self.target)
+        with open(os.path.join(self.target, "latin.html"), encoding='utf-8') as file:
+            self.assertIn("[pt] Produto em oferta hoje", file.read())
+        with open(os.path.join(self.target, "wide.xml"), encoding='utf-8') as file:
+            self.assertIn("[pt] Caneta azul &amp; caderno", file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
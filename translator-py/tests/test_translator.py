@@ -0,0 +1,246 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks.corpus import build_corpus
+from translator.backends import FakeBackend
+from translator.control import JobControl, TranslationCancelled
+from translator.manifest import Manifest
+from translator.scan import scan_directory
+from translator.segments import is_translatable, normalize
+from translator.translator import HTMLXMLTranslator
+from translator.xml_stream import StreamingXMLTranslator
+
+
+class CancellingBackend(FakeBackend):
+    """FakeBackend que cancela o trabalho depois de algumas chamadas."""
+
+    def __init__(self, control, cancel_after):
+        super().__init__()
+        self.control = control
+        self.cancel_after = cancel_after
+
+    def translate_batch(self, texts, target):
+        translated = super().translate_batch(texts, target)
+        if self.calls >= self.cancel_after:
+            self.control.cancel()
+        return translated
+
+
+class RecordingBackend(FakeBackend):
+    """FakeBackend que guarda o idioma de cada chamada, na ordem."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.targets = []
+
+    def translate_batch(self, texts, target):
+        self.targets.append(target)
+        return super().translate_batch(texts, target)
+
+
+class TranslatorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="translator-test-")
+        self.source = os.path.join(self.workdir, "source")
+        self.target = os.path.join(self.workdir, "target")
+        build_corpus(self.source, html_files=4, xml_files=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def read(self, *parts):
+        with open(os.path.join(*parts), encoding='utf-8') as file:
+            return file.read()
+
+    def translated_files(self, marker="[pt]"):
+        found = []
+        for root, _, files in os.walk(self.target):
+            for name in files:
+                if name.endswith(('.html', '.xml')) and marker in self.read(root, name):
+                    found.append(name)
+        return found
+
+
+class ResumeTest(TranslatorTestCase):
+
+    def test_resume_reuses_chunks_translated_before_cancel(self):
+        full = HTMLXMLTranslator(backend=FakeBackend(), batch_size=10)
+        full.translate_directory(self.source, os.path.join(self.workdir, "full"), incremental=False)
+        total_calls = full.stats["backend_calls"]
+
+        control = JobControl()
+        backend = CancellingBackend(control, cancel_after=5)
+        translator = HTMLXMLTranslator(backend=backend, batch_size=10)
+        with self.assertRaises(TranslationCancelled):
+            translator.translate_directory(self.source, self.target, control=control, incremental=False)
+
+        resumed = HTMLXMLTranslator(backend=FakeBackend(), batch_size=10)
+        resumed.translate_directory(self.source, self.target, resume=True, incremental=False)
+        self.assertGreaterEqual(resumed.stats["resumed_segments"], 5 * 10)
+        self.assertEqual(resumed.stats["backend_calls"], total_calls - 5)
+
+
+class ProcessWorkersTest(TranslatorTestCase):
+
+    def test_process_workers_translate_without_dedupe(self):
+        translator = HTMLXMLTranslator(backend=FakeBackend())
+        translator.translate_directory(self.source, self.target, workers=2, executor="process",
+                                       dedupe=False, incremental=False)
+        self.assertGreater(translator.stats["backend_calls"], 0)
+        self.assertEqual(len(self.translated_files()), 6)
+        self.assertIn("[pt] ", self.read(self.target, "section0", "page0.html"))
+
+
+    def test_process_workers_translate_streamed_xml(self):
+        translator = HTMLXMLTranslator(backend=FakeBackend(), xml_stream_threshold=1)
+        translator.translate_directory(self.source, self.target, workers=2, executor="process",
+                                       incremental=False)
+        translated = self.translated_files()
+        self.assertEqual(len([name for name in translated if name.endswith('.xml')]), 2)
+
+
+class StaleIndexTest(TranslatorTestCase):
+
+    def test_edited_and_deleted_sources_after_scan_are_detected(self):
+        translator = HTMLXMLTranslator(backend=FakeBackend())
+        translator.translate_directory(self.source, self.target)
+        index = scan_directory(self.source)
+
+        page = os.path.join(self.source, "section0", "page0.html")
+        with open(page, "a", encoding="utf-8") as file:
+            file.write("<p>Parágrafo novo depois da varredura</p>")
+        os.remove(os.path.join(self.source, "section0", "page1.html"))
+
+        rerun = HTMLXMLTranslator(backend=FakeBackend())
+        rerun.translate_directory(self.source, self.target, file_index=index)
+        self.assertEqual(rerun.stats["files"], 1)
+        self.assertEqual(rerun.stats["removed_files"], 1)
+        self.assertIn("[pt] Parágrafo novo depois da varredura", self.read(self.target, "section0", "page0.html"))
+        self.assertFalse(os.path.exists(os.path.join(self.target, "section0", "page1.html")))
+
+
+class FailedFilesTest(TranslatorTestCase):
+
+    def run_twice(self, **options):
+        failing = HTMLXMLTranslator(backend=FakeBackend(error_rate=1.0), max_retries=0)
+        failing.translate_directory(self.source, self.target, **options)
+        self.assertEqual(self.translated_files(), [])
+
+        rerun = HTMLXMLTranslator(backend=FakeBackend())
+        rerun.translate_directory(self.source, self.target, **options)
+        self.assertEqual(rerun.stats["files"], 6)
+        self.assertEqual(len(self.translated_files()), 6)
+
+    def test_failed_files_are_retried_by_incremental_run(self):
+        self.run_twice()
+
+    def test_failed_files_are_retried_with_process_workers(self):
+        self.run_twice(workers=2, executor="process")
+
+    def test_failed_files_are_not_marked_done_for_resume(self):
+        control = JobControl()
+        finished = []
+
+        def cancel_after_three():
+            finished.append(True)
+            if len(finished) == 3:
+                control.cancel()
+
+        failing = HTMLXMLTranslator(backend=FakeBackend(error_rate=1.0), max_retries=0)
+        with self.assertRaises(TranslationCancelled):
+            failing.translate_directory(self.source, self.target, progress_callback=cancel_after_three,
+                                        dedupe=False, incremental=False, control=control)
+
+        resumed = HTMLXMLTranslator(backend=FakeBackend())
+        resumed.translate_directory(self.source, self.target, dedupe=False, incremental=False, resume=True)
+        self.assertEqual(resumed.stats["resumed_files"], 0)
+        self.assertEqual(len(self.translated_files()), 6)
+
+
+class ThrottleRetryTest(TranslatorTestCase):
+
+    def test_throttle_errors_are_retried_without_rate_limiter(self):
+        backend = FakeBackend(error_rate=0.3, seed=1)
+        translator = HTMLXMLTranslator(backend=backend)
+        with mock.patch("translator.translator.time.sleep") as sleep:
+            translator.translate_directory(self.source, self.target)
+        self.assertGreater(backend.errors, 0)
+        self.assertEqual(sleep.call_count, backend.errors)
+        self.assertEqual(len(self.translated_files()), 6)
+
+
+class LanguagesTest(TranslatorTestCase):
+
+    def test_each_language_gets_its_outputs_manifest_and_linked_assets(self):
+        languages = ["es", "fr", "en"]
+        asset = os.path.join(self.source, "style.css")
+        with open(asset, "w", encoding="utf-8") as file:
+            file.write("body { color: black; }")
+
+        translator = HTMLXMLTranslator(backend=FakeBackend())
+        translator.translate_languages(self.source, self.target, languages)
+        self.assertEqual(translator.stats["shared_assets"], len(languages) - 1)
+        self.assertEqual(translator.stats["files"], 6)
+
+        copies = [os.stat(os.path.join(self.target, language, "style.css")) for language in languages]
+        self.assertTrue(all(os.path.samestat(copies[0], copy) for copy in copies))
+        for language in languages:
+            language_dir = os.path.join(self.target, language)
+            pages = [os.path.join(root, name) for root, _, files in os.walk(language_dir)
+                     for name in files if name.endswith(('.html', '.xml'))]
+            self.assertEqual(len(pages), 6)
+            for page in pages:
+                self.assertIn(f"[{language}]", self.read(page))
+            manifest = Manifest.load(language_dir, language, translator.output_version)
+            self.assertEqual(len(manifest.files), 7)
+
+        rerun = HTMLXMLTranslator(backend=FakeBackend())
+        rerun.translate_languages(self.source, self.target, languages)
+        self.assertEqual(rerun.stats["files"], 0)
+        self.assertEqual(rerun.backend.calls, 0)
+
+    def test_deterministic_requests_languages_in_order(self):
+        languages = ["es", "fr", "en"]
+        backend = RecordingBackend(latency=0.002)
+        translator = HTMLXMLTranslator(backend=backend, batch_size=5)
+        translator.translate_languages(self.source, self.target, languages, deterministic=True)
+        self.assertGreater(len(backend.targets), len(languages))
+        self.assertEqual(backend.targets, sorted(backend.targets, key=languages.index))
+
+
+class StreamingBufferTest(unittest.TestCase):
+
+    def test_sparse_document_flushes_by_part_count(self):
+        workdir = tempfile.mkdtemp(prefix="translator-test-")
+        self.addCleanup(shutil.rmtree, workdir, ignore_errors=True)
+        source = os.path.join(workdir, "big.xml")
+        target = os.path.join(workdir, "big.out.xml")
+        with open(source, "w", encoding="utf-8") as file:
+            file.write("<root><title>Texto traduzível</title>")
+            file.write("<n/>" * 5000)
+            file.write("</root>")
+
+        buffered = []
+        streamer = StreamingXMLTranslator(lambda texts: [f"[pt] {text}" for text in texts], is_translatable,
+                                          normalize, batch_size=200, max_parts=100)
+        original_flush = streamer._flush
+
+        def flush():
+            buffered.append(len(streamer._parts))
+            original_flush()
+
+        streamer._flush = flush
+        streamer.translate_file(source, target)
+        self.assertLessEqual(max(buffered), 100)
+        with open(target, encoding="utf-8") as file:
+            output = file.read()
+        self.assertIn("[pt] Texto traduzível", output)
+        self.assertEqual(output.count("<n />") + output.count("<n/>") + output.count("<n></n>"), 5000)
+
+
+if __name__ == "__main__":
+    unittest.main()
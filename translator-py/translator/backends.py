@@ -0,0 +1,301 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from bs4 import BeautifulSoup
+from deep_translator import GoogleTranslator
+from deep_translator.exceptions import RequestError, TooManyRequests, TranslationNotFound
+from deep_translator.validate import is_empty, is_input_valid, request_failed
+from translator.client import HTTPClientPool
+from translator.segmentation import pack_payloads
+
+
+def chunk_segments(texts, max_items=50, max_chars=4500):
+    """Divide os textos em lotes limitados por quantidade e por caracteres.
+
+    Gera tuplas (indice_inicial, lote) para que o chamador saiba onde
+    recolocar as traduções.
+    """
+    start = 0
+    chunk = []
+    size = 0
+    for index, text in enumerate(texts):
+        if chunk and (len(chunk) >= max_items or size + len(text) > max_chars):
+            yield start, chunk
+            start = index
+            chunk = []
+            size = 0
+        chunk.append(text)
+        size += len(text)
+    if chunk:
+        yield start, chunk
+
+
+class BackendError(Exception):
+    """Erro de um backend, com o status HTTP equivalente quando conhecido."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TranslationBackend:
+    """Interface base dos serviços de tradução.
+
+    Um backend recebe uma lista de textos e devolve uma lista do mesmo
+    tamanho, na mesma ordem, com as traduções. Limites de taxa e falhas
+    temporárias devem ser sinalizados com BackendError(status_code=429/5xx).
+    """
+    name = "base"
+
+    def translate_batch(self, texts, target):
+        raise NotImplementedError
+
+    async def translate_batch_async(self, texts, target):
+        """Versão assíncrona; por padrão executa translate_batch numa thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.translate_batch, texts, target)
+
+    def connection_stats(self):
+        """Métricas de reaproveitamento de conexões HTTP; vazio para backends sem rede."""
+        return {}
+
+    def close(self):
+        """Libera conexões e outros recursos mantidos pelo backend."""
+
+
+class SessionGoogleTranslator(GoogleTranslator):
+    """GoogleTranslator que faz as requisições por uma sessão keep-alive compartilhada.
+
+    O deep_translator usa requests.get e altera os parâmetros da instância a
+    cada chamada; aqui os parâmetros são montados por requisição, então uma
+    mesma instância pode ser usada por várias threads. endpoint troca a URL
+    do Google, por exemplo pelo servidor local de benchmarks/stub_server.py.
+    """
+
+    def __init__(self, client, source="auto", target="en", endpoint=None, **kwargs):
+        super().__init__(source=source, target=target, **kwargs)
+        self.client = client
+        if endpoint:
+            self._base_url = endpoint
+
+    def translate(self, text, **kwargs):
+        is_input_valid(text, max_chars=5000)
+        text = text.strip()
+        if self._same_source_target() or is_empty(text):
+            return text
+        params = dict(self._url_params, tl=self._target, sl=self._source)
+        params[self.payload_key] = text
+
+        response = self.client.get(self._base_url, params=params, proxies=self.proxies)
+        if response.status_code == 429:
+            raise TooManyRequests()
+        if request_failed(status_code=response.status_code):
+            raise RequestError()
+
+        soup = BeautifulSoup(response.text, "html.parser")
+        element = (soup.find(self._element_tag, self._element_query)
+                   or soup.find(self._element_tag, self._alt_element_query))
+        if not element:
+            raise TranslationNotFound(text)
+        return element.get_text(strip=True)
+
+
+class GoogleBackend(TranslationBackend):
+    """Adaptador para o GoogleTranslator do deep_translator.
+
+    Com pack ativo, os textos do lote são unidos por quebras de linha em
+    payloads de até max_payload caracteres, de modo que cada requisição
+    leve vários segmentos. Se a resposta não tiver o mesmo número de
+    linhas, aquele payload é traduzido item a item com translate_batch.
+
+    Um tradutor é criado uma vez por idioma de destino e todas as chamadas
+    passam pela mesma sessão HTTP keep-alive (pool_size conexões por host).
+    """
+    name = "google"
+
+    def __init__(self, source="auto", pack=True, max_payload=4900, pool_size=10, timeout=30, endpoint=None):
+        self.source = source
+        self.endpoint = endpoint
+        self.pack = pack
+        self.max_payload = max_payload
+        self.client = HTTPClientPool(pool_size=pool_size, timeout=timeout)
+        self._translators = {}
+        self._lock = threading.Lock()
+
+    def _translator(self, target):
+        with self._lock:
+            translator = self._translators.get(target)
+            if translator is None:
+                translator = SessionGoogleTranslator(self.client, source=self.source, target=target,
+                                                     endpoint=self.endpoint)
+                self._translators[target] = translator
+            return translator
+
+    def connection_stats(self):
+        return self.client.stats()
+
+    def close(self):
+        self.client.close()
+
+    def translate_batch(self, texts, target):
+        translator = self._translator(target)
+        texts = list(texts)
+        try:
+            if not self.pack:
+                return translator.translate_batch(texts)
+            results = [None] * len(texts)
+            for indexes in pack_payloads(texts, self.max_payload):
+                batch = [texts[index] for index in indexes]
+                lines = None
+                if len(batch) > 1 and not any('\n' in text for text in batch):
+                    translated = translator.translate('\n'.join(batch))
+                    lines = translated.split('\n') if translated else None
+                if lines is None or len(lines) != len(batch):
+                    lines = translator.translate_batch(batch)
+                for index, line in zip(indexes, lines):
+                    results[index] = line.strip() if line else line
+            return results
+        except TooManyRequests as e:
+            raise BackendError(str(e), status_code=429)
+        except RequestError as e:
+            raise BackendError(str(e), status_code=503)
+
+
+class FakeBackend(TranslationBackend):
+    """Backend local e determinístico, sem rede, para testes e benchmarks.
+
+    A tradução é o texto original prefixado pelo idioma de destino. A
+    latência pode ser simulada por chamada e por segmento, e error_rate
+    faz uma fração das chamadas falhar com status 429.
+    """
+    name = "fake"
+
+    def __init__(self, latency=0.0, item_latency=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.item_latency = item_latency
+        self.error_rate = error_rate
+        self.calls = 0
+        self.segments = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def translate_batch(self, texts, target):
+        with self._lock:
+            self.calls += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.errors += 1
+                raise BackendError("Too many requests", status_code=429)
+            self.segments += len(texts)
+        delay = self.latency + self.item_latency * len(texts)
+        if delay:
+            time.sleep(delay)
+        return [f"[{target}] {text}" for text in texts]
+
+
+class NullBackend(TranslationBackend):
+    """Backend que não traduz: todo texto fica sem tradução.
+
+    Usado pelos processos do pool, que só aplicam traduções já conhecidas;
+    um texto que chegue a ele faz o arquivo contar como falho.
+    """
+    name = "null"
+
+    def translate_batch(self, texts, target):
+        return [None] * len(texts)
+
+
+class RecordReplayBackend(TranslationBackend):
+    """Grava as respostas de outro backend e as reproduz depois, sem rede.
+
+    O arquivo tem uma linha JSON por segmento ({"target", "text",
+    "translation", "seconds"}), então a reprodução não depende de como os
+    textos foram agrupados em lotes. Modos:
+
+    - "record": traduz com o backend e grava cada resposta;
+    - "replay": responde só com o que foi gravado; um texto ausente é erro;
+    - "auto": reproduz o que existe e grava o que faltar.
+
+    Com replay_latency, a reprodução espera o tempo que a chamada original
+    levou (proporcional aos segmentos do lote), para benchmarks realistas.
+    """
+    name = "replay"
+
+    def __init__(self, path, backend=None, mode="replay", replay_latency=False):
+        if mode not in ("record", "replay", "auto"):
+            raise ValueError(f"Modo de gravação inválido: {mode}")
+        if mode != "replay" and backend is None:
+            raise ValueError(f"O modo {mode} precisa de um backend para gravar")
+        self.path = path
+        self.backend = backend
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.recorded = {}
+        self.replayed = 0
+        self.recorded_now = 0
+        self._file = None
+        self._lock = threading.Lock()
+        if mode != "record" and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.recorded[(entry["target"], entry["text"])] = (entry["translation"], entry.get("seconds", 0.0))
+
+    def translate_batch(self, texts, target):
+        texts = list(texts)
+        results = [None] * len(texts)
+        missing = []
+        delay = 0.0
+        with self._lock:
+            for index, text in enumerate(texts):
+                entry = self.recorded.get((target, text)) if self.mode != "record" else None
+                if entry is None:
+                    missing.append(index)
+                else:
+                    results[index] = entry[0]
+                    delay += entry[1]
+            self.replayed += len(texts) - len(missing)
+        if missing and self.mode == "replay":
+            raise BackendError(f"Tradução não gravada para {target}: {texts[missing[0]][:80]!r}")
+        if self.replay_latency and delay:
+            time.sleep(delay)
+        if missing:
+            batch = [texts[index] for index in missing]
+            start = time.perf_counter()
+            translated = self.backend.translate_batch(batch, target)
+            share = (time.perf_counter() - start) / len(batch)
+            self._record(target, batch, translated, share)
+            for index, translation in zip(missing, translated):
+                results[index] = translation
+        return results
+
+    def _record(self, target, texts, translations, seconds):
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'w' if self.mode == "record" else 'a', encoding='utf-8')
+            for text, translation in zip(texts, translations):
+                if translation is None:
+                    continue
+                self.recorded[(target, text)] = (translation, seconds)
+                entry = {"target": target, "text": text, "translation": translation, "seconds": round(seconds, 6)}
+                self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self.recorded_now += 1
+            self._file.flush()
+
+    def connection_stats(self):
+        return self.backend.connection_stats() if self.backend is not None else {}
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self.backend is not None:
+            self.backend.close()
@@ -0,0 +1,144 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class TranslationMemory:
+    """Memória de tradução persistente em SQLite.
+
+    Cada entrada é indexada por (texto de origem, idioma de destino). Quando
+    o número de entradas passa de max_entries, as menos usadas recentemente
+    são removidas até sobrar uma folga de 5%, para que a limpeza não se
+    repita a cada gravação. O total de entradas é estimado a cada gravação
+    (contando como novas também as substituídas) e só é recontado no banco
+    quando a estimativa passa do limite.
+    """
+
+    def __init__(self, path, max_entries=500000):
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            "source TEXT NOT NULL, target TEXT NOT NULL, translation TEXT NOT NULL, "
+            "used REAL NOT NULL, PRIMARY KEY (source, target))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS memory_used ON memory (used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    def get_many(self, texts, target):
+        """Busca as traduções conhecidas e devolve um dicionário texto -> tradução."""
+        found = {}
+        unique = list(dict.fromkeys(texts))
+        with self._lock:
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT source, translation FROM memory WHERE target = ? AND source IN ({placeholders})",
+                    [target] + chunk
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE memory SET used = ? WHERE source = ? AND target = ?",
+                    [(now, source, target) for source in found]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    def get(self, text, target):
+        """Busca a tradução de um único texto, ou None."""
+        return self.get_many([text], target).get(text)
+
+    def put_many(self, pairs, target):
+        """Grava pares (texto, tradução) para o idioma de destino."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO memory (source, target, translation, used) VALUES (?, ?, ?, ?)",
+                [(source, target, translation, now) for source, translation in pairs]
+            )
+            self._count += len(pairs)
+            if self._count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def put(self, text, translation, target):
+        """Grava a tradução de um único texto."""
+        self.put_many([(text, translation)], target)
+
+    def _evict(self):
+        self._count = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+        if self._count <= self.max_entries:
+            return
+        keep = self.max_entries - self.max_entries // 20
+        self._conn.execute(
+            "DELETE FROM memory WHERE rowid IN (SELECT rowid FROM memory ORDER BY used LIMIT ?)",
+            (self._count - keep,)
+        )
+        self._count = keep
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    def stats(self):
+        """Devolve os contadores de acertos e falhas da memória."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def export_file(self, path):
+        """Exporta a memória para um arquivo JSON Lines e devolve o total exportado."""
+        count = 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, target, translation FROM memory ORDER BY used"
+            ).fetchall()
+        with open(path, 'w', encoding='utf-8') as file:
+            for source, target, translation in rows:
+                file.write(json.dumps(
+                    {"source": source, "target": target, "translation": translation},
+                    ensure_ascii=False
+                ) + "\n")
+                count += 1
+        return count
+
+    def import_file(self, path):
+        """Importa entradas de um arquivo JSON Lines gerado por export_file."""
+        by_target = {}
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                by_target.setdefault(entry["target"], []).append(
+                    (entry["source"], entry["translation"])
+                )
+        count = 0
+        for target, pairs in by_target.items():
+            self.put_many(pairs, target)
+            count += len(pairs)
+        return count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,69 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HTTPClientPool:
+    """Sessão HTTP keep-alive compartilhada pelas chamadas de um trabalho.
+
+    Uma única requests.Session, criada na primeira requisição, mantém até
+    pool_size conexões abertas por host, reaproveitadas entre arquivos e
+    entre as threads de E/S. stats() informa quantas requisições foram
+    feitas e quantas conexões precisaram ser abertas.
+    """
+
+    def __init__(self, pool_size=10, timeout=30):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.requests = 0
+        self._closed_connections = 0
+        self._session = None
+        self._adapter = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                self._session = requests.Session()
+                self._session.mount("https://", self._adapter)
+                self._session.mount("http://", self._adapter)
+            return self._session
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.get(url, **kwargs)
+        with self._lock:
+            self.requests += 1
+        return response
+
+    def connections_opened(self):
+        """Total de conexões abertas pelos pools de conexão da sessão."""
+        with self._lock:
+            return self._closed_connections + self._open_pool_connections()
+
+    def _open_pool_connections(self):
+        if self._adapter is None:
+            return 0
+        pools = self._adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def stats(self):
+        opened = self.connections_opened()
+        reused = max(0, self.requests - opened)
+        return {
+            "http_requests": self.requests,
+            "connections_opened": opened,
+            "connections_reused": reused,
+            "connection_reuse_ratio": reused / self.requests if self.requests else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._closed_connections += self._open_pool_connections()
+                self._session.close()
+                self._session = None
+                self._adapter = None
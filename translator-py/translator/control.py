@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+
+class TranslationCancelled(Exception):
+    """Levantada dentro do motor quando o trabalho é cancelado pelo usuário."""
+
+
+class JobControl:
+    """Controle cooperativo de cancelamento e pausa de uma tradução.
+
+    O motor chama checkpoint() entre arquivos e antes de cada chamada ao
+    backend: enquanto pausado, a chamada fica bloqueada; depois de cancel(),
+    ela levanta TranslationCancelled. Os métodos podem ser chamados de
+    qualquer thread.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def checkpoint(self):
+        while not self._running.wait(0.1):
+            pass
+        if self._cancelled.is_set():
+            raise TranslationCancelled()
+
+    async def checkpoint_async(self):
+        while not self._running.is_set():
+            await asyncio.sleep(0.1)
+        if self._cancelled.is_set():
+            raise TranslationCancelled()
+
+    def sleep(self, seconds):
+        """Espera o tempo pedido, mas volta antes se o trabalho for cancelado."""
+        self._cancelled.wait(seconds)
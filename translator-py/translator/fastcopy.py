@@ -0,0 +1,89 @@
+import os
+import shutil
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_FICLONE = 0x40049409
+
+
+def _same_file_state(source_stat, target_file):
+    try:
+        target_stat = os.stat(target_file)
+    except OSError:
+        return False
+    return (target_stat.st_size == source_stat.st_size
+            and target_stat.st_mtime_ns == source_stat.st_mtime_ns)
+
+
+def _reflink(source_file, target_file):
+    if fcntl is None:
+        raise OSError("reflink indisponível nesta plataforma")
+    with open(source_file, 'rb') as src, open(target_file, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+
+
+def _kernel_copy(source_file, target_file, size):
+    """Copia usando copy_file_range ou sendfile, sem passar os dados pelo Python."""
+    with open(source_file, 'rb') as src, open(target_file, 'wb') as dst:
+        remaining = size
+        for method in ('copy_file_range', 'sendfile'):
+            if not hasattr(os, method):
+                continue
+            try:
+                while remaining > 0:
+                    if method == 'copy_file_range':
+                        sent = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    else:
+                        sent = os.sendfile(dst.fileno(), src.fileno(), None, remaining)
+                    if sent == 0:
+                        break
+                    remaining -= sent
+                if remaining == 0:
+                    return
+            except OSError:
+                src.seek(size - remaining)
+                dst.seek(size - remaining)
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
+def copy_file(source_file, target_file, link=None, skip_unchanged=True):
+    """Copia um arquivo sem carregá-lo inteiro em memória.
+
+    link pode ser "hardlink" ou "reflink" para evitar a cópia quando o
+    sistema de arquivos permitir; em caso de falha, faz uma cópia comum. Se
+    skip_unchanged for verdadeiro e o destino já tiver o mesmo tamanho e
+    mtime, nada é feito. Devolve o número de bytes copiados (0 quando o
+    arquivo foi pulado ou ligado).
+    """
+    source_stat = os.stat(source_file)
+    if skip_unchanged and _same_file_state(source_stat, target_file):
+        return 0
+
+    if link in ("hardlink", "reflink"):
+        if os.path.lexists(target_file):
+            os.remove(target_file)
+        try:
+            if link == "hardlink":
+                os.link(source_file, target_file)
+                return 0
+            _reflink(source_file, target_file)
+            os.utime(target_file, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+            return 0
+        except OSError:
+            if os.path.lexists(target_file):
+                os.remove(target_file)
+
+    _kernel_copy(source_file, target_file, source_stat.st_size)
+    os.utime(target_file, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    return source_stat.st_size
+
+
+def timed_copy(source_file, target_file, link=None, skip_unchanged=True):
+    """Como copy_file, mas devolve (bytes copiados, segundos gastos)."""
+    start = time.perf_counter()
+    copied = copy_file(source_file, target_file, link, skip_unchanged)
+    return copied, time.perf_counter() - start
@@ -0,0 +1,165 @@
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+
+# Limites (em segundos) dos histogramas de cada etapa, no estilo do Prometheus.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+NO_STAGE = contextlib.nullcontext()
+
+
+class _Stage:
+    __slots__ = ('owner', 'name', 'file', 'start')
+
+    def __init__(self, owner, name, file):
+        self.owner = owner
+        self.name = name
+        self.file = file
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.owner.record(self.name, time.perf_counter() - self.start, self.file)
+        return False
+
+
+class Instrumentation:
+    """Temporizadores por etapa do tradutor, para a execução e para cada arquivo.
+
+    Cada etapa (leitura, parse, extração, backend, esperas, serialização...)
+    acumula contagem, tempo total, máximo e um histograma. Com per_file, o
+    tempo de cada etapa também é somado por arquivo. Com profile, run()
+    executa a tradução sob o cProfile. Os dados podem ser exportados em JSON
+    ou no formato de texto do Prometheus.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, per_file=True, profile=False):
+        self.buckets = tuple(buckets)
+        self.per_file = per_file
+        self.profile = profile
+        self.profiler = None
+        self._stages = {}
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name, file=None):
+        """Context manager que mede uma ocorrência da etapa."""
+        return _Stage(self, name, file)
+
+    def record(self, name, seconds, file=None):
+        with self._lock:
+            entry = self._stages.get(name)
+            if entry is None:
+                entry = self._stages[name] = [0, 0.0, 0.0, [0] * (len(self.buckets) + 1)]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            for index, limit in enumerate(self.buckets):
+                if seconds <= limit:
+                    entry[3][index] += 1
+                    break
+            else:
+                entry[3][-1] += 1
+            if file is not None and self.per_file:
+                stages = self._files.setdefault(file, {})
+                stages[name] = stages.get(name, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def run(self):
+        """Mede a execução inteira e, se configurado, a executa sob o cProfile."""
+        if self.profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        try:
+            with self.stage("run"):
+                yield self
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+
+    def drain(self):
+        """Devolve os dados brutos acumulados e zera os contadores.
+
+        Usado pelos processos do pool para repassar suas medições ao
+        processo principal, que as junta com merge().
+        """
+        with self._lock:
+            data = {"stages": self._stages, "files": self._files}
+            self._stages = {}
+            self._files = {}
+        return data
+
+    def merge(self, data):
+        if not data:
+            return
+        with self._lock:
+            for name, (count, total, peak, histogram) in data["stages"].items():
+                entry = self._stages.get(name)
+                if entry is None:
+                    entry = self._stages[name] = [0, 0.0, 0.0, [0] * (len(self.buckets) + 1)]
+                entry[0] += count
+                entry[1] += total
+                entry[2] = max(entry[2], peak)
+                entry[3] = [a + b for a, b in zip(entry[3], histogram)]
+            for file, stages in data["files"].items():
+                target = self._files.setdefault(file, {})
+                for name, seconds in stages.items():
+                    target[name] = target.get(name, 0.0) + seconds
+
+    def to_dict(self):
+        with self._lock:
+            stages = {}
+            for name, (count, total, peak, histogram) in sorted(self._stages.items()):
+                stages[name] = {
+                    "count": count,
+                    "total_seconds": total,
+                    "mean_seconds": total / count if count else 0.0,
+                    "max_seconds": peak,
+                    "histogram": dict(zip([str(limit) for limit in self.buckets] + ["+Inf"], histogram))
+                }
+            files = {file: dict(values) for file, values in self._files.items()}
+        return {"stages": stages, "files": files}
+
+    def to_json(self, path=None):
+        """Serializa as medições em JSON; grava em path, se informado."""
+        report = json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        if path:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(report)
+        return report
+
+    def to_prometheus(self, prefix="translator"):
+        """Medições por etapa no formato de exposição de texto do Prometheus."""
+        name = f"{prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Tempo gasto em cada etapa da tradução.",
+            f"# TYPE {name} histogram"
+        ]
+        with self._lock:
+            for stage, (count, total, _, histogram) in sorted(self._stages.items()):
+                cumulative = 0
+                for limit, value in zip(list(self.buckets) + ["+Inf"], histogram):
+                    cumulative += value
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{limit}"}} {cumulative}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {total}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def profile_report(self, limit=30, sort="cumulative"):
+        """Resumo das funções mais custosas do cProfile, ou "" sem profile."""
+        if self.profiler is None:
+            return ""
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def dump_profile(self, path):
+        """Grava os dados do cProfile para abrir com pstats ou snakeviz."""
+        if self.profiler is not None:
+            self.profiler.dump_stats(path)
@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+
+JOURNAL_NAME = ".translation-journal.jsonl"
+
+
+class JobJournal:
+    """Diário de uma tradução em andamento, para retomar após falha ou fechamento.
+
+    É um arquivo JSON Lines no diretório de destino: a primeira linha
+    descreve o trabalho (origem, idioma, versão do motor) e as seguintes
+    registram lotes de segmentos traduzidos e arquivos concluídos. Ao fim de
+    uma execução bem-sucedida o diário é apagado.
+    """
+
+    def __init__(self, source_dir, target_dir, target_language, engine_version):
+        self.source_dir = source_dir
+        self.path = os.path.join(target_dir, JOURNAL_NAME)
+        self.header = {
+            "type": "job",
+            "source_dir": os.path.abspath(source_dir),
+            "target_language": target_language,
+            "engine_version": engine_version
+        }
+        self._file = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def exists(target_dir):
+        return os.path.exists(os.path.join(target_dir, JOURNAL_NAME))
+
+    def load(self):
+        """Lê o diário existente e devolve (arquivos concluídos, traduções por idioma).
+
+        Devolve None se não houver diário ou se ele for de outro trabalho,
+        inclusive quando o cabeçalho não pode ser lido. Uma última linha
+        incompleta, típica de uma queda, é ignorada.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                lines = file.read().splitlines()
+        except OSError:
+            return None
+        completed = set()
+        translations = {}
+        for number, line in enumerate(lines):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                if number == 0:
+                    return None
+                continue
+            if number == 0:
+                if entry != self.header:
+                    return None
+            elif entry["type"] == "segments":
+                translations.setdefault(entry["lang"], {}).update(entry["pairs"])
+            elif entry["type"] == "file":
+                completed.add(entry["path"])
+        if not lines:
+            return None
+        return completed, translations
+
+    def open(self, resume=False):
+        """Abre o diário; com resume, continua o existente e devolve seu estado."""
+        state = self.load() if resume else None
+        if state is None:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write(self.header)
+            return set(), {}
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write("\n")
+        return state
+
+    def _write(self, entry):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def relative(self, source_file):
+        return os.path.relpath(source_file, self.source_dir).replace(os.sep, '/')
+
+    def record_segments(self, pairs, lang):
+        self._write({"type": "segments", "lang": lang, "pairs": [list(pair) for pair in pairs]})
+
+    def record_file(self, source_file):
+        self._write({"type": "file", "path": self.relative(source_file)})
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def finish(self):
+        """Fecha e apaga o diário de uma execução concluída."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,91 @@
+import math
+import re
+from collections import Counter
+
+from translator.langid_corpus import SAMPLES
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+def _ngrams(text, size=3):
+    """Conta os n-gramas de caracteres das palavras do texto, com espaços nas bordas."""
+    counts = Counter()
+    for word in _WORD.findall(text.lower()):
+        padded = f" {word} "
+        for start in range(len(padded) - size + 1):
+            counts[padded[start:start + size]] += 1
+    return counts
+
+
+class LanguageDetector:
+    """Identificação de idioma local e offline por perfis de n-gramas de caracteres.
+
+    Cada idioma tem um perfil com as frequências dos trigramas dos seus
+    textos de referência (veja langid_corpus). Um texto recebe, em cada
+    perfil, a log-probabilidade média por trigrama (Bayes ingênuo com
+    suavização aditiva) e é atribuído ao perfil de maior valor.
+    is_language() só confirma o idioma quando o texto tem palavras
+    suficientes, pelo menos min_score dos seus trigramas aparecem no perfil
+    vencedor e a vantagem sobre o segundo colocado passa de min_margin (em
+    nats por trigrama), para que textos curtos ou ambíguos continuem indo
+    ao backend.
+    """
+
+    def __init__(self, samples=None, min_words=4, min_score=0.6, min_margin=0.05, smoothing=0.5):
+        self.min_words = min_words
+        self.min_score = min_score
+        self.min_margin = min_margin
+        counts = {
+            language: _ngrams(text if isinstance(text, str) else " ".join(text))
+            for language, text in (samples or SAMPLES).items()
+        }
+        vocabulary = len(set().union(*counts.values())) + 1
+        self.profiles = {}
+        self._unseen = {}
+        for language, grams in counts.items():
+            total = sum(grams.values()) + smoothing * vocabulary
+            self.profiles[language] = {gram: math.log((count + smoothing) / total) for gram, count in grams.items()}
+            self._unseen[language] = math.log(smoothing / total)
+
+    @property
+    def languages(self):
+        return list(self.profiles)
+
+    def scores(self, text):
+        """Log-probabilidade média por trigrama do texto em cada perfil, em ordem decrescente."""
+        return self._rank(_ngrams(text))
+
+    def _rank(self, grams):
+        total = sum(grams.values())
+        if not total:
+            return []
+        ranking = []
+        for language, profile in self.profiles.items():
+            unseen = self._unseen[language]
+            score = sum(count * profile.get(gram, unseen) for gram, count in grams.items()) / total
+            ranking.append((score, language))
+        ranking.sort(reverse=True)
+        return ranking
+
+    def detect(self, text):
+        """Devolve o idioma identificado com confiança, ou None."""
+        if len(_WORD.findall(text)) < self.min_words:
+            return None
+        grams = _ngrams(text)
+        ranking = self._rank(grams)
+        if not ranking:
+            return None
+        best_score, best = ranking[0]
+        second_score = ranking[1][0] if len(ranking) > 1 else float('-inf')
+        profile = self.profiles[best]
+        known = sum(count for gram, count in grams.items() if gram in profile) / sum(grams.values())
+        if known < self.min_score or best_score - second_score < self.min_margin:
+            return None
+        return best
+
+    def is_language(self, text, language):
+        """Indica se o texto está, com confiança, no idioma informado."""
+        language = language.split('-')[0].lower()
+        if language not in self.profiles:
+            return False
+        return self.detect(text) == language
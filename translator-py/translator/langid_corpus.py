@@ -0,0 +1,300 @@
+"""Textos de referência dos perfis de idioma do LanguageDetector.
+
+Cada idioma tem parágrafos de assuntos e registros diferentes (software,
+notícias, comércio, viagens, saúde, avisos legais e conversa), para que o
+perfil de trigramas não fique preso ao vocabulário de um único tema.
+"""
+
+SAMPLES = {
+    "pt": (
+        "O sistema permite que você traduza os arquivos do seu site de forma simples e rápida. "
+        "Para começar, selecione a pasta de origem e a pasta de destino, escolha o idioma e clique "
+        "no botão para iniciar. Não é necessário instalar nenhum outro programa, porque todas as "
+        "páginas são processadas no seu computador. Caso tenha dúvidas, entre em contato com a nossa "
+        "equipe de suporte, que está disponível todos os dias da semana. Também oferecemos uma "
+        "versão gratuita com as principais funções, além de planos para empresas que precisam de mais "
+        "recursos. As informações são mantidas em segurança e você pode cancelar quando quiser. "
+        "Obrigado por escolher o nosso serviço; esperamos que ele seja útil para o seu trabalho.",
+
+        "O governo anunciou nesta segunda-feira um novo pacote de medidas para conter a alta dos "
+        "preços dos alimentos. Segundo o ministro, as ações devem entrar em vigor no próximo mês e "
+        "incluem a redução de impostos sobre produtos da cesta básica. Economistas ouvidos pela "
+        "reportagem afirmaram que o efeito será limitado, já que a inflação também é causada pelo "
+        "aumento do custo da energia. A oposição criticou a proposta e disse que ela chega tarde "
+        "demais para as famílias que já perderam boa parte da sua renda nos últimos anos.",
+
+        "Aproveite as ofertas da semana: frete grátis para todo o país nas compras acima de cem "
+        "reais. Adicione os produtos ao carrinho, confira o endereço de entrega e escolha a forma de "
+        "pagamento. Você pode pagar com cartão de crédito em até dez vezes sem juros ou com boleto "
+        "bancário. Se o produto chegar com defeito, a troca é feita sem custo em até trinta dias. "
+        "Acompanhe o seu pedido pelo aplicativo e receba avisos sempre que o status mudar.",
+
+        "A cidade fica a poucas horas da capital e é conhecida pelas praias de águas calmas e pela "
+        "comida típica. No centro histórico, vale a pena visitar a igreja principal, o mercado "
+        "municipal e os museus, que abrem de terça a domingo. Para quem prefere a natureza, há "
+        "trilhas nas montanhas e passeios de barco pelas ilhas vizinhas. A melhor época para viajar "
+        "é entre maio e setembro, quando chove menos e as temperaturas são mais agradáveis.",
+
+        "Beber água ao longo do dia, dormir bem e praticar atividade física com regularidade ajudam "
+        "a manter a saúde em dia. Os médicos recomendam pelo menos trinta minutos de caminhada por "
+        "dia e uma alimentação rica em frutas, verduras e legumes. Em caso de febre alta, dor forte "
+        "ou falta de ar, procure imediatamente um serviço de urgência. Não tome remédios sem "
+        "orientação, mesmo que os sintomas pareçam simples.",
+
+        "Ao utilizar este site, você concorda com a coleta e o uso dos seus dados pessoais conforme "
+        "descrito nesta política de privacidade. Os dados são usados apenas para prestar os serviços "
+        "contratados e não são vendidos a terceiros. Você tem o direito de acessar, corrigir ou "
+        "excluir as suas informações a qualquer momento. Utilizamos cookies para melhorar a sua "
+        "experiência de navegação e para gerar estatísticas de acesso.",
+
+        "Oi, tudo bem? Eu ia te ligar ontem, mas acabei chegando muito tarde em casa. Você ainda quer "
+        "sair no sábado? A gente pode almoçar naquele restaurante perto da praça e depois ir ao "
+        "cinema. Se chover, a gente fica em casa e vê um filme. Me avisa o que você acha, porque eu "
+        "preciso saber até amanhã. Beijos e até logo!"
+    ),
+    "en": (
+        "The system lets you translate the files of your website in a simple and fast way. "
+        "To get started, select the source folder and the target folder, choose the language and "
+        "click the button to begin. There is no need to install any other program, because all the "
+        "pages are processed on your computer. If you have any questions, please contact our support "
+        "team, which is available every day of the week. We also offer a free version with the main "
+        "features, as well as plans for companies that need more resources. Your information is kept "
+        "safe and you can cancel whenever you want. Thank you for choosing our service; we hope it "
+        "will be useful for your work.",
+
+        "The government announced on Monday a new package of measures to curb rising food prices. "
+        "According to the minister, the changes should take effect next month and include lower taxes "
+        "on basic products. Economists interviewed for this article said the effect would be limited, "
+        "since inflation is also driven by the higher cost of energy. The opposition criticised the "
+        "proposal and said it comes too late for the families who have already lost a large share of "
+        "their income over the last few years.",
+
+        "Check out this week's deals: free shipping nationwide on orders over one hundred dollars. "
+        "Add the products to your cart, confirm the delivery address and choose how you would like to "
+        "pay. You can pay by credit card in up to ten interest-free instalments or by bank transfer. "
+        "If the item arrives damaged, we will replace it at no cost within thirty days. Track your "
+        "order in the app and get a notification whenever its status changes.",
+
+        "The town is just a few hours from the capital and is known for its calm beaches and local "
+        "food. In the old town, it is worth visiting the main church, the covered market and the "
+        "museums, which are open from Tuesday to Sunday. Those who prefer nature can hike the mountain "
+        "trails or take a boat trip around the nearby islands. The best time to travel is between May "
+        "and September, when there is less rain and the weather is more pleasant.",
+
+        "Drinking water throughout the day, getting enough sleep and exercising regularly help you "
+        "stay healthy. Doctors recommend at least thirty minutes of walking a day and a diet rich in "
+        "fruit and vegetables. If you have a high fever, severe pain or shortness of breath, seek "
+        "emergency care immediately. Do not take any medicine without advice, even if the symptoms "
+        "seem mild.",
+
+        "By using this website, you agree to the collection and use of your personal data as "
+        "described in this privacy policy. Your data is only used to provide the services you have "
+        "requested and is never sold to third parties. You have the right to access, correct or "
+        "delete your information at any time. We use cookies to improve your browsing experience and "
+        "to produce usage statistics.",
+
+        "Hey, how are you? I was going to call you yesterday, but I got home really late. Do you "
+        "still want to go out on Saturday? We could have lunch at that restaurant near the square and "
+        "then go to the movies. If it rains, we can just stay in and watch something. Let me know what "
+        "you think, because I need to know by tomorrow. See you soon!"
+    ),
+    "es": (
+        "El sistema le permite traducir los archivos de su sitio web de forma sencilla y rápida. "
+        "Para empezar, seleccione la carpeta de origen y la carpeta de destino, elija el idioma y haga "
+        "clic en el botón para comenzar. No es necesario instalar ningún otro programa, porque todas "
+        "las páginas se procesan en su ordenador. Si tiene alguna pregunta, póngase en contacto con "
+        "nuestro equipo de soporte, que está disponible todos los días de la semana. También ofrecemos "
+        "una versión gratuita con las funciones principales, además de planes para empresas que "
+        "necesitan más recursos. Su información se mantiene segura y puede cancelar cuando quiera. "
+        "Gracias por elegir nuestro servicio; esperamos que le sea útil en su trabajo.",
+
+        "El gobierno anunció este lunes un nuevo paquete de medidas para frenar la subida de los "
+        "precios de los alimentos. Según el ministro, las acciones entrarán en vigor el próximo mes e "
+        "incluyen la reducción de impuestos sobre los productos básicos. Los economistas consultados "
+        "por este diario afirmaron que el efecto será limitado, ya que la inflación también se debe al "
+        "aumento del coste de la energía. La oposición criticó la propuesta y dijo que llega demasiado "
+        "tarde para las familias que ya han perdido buena parte de sus ingresos en los últimos años.",
+
+        "Aprovecha las ofertas de la semana: envío gratis a todo el país en compras superiores a cien "
+        "euros. Añade los productos al carrito, comprueba la dirección de entrega y elige la forma de "
+        "pago. Puedes pagar con tarjeta de crédito hasta en diez cuotas sin intereses o mediante "
+        "transferencia bancaria. Si el producto llega dañado, el cambio es gratuito durante treinta "
+        "días. Sigue tu pedido desde la aplicación y recibe avisos cada vez que cambie su estado.",
+
+        "La ciudad está a pocas horas de la capital y es conocida por sus playas de aguas tranquilas "
+        "y por su comida típica. En el casco antiguo merece la pena visitar la iglesia mayor, el "
+        "mercado municipal y los museos, que abren de martes a domingo. Quienes prefieren la "
+        "naturaleza pueden recorrer los senderos de la sierra o dar un paseo en barco por las islas "
+        "cercanas. La mejor época para viajar es entre mayo y septiembre, cuando llueve menos y hace "
+        "un tiempo más agradable.",
+
+        "Beber agua a lo largo del día, dormir bien y hacer ejercicio con regularidad ayudan a "
+        "mantener una buena salud. Los médicos recomiendan caminar al menos treinta minutos al día y "
+        "seguir una dieta rica en frutas y verduras. En caso de fiebre alta, dolor intenso o "
+        "dificultad para respirar, acuda de inmediato a un servicio de urgencias. No tome "
+        "medicamentos sin consejo médico, aunque los síntomas parezcan leves.",
+
+        "Al utilizar este sitio, usted acepta la recogida y el uso de sus datos personales tal como "
+        "se describe en esta política de privacidad. Los datos solo se utilizan para prestar los "
+        "servicios contratados y nunca se venden a terceros. Usted tiene derecho a acceder, "
+        "rectificar o suprimir su información en cualquier momento. Utilizamos cookies para mejorar "
+        "su experiencia de navegación y para elaborar estadísticas de uso.",
+
+        "Hola, ¿qué tal? Iba a llamarte ayer, pero al final llegué muy tarde a casa. ¿Todavía quieres "
+        "salir el sábado? Podemos comer en ese restaurante cerca de la plaza y luego ir al cine. Si "
+        "llueve, nos quedamos en casa y vemos una película. Dime qué te parece, porque necesito "
+        "saberlo antes de mañana. ¡Un abrazo y hasta pronto!"
+    ),
+    "fr": (
+        "Le système vous permet de traduire les fichiers de votre site de manière simple et rapide. "
+        "Pour commencer, sélectionnez le dossier source et le dossier de destination, choisissez la "
+        "langue et cliquez sur le bouton pour démarrer. Il n'est pas nécessaire d'installer un autre "
+        "programme, car toutes les pages sont traitées sur votre ordinateur. Si vous avez des questions, "
+        "contactez notre équipe d'assistance, qui est disponible tous les jours de la semaine. Nous "
+        "proposons aussi une version gratuite avec les principales fonctions, ainsi que des offres pour "
+        "les entreprises qui ont besoin de plus de ressources. Vos informations sont protégées et vous "
+        "pouvez annuler quand vous le souhaitez. Merci d'avoir choisi notre service ; nous espérons "
+        "qu'il vous sera utile dans votre travail.",
+
+        "Le gouvernement a annoncé lundi un nouveau train de mesures pour freiner la hausse des prix "
+        "de l'alimentation. Selon le ministre, ces mesures entreront en vigueur le mois prochain et "
+        "comprennent une baisse des taxes sur les produits de première nécessité. Les économistes "
+        "interrogés par notre journal estiment que l'effet sera limité, car l'inflation est aussi due "
+        "à la hausse du coût de l'énergie. L'opposition a critiqué le projet et a déclaré qu'il arrive "
+        "bien trop tard pour les ménages qui ont déjà perdu une grande partie de leurs revenus ces "
+        "dernières années.",
+
+        "Profitez des offres de la semaine : livraison gratuite partout en France pour tout achat de "
+        "plus de cent euros. Ajoutez les articles à votre panier, vérifiez l'adresse de livraison et "
+        "choisissez votre moyen de paiement. Vous pouvez payer par carte bancaire en dix fois sans "
+        "frais ou par virement. Si le produit arrive abîmé, l'échange est gratuit pendant trente "
+        "jours. Suivez votre commande depuis l'application et recevez une alerte à chaque changement "
+        "de statut.",
+
+        "La ville se trouve à quelques heures de la capitale et elle est connue pour ses plages aux "
+        "eaux calmes et sa cuisine locale. Dans la vieille ville, il faut absolument visiter "
+        "l'église principale, les halles et les musées, ouverts du mardi au dimanche. Ceux qui "
+        "préfèrent la nature peuvent randonner sur les sentiers de montagne ou faire une promenade en "
+        "bateau autour des îles voisines. La meilleure période pour partir se situe entre mai et "
+        "septembre, lorsqu'il pleut moins et que le temps est plus agréable.",
+
+        "Boire de l'eau tout au long de la journée, bien dormir et faire du sport régulièrement "
+        "aident à rester en bonne santé. Les médecins conseillent au moins trente minutes de marche "
+        "par jour et une alimentation riche en fruits et en légumes. En cas de forte fièvre, de "
+        "douleur intense ou de difficultés à respirer, rendez-vous immédiatement aux urgences. Ne "
+        "prenez pas de médicaments sans avis médical, même si les symptômes semblent bénins.",
+
+        "En utilisant ce site, vous acceptez la collecte et l'utilisation de vos données "
+        "personnelles telles qu'elles sont décrites dans la présente politique de confidentialité. "
+        "Vos données servent uniquement à fournir les services demandés et ne sont jamais vendues à "
+        "des tiers. Vous disposez d'un droit d'accès, de rectification et de suppression de vos "
+        "informations à tout moment. Nous utilisons des cookies pour améliorer votre expérience de "
+        "navigation et pour établir des statistiques de fréquentation.",
+
+        "Salut, ça va ? Je voulais t'appeler hier, mais je suis rentré très tard à la maison. Tu veux "
+        "toujours sortir samedi ? On pourrait déjeuner dans ce restaurant près de la place et aller "
+        "au cinéma ensuite. S'il pleut, on reste chez moi et on regarde un film. Dis-moi ce que tu en "
+        "penses, parce que j'ai besoin de le savoir avant demain. Je t'embrasse, à bientôt !"
+    ),
+    "de": (
+        "Mit dem System können Sie die Dateien Ihrer Website einfach und schnell übersetzen. "
+        "Wählen Sie zuerst den Quellordner und den Zielordner aus, wählen Sie die Sprache und klicken "
+        "Sie auf die Schaltfläche, um zu beginnen. Es ist nicht nötig, ein anderes Programm zu "
+        "installieren, weil alle Seiten auf Ihrem Computer verarbeitet werden. Wenn Sie Fragen haben, "
+        "wenden Sie sich bitte an unser Support-Team, das an jedem Tag der Woche erreichbar ist. Wir "
+        "bieten auch eine kostenlose Version mit den wichtigsten Funktionen sowie Tarife für "
+        "Unternehmen, die mehr brauchen. Ihre Daten werden sicher aufbewahrt und Sie können jederzeit "
+        "kündigen. Vielen Dank, dass Sie sich für unseren Dienst entschieden haben; wir hoffen, dass er "
+        "für Ihre Arbeit nützlich ist.",
+
+        "Die Regierung hat am Montag ein neues Maßnahmenpaket angekündigt, um den Anstieg der "
+        "Lebensmittelpreise zu bremsen. Nach Angaben des Ministers sollen die Maßnahmen im nächsten "
+        "Monat in Kraft treten und niedrigere Steuern auf Grundnahrungsmittel umfassen. Die befragten "
+        "Ökonomen erwarten nur eine begrenzte Wirkung, weil die Inflation auch durch die höheren "
+        "Energiekosten verursacht wird. Die Opposition kritisierte den Vorschlag und erklärte, er komme "
+        "viel zu spät für die Familien, die in den letzten Jahren bereits einen großen Teil ihres "
+        "Einkommens verloren haben.",
+
+        "Entdecken Sie die Angebote der Woche: kostenloser Versand im ganzen Land ab einem "
+        "Bestellwert von hundert Euro. Legen Sie die Artikel in den Warenkorb, prüfen Sie die "
+        "Lieferadresse und wählen Sie die Zahlungsart. Sie können mit Kreditkarte in bis zu zehn "
+        "zinsfreien Raten oder per Überweisung bezahlen. Wenn die Ware beschädigt ankommt, tauschen "
+        "wir sie innerhalb von dreißig Tagen kostenlos um. Verfolgen Sie Ihre Bestellung in der App "
+        "und erhalten Sie eine Nachricht, sobald sich der Status ändert.",
+
+        "Die Stadt liegt nur wenige Stunden von der Hauptstadt entfernt und ist für ihre ruhigen "
+        "Strände und ihre regionale Küche bekannt. In der Altstadt lohnt sich ein Besuch der "
+        "Hauptkirche, der Markthalle und der Museen, die von Dienstag bis Sonntag geöffnet sind. Wer "
+        "die Natur liebt, kann auf den Bergpfaden wandern oder eine Bootsfahrt zu den benachbarten "
+        "Inseln machen. Die beste Reisezeit liegt zwischen Mai und September, wenn es weniger regnet "
+        "und das Wetter angenehmer ist.",
+
+        "Über den Tag verteilt Wasser zu trinken, gut zu schlafen und sich regelmäßig zu bewegen, "
+        "hilft dabei, gesund zu bleiben. Ärzte empfehlen mindestens dreißig Minuten Spazierengehen "
+        "pro Tag und eine Ernährung mit viel Obst und Gemüse. Bei hohem Fieber, starken Schmerzen "
+        "oder Atemnot suchen Sie bitte sofort die Notaufnahme auf. Nehmen Sie keine Medikamente ohne "
+        "ärztlichen Rat ein, auch wenn die Beschwerden harmlos erscheinen.",
+
+        "Durch die Nutzung dieser Website stimmen Sie der Erhebung und Verwendung Ihrer "
+        "personenbezogenen Daten zu, wie sie in dieser Datenschutzerklärung beschrieben ist. Ihre "
+        "Daten werden ausschließlich zur Erbringung der vereinbarten Leistungen verwendet und niemals "
+        "an Dritte verkauft. Sie haben jederzeit das Recht auf Auskunft, Berichtigung und Löschung "
+        "Ihrer Daten. Wir verwenden Cookies, um Ihr Nutzungserlebnis zu verbessern und "
+        "Zugriffsstatistiken zu erstellen.",
+
+        "Hallo, wie geht's? Ich wollte dich gestern anrufen, aber ich bin erst sehr spät nach Hause "
+        "gekommen. Hast du am Samstag immer noch Lust auszugehen? Wir könnten in dem Restaurant am "
+        "Platz zu Mittag essen und danach ins Kino gehen. Wenn es regnet, bleiben wir einfach zu Hause "
+        "und schauen einen Film. Sag mir Bescheid, was du denkst, denn ich muss es bis morgen wissen. "
+        "Bis bald!"
+    ),
+    "it": (
+        "Il sistema ti permette di tradurre i file del tuo sito in modo semplice e veloce. "
+        "Per iniziare, seleziona la cartella di origine e la cartella di destinazione, scegli la lingua "
+        "e fai clic sul pulsante per cominciare. Non è necessario installare nessun altro programma, "
+        "perché tutte le pagine vengono elaborate sul tuo computer. Se hai delle domande, contatta il "
+        "nostro gruppo di assistenza, che è disponibile tutti i giorni della settimana. Offriamo anche "
+        "una versione gratuita con le funzioni principali, oltre a piani per le aziende che hanno "
+        "bisogno di più risorse. Le tue informazioni sono conservate al sicuro e puoi annullare quando "
+        "vuoi. Grazie per aver scelto il nostro servizio; speriamo che sia utile per il tuo lavoro.",
+
+        "Il governo ha annunciato lunedì un nuovo pacchetto di misure per frenare l'aumento dei "
+        "prezzi dei generi alimentari. Secondo il ministro, gli interventi entreranno in vigore il "
+        "mese prossimo e comprendono una riduzione delle tasse sui prodotti di prima necessità. Gli "
+        "economisti sentiti dal nostro giornale ritengono che l'effetto sarà limitato, perché "
+        "l'inflazione è dovuta anche all'aumento del costo dell'energia. L'opposizione ha criticato "
+        "la proposta e ha detto che arriva troppo tardi per le famiglie che negli ultimi anni hanno "
+        "già perso gran parte del loro reddito.",
+
+        "Approfitta delle offerte della settimana: spedizione gratuita in tutta Italia per ordini "
+        "superiori a cento euro. Aggiungi i prodotti al carrello, controlla l'indirizzo di consegna "
+        "e scegli il metodo di pagamento. Puoi pagare con carta di credito fino a dieci rate senza "
+        "interessi oppure con bonifico bancario. Se il prodotto arriva danneggiato, la sostituzione "
+        "è gratuita entro trenta giorni. Segui il tuo ordine dall'applicazione e ricevi un avviso "
+        "ogni volta che cambia lo stato.",
+
+        "La città si trova a poche ore dalla capitale ed è famosa per le sue spiagge dalle acque "
+        "tranquille e per la cucina tipica. Nel centro storico vale la pena visitare la chiesa "
+        "principale, il mercato coperto e i musei, aperti dal martedì alla domenica. Chi preferisce "
+        "la natura può percorrere i sentieri di montagna o fare un giro in barca tra le isole vicine. "
+        "Il periodo migliore per partire è tra maggio e settembre, quando piove meno e il clima è più "
+        "piacevole.",
+
+        "Bere acqua durante la giornata, dormire bene e fare attività fisica con regolarità aiutano "
+        "a mantenersi in salute. I medici consigliano almeno trenta minuti di camminata al giorno e "
+        "un'alimentazione ricca di frutta e verdura. In caso di febbre alta, dolore forte o "
+        "difficoltà a respirare, rivolgiti subito al pronto soccorso. Non prendere farmaci senza il "
+        "parere di un medico, anche se i sintomi sembrano lievi.",
+
+        "Utilizzando questo sito, accetti la raccolta e l'uso dei tuoi dati personali secondo quanto "
+        "descritto nella presente informativa sulla privacy. I dati vengono utilizzati soltanto per "
+        "fornire i servizi richiesti e non vengono mai venduti a terzi. Hai il diritto di accedere, "
+        "rettificare o cancellare le tue informazioni in qualsiasi momento. Utilizziamo i cookie per "
+        "migliorare la tua esperienza di navigazione e per elaborare statistiche di accesso.",
+
+        "Ciao, come stai? Volevo chiamarti ieri, ma sono tornato a casa molto tardi. Ti va ancora di "
+        "uscire sabato? Potremmo pranzare in quel ristorante vicino alla piazza e poi andare al "
+        "cinema. Se piove, restiamo a casa e guardiamo un film. Fammi sapere cosa ne pensi, perché "
+        "devo saperlo entro domani. Un abbraccio e a presto!"
+    ),
+}
@@ -0,0 +1,190 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from translator.backends import BackendError, TranslationBackend
+
+try:
+    import ctranslate2
+    import sentencepiece
+except ImportError:
+    ctranslate2 = None
+    sentencepiece = None
+
+# Estado de cada processo do pool: (modelos, carregador, opções, modelos já carregados).
+_worker_state = None
+
+
+def _first_file(directories, names):
+    for directory in directories:
+        for name in names:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+class CTranslate2Model:
+    """Modelo CTranslate2 com os tokenizadores SentencePiece.
+
+    Aceita um modelo Marian convertido (model.bin, source.spm, target.spm)
+    ou um pacote no formato do Argos (pasta model/ e sentencepiece.model).
+    source_prefix é o token de idioma dos modelos com vários destinos,
+    como ">>pt_BR<<".
+    """
+
+    def __init__(self, path, device="cpu", intra_threads=1, beam_size=2, max_batch_size=32, source_prefix=None):
+        if ctranslate2 is None:
+            raise ValueError("O backend local precisa de ctranslate2 e sentencepiece: "
+                             "pip install ctranslate2 sentencepiece")
+        model_dir = os.path.join(path, "model")
+        if not os.path.isdir(model_dir):
+            model_dir = path
+        source_spm = _first_file((path, model_dir), ("source.spm", "sentencepiece.model"))
+        target_spm = _first_file((path, model_dir), ("target.spm", "sentencepiece.model"))
+        if source_spm is None or target_spm is None:
+            raise ValueError(f"Tokenizador SentencePiece não encontrado em {path}")
+        self.translator = ctranslate2.Translator(model_dir, device=device, inter_threads=1,
+                                                 intra_threads=intra_threads)
+        self.source = sentencepiece.SentencePieceProcessor(model_file=source_spm)
+        self.target = sentencepiece.SentencePieceProcessor(model_file=target_spm)
+        self.beam_size = beam_size
+        self.max_batch_size = max_batch_size
+        self.source_prefix = source_prefix
+
+    def translate(self, texts):
+        results = list(texts)
+        batch = []
+        indexes = []
+        for index, text in enumerate(texts):
+            if not text.strip():
+                continue
+            tokens = self.source.encode(text.strip(), out_type=str)
+            if self.source_prefix:
+                tokens = [self.source_prefix] + tokens
+            batch.append(tokens)
+            indexes.append(index)
+        if batch:
+            outputs = self.translator.translate_batch(batch, beam_size=self.beam_size,
+                                                      max_batch_size=self.max_batch_size)
+            for index, output in zip(indexes, outputs):
+                results[index] = self.target.decode(output.hypotheses[0])
+        return results
+
+
+def load_ctranslate2_model(spec, options):
+    """Carregador padrão: spec é o caminho do modelo ou {"path": ..., "source_prefix": ...}."""
+    if isinstance(spec, str):
+        spec = {"path": spec}
+    return CTranslate2Model(**dict(options, **spec))
+
+
+def _init_model_worker(models, loader, options):
+    global _worker_state
+    _worker_state = (models, loader, options, {})
+
+
+def _translate_in_worker(texts, target):
+    models, loader, options, loaded = _worker_state
+    model = loaded.get(target)
+    if model is None:
+        model = loader(models[target], options)
+        loaded[target] = model
+    return model.translate(texts)
+
+
+class LocalModelBackend(TranslationBackend):
+    """Backend offline que traduz com modelos locais num pool de processos.
+
+    models mapeia o código de destino (os valores de language_map, como
+    "pt" ou "es") para o modelo daquele idioma. Cada processo carrega um
+    modelo só na primeira vez que o idioma aparece e o mantém até close().
+    Um lote é dividido entre os processos em partes de até batch_size
+    segmentos, de modo que a vazão cresce com o número de núcleos.
+
+    loader(spec, options) cria o modelo dentro do processo e deve ser uma
+    função de módulo; o padrão usa CTranslate2 com SentencePiece.
+    """
+    name = "local"
+
+    def __init__(self, models, workers=None, batch_size=32, loader=None, device="cpu", intra_threads=1,
+                 beam_size=2):
+        if loader is None:
+            loader = load_ctranslate2_model
+            if ctranslate2 is None:
+                raise ValueError("O backend local precisa de ctranslate2 e sentencepiece: "
+                                 "pip install ctranslate2 sentencepiece")
+        if not models:
+            raise ValueError("Nenhum modelo local configurado")
+        self.models = dict(models)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.loader = loader
+        self.options = {
+            "device": device,
+            "intra_threads": intra_threads,
+            "beam_size": beam_size,
+            "max_batch_size": self.batch_size
+        }
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, model_dir, **kwargs):
+        """Um modelo por subpasta, com o nome do código de destino (model_dir/pt, model_dir/es...)."""
+        models = {
+            entry.name: entry.path
+            for entry in os.scandir(model_dir)
+            if entry.is_dir()
+        }
+        return cls(models, **kwargs)
+
+    @property
+    def languages(self):
+        return list(self.models)
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_model_worker,
+                    initargs=(self.models, self.loader, self.options)
+                )
+            return self._pool
+
+    def _submit(self, texts, target):
+        if target not in self.models:
+            raise BackendError(f"Modelo local não encontrado para o idioma {target}")
+        size = min(self.batch_size, math.ceil(len(texts) / self.workers))
+        pool = self._executor()
+        return [
+            pool.submit(_translate_in_worker, texts[start:start + size], target)
+            for start in range(0, len(texts), size)
+        ]
+
+    def translate_batch(self, texts, target):
+        texts = list(texts)
+        if not texts:
+            return []
+        results = []
+        for future in self._submit(texts, target):
+            results.extend(future.result())
+        return results
+
+    async def translate_batch_async(self, texts, target):
+        texts = list(texts)
+        if not texts:
+            return []
+        parts = await asyncio.gather(*(asyncio.wrap_future(future) for future in self._submit(texts, target)))
+        return [text for part in parts for text in part]
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = ".translation-manifest.json"
+
+
+def file_hash(path):
+    """Calcula o SHA-256 do conteúdo de um arquivo."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Registro dos arquivos de origem já processados num diretório de destino.
+
+    Guarda, para cada caminho relativo, o hash do conteúdo, o tamanho e o
+    mtime da origem, além do idioma de destino e da versão do motor. Um
+    manifesto de outro idioma ou versão é tratado como vazio.
+    """
+
+    def __init__(self, target_dir, target_language, engine_version):
+        self.path = os.path.join(target_dir, MANIFEST_NAME)
+        self.target_language = target_language
+        self.engine_version = engine_version
+        self.files = {}
+
+    @classmethod
+    def load(cls, target_dir, target_language, engine_version):
+        manifest = cls(target_dir, target_language, engine_version)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return manifest
+        if data.get("target_language") == target_language and data.get("engine_version") == engine_version:
+            manifest.files = data.get("files", {})
+        return manifest
+
+    def is_unchanged(self, rel_path, source_file, target_file, source_stat=None):
+        """Indica se a origem é igual à registrada e a saída ainda existe.
+
+        Tamanho e mtime iguais bastam; caso contrário o hash decide, e o
+        registro é atualizado se só o mtime mudou. source_stat evita um novo
+        os.stat quando a varredura já o obteve.
+        """
+        entry = self.files.get(rel_path)
+        if entry is None or not os.path.exists(target_file):
+            return False
+        stat = source_stat if source_stat is not None else os.stat(source_file)
+        if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return True
+        if entry["size"] != stat.st_size:
+            return False
+        if entry["hash"] == file_hash(source_file):
+            entry["mtime"] = stat.st_mtime
+            return True
+        return False
+
+    def record(self, rel_path, source_file, digest=None):
+        stat = os.stat(source_file)
+        self.files[rel_path] = {
+            "hash": digest or file_hash(source_file),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime
+        }
+
+    def forget(self, rel_path):
+        self.files.pop(rel_path, None)
+
+    def save(self):
+        data = {
+            "target_language": self.target_language,
+            "engine_version": self.engine_version,
+            "files": self.files
+        }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+
+
+class ProgressTracker:
+    """Acompanha o andamento de uma tradução e emite eventos de estatísticas.
+
+    O trabalho é medido em segmentos enviados para tradução e em bytes dos
+    arquivos HTML/XML processados, de modo que um arquivo grande também faz
+    o progresso andar. Os eventos são dicionários entregues a `callback` no
+    máximo uma vez a cada `interval` segundos; podem partir de qualquer
+    thread do motor. `extra` devolve contadores do motor (chamadas ao
+    backend, acertos da memória) incluídos em cada evento.
+    """
+
+    def __init__(self, callback, interval=0.25, extra=None):
+        self.callback = callback
+        self.interval = interval
+        self.extra = extra
+        self.segments_known = False
+        self.segments_total = 0
+        self.segments_done = 0
+        self.files_total = 0
+        self.files_done = 0
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.segments_estimated = 0
+        self._sizes = {}
+        self._partial = {}
+        self._percent = 0.0
+        self._start = time.monotonic()
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def set_files(self, files, file_index=None):
+        """Registra os arquivos a traduzir, para os totais de arquivos e bytes.
+
+        Com um FileIndex, tamanhos e a estimativa de segmentos vêm da
+        varredura, sem novos acessos ao disco.
+        """
+        with self._lock:
+            for source_file in files:
+                entry = file_index.get(source_file) if file_index is not None else None
+                if entry is not None:
+                    size = entry.size
+                    self.segments_estimated += entry.estimated_segments
+                else:
+                    size = _file_size(source_file)
+                self._sizes[source_file] = size
+                self.bytes_total += size
+            self.files_total += len(files)
+        self.update()
+
+    def add_segments(self, count):
+        with self._lock:
+            self.segments_total += count
+
+    def advance_segments(self, count):
+        with self._lock:
+            self.segments_done += count
+        self.update()
+
+    def advance_file(self, source_file, bytes_read):
+        """Registra a leitura parcial de um arquivo processado aos poucos."""
+        with self._lock:
+            previous = self._partial.get(source_file, 0)
+            if bytes_read > previous:
+                self._partial[source_file] = bytes_read
+                self.bytes_done += bytes_read - previous
+        self.update()
+
+    def finish_file(self, source_file):
+        with self._lock:
+            size = self._sizes.get(source_file, 0)
+            self.bytes_done += max(0, size - self._partial.pop(source_file, 0))
+            self.files_done += 1
+        self.update()
+
+    def update(self, force=False):
+        """Emite um evento se o intervalo mínimo já passou (ou se force)."""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last < self.interval:
+                return
+            self._last = now
+            event = self._snapshot(now)
+        self.callback(event)
+
+    def _snapshot(self, now):
+        elapsed = now - self._start
+        segment_fraction = self.segments_done / self.segments_total if self.segments_total else 1.0
+        byte_fraction = self.bytes_done / self.bytes_total if self.bytes_total else (
+            self.files_done / self.files_total if self.files_total else 1.0)
+        if self.segments_known:
+            fraction = (min(segment_fraction, 1.0) + byte_fraction) / 2
+        else:
+            fraction = byte_fraction
+        self._percent = max(self._percent, min(fraction, 1.0) * 100)
+
+        event = {
+            "percent": self._percent,
+            "segments_done": self.segments_done,
+            "segments_total": self.segments_total,
+            "segments_estimated": self.segments_estimated,
+            "files_done": self.files_done,
+            "files_total": self.files_total,
+            "bytes_done": self.bytes_done,
+            "bytes_total": self.bytes_total,
+            "elapsed": elapsed,
+            "segments_per_sec": self.segments_done / elapsed if elapsed else 0.0,
+            "bytes_per_sec": self.bytes_done / elapsed if elapsed else 0.0,
+            "eta_seconds": None
+        }
+        if 0 < self._percent < 100:
+            event["eta_seconds"] = elapsed * (100 - self._percent) / self._percent
+        elif self._percent >= 100:
+            event["eta_seconds"] = 0.0
+        if self.extra is not None:
+            event.update(self.extra())
+        event["calls_per_sec"] = event.get("backend_calls", 0) / elapsed if elapsed else 0.0
+        return event
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -0,0 +1,74 @@
+import asyncio
+import random
+import threading
+import time
+
+
+def is_throttle_error(error):
+    """Indica se o erro do backend é um limite de taxa (429) ou falha temporária (5xx)."""
+    status = getattr(error, 'status_code', None)
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """Tempo de espera antes da nova tentativa: exponencial com jitter completo."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveRateLimiter:
+    """Token bucket com taxa adaptativa.
+
+    A taxa (requisições por segundo) cai pela metade a cada erro de limite
+    e volta a subir aos poucos a cada sucesso, de modo que a vazão acompanha
+    o limite real do provedor em vez de um intervalo fixo. Pode ser usado
+    tanto por threads (wait) quanto por corrotinas (acquire).
+    """
+
+    def __init__(self, rate=5.0, burst=None, min_rate=0.2, max_rate=None, increase=0.5,
+                 backoff_base=0.5, backoff_cap=30.0):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.throttled = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Reserva um token e devolve quantos segundos esperar por ele."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def wait(self):
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire(self):
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def on_success(self):
+        with self._lock:
+            self.rate += self.increase
+            if self.max_rate is not None:
+                self.rate = min(self.rate, self.max_rate)
+
+    def on_throttle(self):
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def backoff(self, attempt):
+        return backoff_delay(attempt, self.backoff_base, self.backoff_cap)
@@ -0,0 +1,378 @@
+import hashlib
+import json
+import re
+from collections import deque
+
+_TOKEN = re.compile(r'<\s*g\s*(\d+)\s*/\s*>')
+_CSS_PART = re.compile(r'''\s*(>)\s*|(\s+)|((?:[^\s>\[]|\[[^\]]*\])+)''')
+_CSS_COMPOUND = re.compile(r'''(\*|[\w:-]+)?((?:[#.][\w-]+|\[[^\]]*\])*)$''')
+_CSS_FILTER = re.compile(r'''([#.])([\w-]+)|\[\s*([\w:-]+)\s*(?:=\s*("[^"]*"|'[^']*'|[^\]\s]*))?\s*\]''')
+_XPATH_STEP = re.compile(r'''(//?)(\*|[\w:.-]+)((?:\[[^\]]*\])*)''')
+_XPATH_PREDICATE = re.compile(r'''\[\s*@([\w:-]+)\s*(?:=\s*("[^"]*"|'[^']*'))?\s*\]''')
+
+
+def _local(name):
+    """Nome sem namespace ({uri}nome) e sem prefixo (prefixo:nome), em minúsculas."""
+    if name[:1] == '{':
+        name = name.split('}', 1)[1]
+    return name.rsplit(':', 1)[-1].lower()
+
+
+def _attr(attrs, name):
+    value = attrs.get(name)
+    if value is None:
+        for key, candidate in attrs.items():
+            if _local(key) == name:
+                value = candidate
+                break
+    if isinstance(value, list):
+        value = ' '.join(value)
+    return value
+
+
+def _unquote(value):
+    if value and value[0] in '"\'':
+        return value[1:-1]
+    return value
+
+
+def _is_document(node):
+    return node is None or node.name == '[document]'
+
+
+class PathNode:
+    """Elemento visto na árvore, com o pai, para avaliar seletores sem DOM."""
+    __slots__ = ('name', 'attrs', 'parent', 'protected')
+
+    def __init__(self, name, attrs, parent=None):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.protected = False
+
+
+class _Compound:
+    __slots__ = ('name', 'filters')
+
+    def __init__(self, name, filters):
+        self.name = None if name in (None, '*') else _local(name)
+        self.filters = filters
+
+    def matches(self, node):
+        if _is_document(node):
+            return False
+        if self.name is not None and _local(node.name) != self.name:
+            return False
+        for attr, value in self.filters:
+            found = _attr(node.attrs, attr)
+            if found is None:
+                return False
+            if attr == 'class' and value is not None:
+                if value not in found.split():
+                    return False
+            elif value is not None and found != value:
+                return False
+        return True
+
+
+class Selector:
+    """Seletor CSS ou XPath simples, avaliado do elemento em direção à raiz.
+
+    CSS: tag, *, #id, .classe, [atributo] e [atributo=valor], combinados
+    por descendência (espaço) ou filho direto (>). XPath: passos com / e
+    //, tag ou *, e predicados [@atributo] ou [@atributo='valor']. Nomes
+    são comparados sem namespace e sem diferenciar maiúsculas.
+    """
+
+    def __init__(self, source, steps):
+        self.source = source
+        self.steps = steps
+
+    @classmethod
+    def css(cls, source):
+        steps = []
+        axis = 'descendant'
+        position = 0
+        source = source.strip()
+        while position < len(source):
+            match = _CSS_PART.match(source, position)
+            if match is None or match.end() == position:
+                raise ValueError(f"Seletor CSS não suportado: {source}")
+            position = match.end()
+            if match.group(1):
+                axis = 'child'
+            elif match.group(3):
+                compound = _CSS_COMPOUND.match(match.group(3))
+                if compound is None:
+                    raise ValueError(f"Seletor CSS não suportado: {source}")
+                filters = []
+                for item in _CSS_FILTER.finditer(compound.group(2)):
+                    if item.group(1) == '#':
+                        filters.append(('id', item.group(2)))
+                    elif item.group(1) == '.':
+                        filters.append(('class', item.group(2)))
+                    else:
+                        filters.append((_local(item.group(3)), _unquote(item.group(4))))
+                steps.append((axis, _Compound(compound.group(1), filters)))
+                axis = 'descendant'
+        if not steps:
+            raise ValueError(f"Seletor CSS vazio: {source!r}")
+        return cls(source, steps)
+
+    @classmethod
+    def xpath(cls, source):
+        steps = []
+        expression = source.strip()
+        if not expression.startswith('/'):
+            expression = '//' + expression
+        position = 0
+        while position < len(expression):
+            match = _XPATH_STEP.match(expression, position)
+            if match is None:
+                raise ValueError(f"XPath não suportado: {source}")
+            position = match.end()
+            filters = []
+            predicates = match.group(3)
+            for predicate in _XPATH_PREDICATE.finditer(predicates):
+                filters.append((_local(predicate.group(1)), _unquote(predicate.group(2))))
+            if len(''.join(item.group(0) for item in _XPATH_PREDICATE.finditer(predicates))) != len(predicates):
+                raise ValueError(f"XPath não suportado: {source}")
+            if match.group(1) == '//':
+                axis = 'descendant'
+            else:
+                axis = 'child' if steps else 'root'
+            steps.append((axis, _Compound(match.group(2), filters)))
+        return cls(source, steps)
+
+    def matches(self, node):
+        return self._match(len(self.steps) - 1, node)
+
+    def _match(self, index, node):
+        axis, compound = self.steps[index]
+        if not compound.matches(node):
+            return False
+        parent = node.parent
+        if index == 0:
+            return axis != 'root' or _is_document(parent)
+        if axis == 'child' or axis == 'root':
+            return not _is_document(parent) and self._match(index - 1, parent)
+        while not _is_document(parent):
+            if self._match(index - 1, parent):
+                return True
+            parent = parent.parent
+        return False
+
+
+class TermMatcher:
+    """Autômato de Aho-Corasick sobre uma lista de termos.
+
+    Encontra em uma única passada todas as ocorrências dos termos no texto
+    e fica com as mais longas à esquerda, sem sobreposição. Um termo só
+    casa em fronteira de palavra, para que "Go" não case dentro de "Google".
+    """
+
+    def __init__(self, terms, ignore_case=False):
+        self.ignore_case = ignore_case
+        self.terms = list(terms)
+        self._lengths = [len(term) for term in self.terms]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for index, term in enumerate(self.terms):
+            node = 0
+            for char in self._fold(term):
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = child
+            self._out[node] = self._out[node] + (index,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _fold(self, text):
+        if not self.ignore_case:
+            return text
+        folded = text.lower()
+        if len(folded) != len(text):
+            folded = ''.join(char.lower() if len(char.lower()) == 1 else char for char in text)
+        return folded
+
+    def find(self, text):
+        """Lista de (início, fim, índice do termo) das ocorrências escolhidas."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        found = []
+        node = 0
+        for position, char in enumerate(self._fold(text)):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                end = position + 1
+                for index in out[node]:
+                    start = end - self._lengths[index]
+                    if _bounded(text, start, end):
+                        found.append((start, end, index))
+        if len(found) > 1:
+            found.sort(key=lambda match: (match[0], -match[1]))
+            chosen = []
+            last = 0
+            for match in found:
+                if match[0] >= last:
+                    chosen.append(match)
+                    last = match[1]
+            found = chosen
+        return found
+
+
+def _word(char):
+    return char.isalnum() or char == '_'
+
+
+def _bounded(text, start, end):
+    if start > 0 and _word(text[start]) and _word(text[start - 1]):
+        return False
+    if end < len(text) and _word(text[end - 1]) and _word(text[end]):
+        return False
+    return True
+
+
+class TranslationRules:
+    """Glossário e regras do que não deve ser traduzido.
+
+    - do_not_translate: termos mantidos como estão (nomes de produtos,
+      identificadores de código);
+    - glossary: termo -> tradução fixa, uma string para todos os idiomas ou
+      um dicionário {idioma: tradução};
+    - selectors / xpaths: elementos protegidos, com todo o seu conteúdo;
+    - honor_notranslate: respeita translate="no" e class="notranslate".
+
+    Os termos são compilados num TermMatcher. protect() troca cada
+    ocorrência por um placeholder <gN/> antes do backend e restore() os
+    substitui de volta pelo termo ou pela tradução fixa do idioma.
+    """
+
+    def __init__(self, do_not_translate=(), glossary=None, selectors=(), xpaths=(), honor_notranslate=True,
+                 ignore_case=False):
+        self.glossary = dict(glossary or {})
+        self.do_not_translate = list(do_not_translate)
+        self.selectors = [Selector.css(source) for source in selectors] + \
+                         [Selector.xpath(source) for source in xpaths]
+        self._sources = {"selectors": list(selectors), "xpaths": list(xpaths)}
+        self.honor_notranslate = honor_notranslate
+        self.ignore_case = ignore_case
+
+        terms = {}
+        for term, value in self.glossary.items():
+            terms.setdefault(term.strip(), value)
+        for term in self.do_not_translate:
+            terms.setdefault(term.strip(), None)
+        terms.pop('', None)
+        self._entries = list(terms.values())
+        self.matcher = TermMatcher(list(terms), ignore_case) if terms else None
+
+        config = {
+            "do_not_translate": self.do_not_translate,
+            "glossary": self.glossary,
+            "selectors": self._sources["selectors"],
+            "xpaths": self._sources["xpaths"],
+            "honor_notranslate": honor_notranslate,
+            "ignore_case": ignore_case
+        }
+        digest = json.dumps(config, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        self.fingerprint = hashlib.sha1(digest).hexdigest()[:12]
+
+    @classmethod
+    def load(cls, path):
+        """Carrega as regras de um arquivo JSON com as mesmas chaves do construtor."""
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(**data)
+
+    @property
+    def protects_elements(self):
+        return self.honor_notranslate or bool(self.selectors)
+
+    def protects(self, node):
+        """Indica se o elemento (com .name, .attrs e .parent) está protegido."""
+        attrs = node.attrs
+        if self.honor_notranslate and attrs:
+            translate = _attr(attrs, 'translate')
+            if translate is not None and translate.strip().lower() == 'no':
+                return True
+            classes = _attr(attrs, 'class')
+            if classes and 'notranslate' in classes.split():
+                return True
+        return any(selector.matches(node) for selector in self.selectors)
+
+    def protect(self, text):
+        """Troca os termos do texto por placeholders; devolve (texto protegido, termos).
+
+        termos é a lista de (índice do termo, trecho original), na ordem dos
+        placeholders <g1/>, <g2/>...
+        """
+        if self.matcher is None or _TOKEN.search(text):
+            return text, []
+        matches = self.matcher.find(text)
+        if not matches:
+            return text, []
+        parts = []
+        terms = []
+        position = 0
+        for start, end, index in matches:
+            parts.append(text[position:start])
+            terms.append((index, text[start:end]))
+            parts.append(f"<g{len(terms)}/>")
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts), terms
+
+    def restore(self, translated, terms, dest_lang, aliases=()):
+        """Recoloca os termos na tradução, ou None se algum placeholder se perdeu.
+
+        aliases são outros códigos do mesmo idioma (como "pt-br" para "pt")
+        procurados nas traduções fixas do glossário depois de dest_lang.
+        """
+        if not terms:
+            return translated
+        seen = set()
+        for match in _TOKEN.finditer(translated):
+            number = int(match.group(1))
+            if number in seen or not 1 <= number <= len(terms):
+                return None
+            seen.add(number)
+        if len(seen) != len(terms):
+            return None
+        return _TOKEN.sub(lambda match: self._replacement(terms[int(match.group(1)) - 1], dest_lang, aliases),
+                          translated)
+
+    def _replacement(self, term, dest_lang, aliases=()):
+        index, original = term
+        value = self._entries[index]
+        if isinstance(value, dict):
+            found = None
+            for language in (dest_lang, *aliases, dest_lang.split('-')[0]):
+                found = value.get(language)
+                if found:
+                    break
+            value = found
+        return value if value else original
+
+
+def strip_tokens(text):
+    """Remove os placeholders de termos protegidos."""
+    return _TOKEN.sub('', text)
@@ -0,0 +1,109 @@
+import os
+
+TRANSLATABLE_EXTENSIONS = {'.html': 'html', '.htm': 'html', '.xml': 'xml'}
+
+# Bytes por segmento traduzível, em média, usados só para estimativas.
+_BYTES_PER_SEGMENT = {'html': 160, 'xml': 120}
+
+
+def file_kind(name):
+    """Classifica um arquivo pelo nome: 'html', 'xml' ou 'copy'."""
+    return TRANSLATABLE_EXTENSIONS.get(os.path.splitext(name)[1].lower(), 'copy')
+
+
+class FileEntry:
+    """Um arquivo encontrado na varredura, com o stat obtido do os.scandir."""
+
+    __slots__ = ('path', 'rel_path', 'kind', 'stat')
+
+    def __init__(self, path, rel_path, kind, stat):
+        self.path = path
+        self.rel_path = rel_path
+        self.kind = kind
+        self.stat = stat
+
+    @property
+    def size(self):
+        return self.stat.st_size
+
+    @property
+    def estimated_segments(self):
+        if self.kind == 'copy':
+            return 0
+        return max(1, self.size // _BYTES_PER_SEGMENT[self.kind])
+
+
+class FileIndex:
+    """Índice de uma árvore de origem, montado por uma única varredura.
+
+    Os arquivos ficam na ordem de um os.walk de cima para baixo, com nomes
+    ordenados, e as pastas em `directories` (caminhos relativos com '/',
+    começando por '.'). É compartilhado pela validação da origem, pelos
+    totais de progresso e pelo plano de tarefas do tradutor.
+    """
+
+    def __init__(self, source_dir, directories, entries):
+        self.source_dir = source_dir
+        self.directories = directories
+        self.entries = entries
+        self._by_path = {entry.path: entry for entry in entries}
+
+    def get(self, path):
+        return self._by_path.get(path)
+
+    def translatable(self):
+        return [entry for entry in self.entries if entry.kind != 'copy']
+
+    @property
+    def has_translatable(self):
+        return any(entry.kind != 'copy' for entry in self.entries)
+
+    @property
+    def translatable_count(self):
+        return sum(1 for entry in self.entries if entry.kind != 'copy')
+
+    @property
+    def translatable_bytes(self):
+        return sum(entry.size for entry in self.entries if entry.kind != 'copy')
+
+    @property
+    def estimated_segments(self):
+        return sum(entry.estimated_segments for entry in self.entries)
+
+
+def scan_directory(source_dir, control=None):
+    """Varre a árvore com os.scandir e devolve um FileIndex.
+
+    Cada pasta é lida uma única vez e o stat de cada arquivo vem da própria
+    entrada do scandir. Pastas ilegíveis são ignoradas. Um JobControl em
+    control permite interromper a varredura entre pastas.
+    """
+    directories = []
+    entries = []
+    stack = ['.']
+    while stack:
+        if control is not None:
+            control.checkpoint()
+        rel_dir = stack.pop()
+        directory = source_dir if rel_dir == '.' else os.path.join(source_dir, *rel_dir.split('/'))
+        try:
+            with os.scandir(directory) as iterator:
+                items = sorted(iterator, key=lambda item: item.name)
+        except OSError as e:
+            print(f"Erro ao ler a pasta {directory}: {str(e)}")
+            continue
+        directories.append(rel_dir)
+
+        subdirs = []
+        for item in items:
+            rel_path = item.name if rel_dir == '.' else f"{rel_dir}/{item.name}"
+            try:
+                if item.is_dir(follow_symlinks=False):
+                    subdirs.append(rel_path)
+                elif item.is_file():
+                    entries.append(FileEntry(item.path, rel_path, file_kind(item.name), item.stat()))
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+    return FileIndex(source_dir, directories, entries)
+
@@ -0,0 +1,158 @@
+import re
+
+PLACEHOLDER = re.compile(r'<x(\d+)>(.*?)</x\1>', re.S)
+_ANY_PLACEHOLDER = re.compile(r'</?x\d+>')
+_SENTENCE_END = re.compile(r'(?<=[.!?;:…。！？])\s+')
+_TOKEN = re.compile(r'</?x\d+>|&amp;|&lt;|.', re.S)
+
+
+def escape_text(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;')
+
+
+def unescape_text(text):
+    return text.replace('&lt;', '<').replace('&amp;', '&')
+
+
+def strip_placeholders(text):
+    """Remove as tags de marcação de um texto com placeholders."""
+    return unescape_text(_ANY_PLACEHOLDER.sub('', text))
+
+
+def encode_inline(pieces):
+    """Monta uma unidade traduzível a partir de pedaços (texto ou (índice, texto interno)).
+
+    Cada elemento inline vira <xN>...</xN>, com N começando em 1, e o texto
+    comum é escapado para não ser confundido com as marcações.
+    """
+    parts = []
+    for piece in pieces:
+        if isinstance(piece, tuple):
+            index, inner = piece
+            parts.append(f"<x{index}>{escape_text(inner)}</x{index}>")
+        else:
+            parts.append(escape_text(piece))
+    return ''.join(parts)
+
+
+def decode_inline(text, count):
+    """Desfaz encode_inline sobre a tradução.
+
+    Devolve a lista de pedaços, ou None se algum placeholder sumiu, repetiu
+    ou veio malformado na tradução.
+    """
+    pieces = []
+    seen = set()
+    position = 0
+    for match in PLACEHOLDER.finditer(text):
+        index = int(match.group(1))
+        if index in seen or not 1 <= index <= count:
+            return None
+        seen.add(index)
+        if match.start() > position:
+            pieces.append(text[position:match.start()])
+        pieces.append((index, match.group(2)))
+        position = match.end()
+    if len(seen) != count:
+        return None
+    if position < len(text):
+        pieces.append(text[position:])
+    # A verificação é feita antes de desescapar: um "<x1>" literal do texto
+    # original chega escapado e não é uma marcação solta.
+    if any(_ANY_PLACEHOLDER.search(piece[1] if isinstance(piece, tuple) else piece) for piece in pieces):
+        return None
+    return [(piece[0], unescape_text(piece[1])) if isinstance(piece, tuple) else unescape_text(piece)
+            for piece in pieces]
+
+
+def _balanced(text):
+    opened = 0
+    for match in _ANY_PLACEHOLDER.finditer(text):
+        opened += -1 if match.group(0)[1] == '/' else 1
+    return opened == 0
+
+
+def _cut_position(sentence, max_chars):
+    """Posição onde cortar uma frase longa fora de qualquer placeholder aberto.
+
+    Prefere o último espaço até max_chars; sem espaço, a última fronteira
+    entre caracteres que não parta uma marcação ou entidade. Se o começo da
+    frase está todo dentro de um placeholder, corta logo depois dele, mesmo
+    passando do limite, e devolve len(sentence) quando não há onde cortar.
+    """
+    depth = 0
+    space = boundary = 0
+    for match in _TOKEN.finditer(sentence):
+        position = match.start()
+        if depth == 0 and position > 0:
+            if position > max_chars:
+                return space or boundary or position
+            boundary = position
+            if match.group(0) == ' ':
+                space = position
+        token = match.group(0)
+        if _ANY_PLACEHOLDER.fullmatch(token):
+            depth += -1 if token[1] == '/' else 1
+    return space or boundary or len(sentence)
+
+
+def split_sentences(text, max_chars):
+    """Divide um texto longo em partes de até max_chars, em fins de frase.
+
+    Frases que sozinhas passam do limite são cortadas em espaços (ou, sem
+    espaços, entre caracteres). Uma parte nunca termina dentro de um
+    placeholder aberto, nem que para isso passe do limite.
+    """
+    sentences = []
+    pending = ''
+    for sentence in _SENTENCE_END.split(text):
+        pending = f"{pending} {sentence}" if pending else sentence
+        if _balanced(pending):
+            sentences.append(pending)
+            pending = ''
+    if pending:
+        sentences.append(pending)
+
+    parts = []
+    current = ''
+    for sentence in sentences:
+        while len(sentence) > max_chars:
+            cut = _cut_position(sentence, max_chars)
+            if cut >= len(sentence):
+                break
+            if current:
+                parts.append(current)
+                current = ''
+            parts.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            parts.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        parts.append(current)
+    return parts
+
+
+def pack_payloads(texts, max_chars, separator='\n'):
+    """Agrupa textos em payloads de até max_chars unidos pelo separador.
+
+    Devolve listas de índices; cada lista forma uma requisição. Textos
+    maiores que o limite ficam sozinhos no seu payload.
+    """
+    payloads = []
+    current = []
+    size = 0
+    for index, text in enumerate(texts):
+        extra = len(text) + (len(separator) if current else 0)
+        if current and size + extra > max_chars:
+            payloads.append(current)
+            current = []
+            extra = len(text)
+            size = 0
+        current.append(index)
+        size += extra
+    if current:
+        payloads.append(current)
+    return payloads
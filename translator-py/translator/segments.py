@@ -0,0 +1,277 @@
+import re
+from bs4 import BeautifulSoup, FeatureNotFound, NavigableString, Tag
+from translator.rules import PathNode
+from translator.segmentation import decode_inline, encode_inline, strip_placeholders
+
+_NON_TEXT = re.compile(r'^[\s\d\W]+$')
+_SKIP_PARENTS = frozenset(['script', 'style', 'meta', 'link'])
+_ATTR_TAGS = frozenset(['img', 'input', 'button', 'a', 'meta'])
+_ATTRS = ('title', 'alt', 'placeholder')
+_META_CONTENT = frozenset(['description', 'keywords'])
+_INLINE_TAGS = frozenset([
+    'a', 'abbr', 'b', 'bdi', 'bdo', 'cite', 'code', 'data', 'dfn', 'em', 'i', 'kbd',
+    'mark', 'q', 's', 'samp', 'small', 'span', 'strong', 'sub', 'sup', 'time', 'u', 'var'
+])
+
+
+def is_translatable(text):
+    """Indica se o texto contém algo que valha a pena traduzir."""
+    return len(text) > 1 and not _NON_TEXT.match(text)
+
+
+def normalize(text):
+    """Normaliza espaços para que ocorrências repetidas tenham a mesma chave."""
+    return ' '.join(text.split())
+
+
+class Segment:
+    """Um trecho traduzível.
+
+    Pode ser um nó de texto (attr None), um atributo de um nó ou, quando
+    inline não é None, o conteúdo de um bloco com elementos inline
+    representados por placeholders <xN>.
+    """
+    __slots__ = ('text', 'node', 'attr', 'inline')
+
+    def __init__(self, text, node, attr=None, inline=None):
+        self.text = text
+        self.node = node
+        self.attr = attr
+        self.inline = inline
+
+
+def parse_html(content, parser='html.parser'):
+    """Cria o BeautifulSoup com o parser pedido, voltando ao html.parser se ele não estiver instalado."""
+    try:
+        return BeautifulSoup(content, parser)
+    except FeatureNotFound:
+        return BeautifulSoup(content, 'html.parser')
+
+
+def _inline_unit(tag, rules=None):
+    """Se o bloco mistura texto com elementos inline simples, devolve (pedaços, elementos)."""
+    pieces = []
+    inline = []
+    has_text = False
+    for child in tag.contents:
+        if type(child) is NavigableString:
+            pieces.append(str(child))
+            has_text = has_text or not child.isspace()
+        elif isinstance(child, Tag) and child.name in _INLINE_TAGS:
+            if any(type(grandchild) is not NavigableString for grandchild in child.contents):
+                return None
+            if rules is not None and rules.protects(child):
+                return None
+            inline.append(child)
+            pieces.append((len(inline), child.get_text()))
+        else:
+            return None
+    if not inline or not has_text:
+        return None
+    return pieces, inline
+
+
+def _attr_segments(node, segments):
+    attrs = node.attrs
+    for attr in _ATTRS:
+        value = attrs.get(attr)
+        if value:
+            text = normalize(value)
+            if is_translatable(text):
+                segments.append(Segment(text, node, attr))
+    if node.name == 'meta' and attrs.get('name') in _META_CONTENT and attrs.get('content'):
+        text = normalize(attrs['content'])
+        if is_translatable(text):
+            segments.append(Segment(text, node, 'content'))
+
+
+def extract_html_segments(soup, merge_inline=True, rules=None):
+    """Percorre o documento uma única vez e devolve a lista indexada de segmentos.
+
+    Inclui nós de texto fora de script/style/meta/link e os atributos
+    title/alt/placeholder (e content de meta description/keywords).
+    Comentários, doctype e demais nós especiais são ignorados. Com
+    merge_inline, um bloco como <p>Clique <a>aqui</a> para sair.</p> vira um
+    único segmento com placeholders, em vez de três fragmentos. Elementos
+    protegidos pelas regras (TranslationRules) ficam de fora com todo o seu
+    conteúdo.
+    """
+    if rules is not None and not rules.protects_elements:
+        rules = None
+    segments = []
+    stack = [soup]
+    while stack:
+        node = stack.pop()
+        if type(node) is NavigableString:
+            if node.parent.name not in _SKIP_PARENTS:
+                text = normalize(node)
+                if text and is_translatable(text):
+                    segments.append(Segment(text, node))
+            continue
+        if not isinstance(node, Tag):
+            continue
+        if rules is not None and rules.protects(node):
+            continue
+        if node.name in _ATTR_TAGS and node.attrs:
+            _attr_segments(node, segments)
+        if merge_inline and node.name not in _SKIP_PARENTS:
+            unit = _inline_unit(node, rules)
+            if unit is not None:
+                pieces, inline = unit
+                text = normalize(encode_inline(pieces))
+                if is_translatable(strip_placeholders(text)):
+                    segments.append(Segment(text, node, inline=inline))
+                    for tag in inline:
+                        if tag.name in _ATTR_TAGS and tag.attrs:
+                            _attr_segments(tag, segments)
+                    continue
+        stack.extend(reversed(node.contents))
+    return segments
+
+
+def _rebuild_inline(segment, translated):
+    """Reconstrói o conteúdo do bloco a partir da tradução com placeholders."""
+    pieces = decode_inline(translated, len(segment.inline))
+    if pieces is None:
+        return False
+    block = segment.node
+    original = block.get_text()
+    lead = original[:len(original) - len(original.lstrip())]
+    trail = original[len(original.rstrip()):]
+    for child in list(block.contents):
+        child.extract()
+    if lead:
+        block.append(NavigableString(lead))
+    for piece in pieces:
+        if isinstance(piece, tuple):
+            index, inner = piece
+            tag = segment.inline[index - 1]
+            tag.clear()
+            if inner:
+                tag.append(NavigableString(inner))
+            block.append(tag)
+        else:
+            block.append(NavigableString(piece))
+    if trail:
+        block.append(NavigableString(trail))
+    return True
+
+
+def write_back_html(segments, translations, undo=None):
+    """Aplica as traduções aos segmentos HTML, preservando os espaços ao redor dos textos.
+
+    Atributos são gravados antes dos blocos inline, que reaproveitam os
+    próprios elementos ao serem reconstruídos. Se a tradução de um bloco
+    perder algum placeholder, o bloco fica com o conteúdo original. Se undo
+    for uma lista, nela são registradas as operações para undo_write_back
+    devolver o documento ao estado original.
+    """
+    units = []
+    for segment, translated in zip(segments, translations):
+        if translated == segment.text:
+            continue
+        node = segment.node
+        if segment.inline is not None:
+            units.append((segment, translated))
+        elif segment.attr is not None:
+            if undo is not None:
+                undo.append(('html_attr', node, segment.attr, node[segment.attr]))
+            node[segment.attr] = translated
+        else:
+            original = str(node)
+            lead = original[:len(original) - len(original.lstrip())]
+            trail = original[len(original.rstrip()):]
+            replacement = NavigableString(lead + translated + trail)
+            node.replace_with(replacement)
+            if undo is not None:
+                undo.append(('text', replacement, node))
+    for segment, translated in units:
+        if undo is not None:
+            saved = (list(segment.node.contents), [list(tag.contents) for tag in segment.inline])
+        if not _rebuild_inline(segment, translated):
+            print(f"Marcação inline perdida na tradução, mantendo o original: {segment.text}")
+        elif undo is not None:
+            undo.append(('inline', segment, saved))
+
+
+def extract_xml_segments(root, rules=None):
+    """Lista os segmentos de texto e de atributos de uma árvore ElementTree.
+
+    Elementos protegidos pelas regras ficam de fora com todo o seu conteúdo.
+    """
+    segments = []
+    if rules is None or not rules.protects_elements:
+        elements = root.iter()
+    else:
+        elements = _unprotected(root, rules)
+    for element in elements:
+        if element.text and not element.text.isspace():
+            text = normalize(element.text)
+            if is_translatable(text):
+                segments.append(Segment(text, element))
+        for attr_name, attr_value in element.attrib.items():
+            text = normalize(attr_value)
+            if is_translatable(text):
+                segments.append(Segment(text, element, attr_name))
+    return segments
+
+
+def _unprotected(root, rules):
+    """Percorre a árvore em pré-ordem pulando os elementos protegidos e seus filhos."""
+    stack = [(root, None)]
+    while stack:
+        element, parent = stack.pop()
+        if not isinstance(element.tag, str):
+            continue
+        node = PathNode(element.tag, element.attrib, parent)
+        if rules.protects(node):
+            continue
+        yield element
+        stack.extend((child, node) for child in reversed(element))
+
+
+def write_back_xml(segments, translations, undo=None):
+    for segment, translated in zip(segments, translations):
+        if translated == segment.text:
+            continue
+        if segment.attr is not None:
+            if undo is not None:
+                undo.append(('xml_attr', segment.node, segment.attr, segment.node.attrib[segment.attr]))
+            segment.node.attrib[segment.attr] = translated
+        else:
+            if undo is not None:
+                undo.append(('xml_text', segment.node, segment.node.text))
+            segment.node.text = translated
+
+
+def undo_write_back(undo):
+    """Desfaz, em ordem inversa, as operações registradas por write_back_html/xml.
+
+    Permite gravar o mesmo documento em vários idiomas a partir de um único
+    parse: aplica as traduções, serializa e desfaz antes do próximo idioma.
+    """
+    for operation in reversed(undo):
+        kind = operation[0]
+        if kind == 'html_attr':
+            _, node, attr, value = operation
+            node[attr] = value
+        elif kind == 'text':
+            _, replacement, original = operation
+            replacement.replace_with(original)
+        elif kind == 'inline':
+            _, segment, (contents, inline_contents) = operation
+            for child in list(segment.node.contents):
+                child.extract()
+            for tag, children in zip(segment.inline, inline_contents):
+                tag.clear()
+                for child in children:
+                    tag.append(child)
+            for child in contents:
+                segment.node.append(child)
+        elif kind == 'xml_attr':
+            _, node, attr, value = operation
+            node.attrib[attr] = value
+        else:
+            _, node, value = operation
+            node.text = value
+    undo.clear()
@@ -0,0 +1,341 @@
+import json
+import math
+import os
+import socketserver
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from xml.parsers.expat import ExpatError
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from translator.translator import HTMLXMLTranslator
+
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class ServiceError(Exception):
+    """Erro de uma requisição ao serviço, com o status HTTP da resposta."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LatencyTracker:
+    """Latência de cada endpoint, com percentis sobre as últimas window requisições.
+
+    Os totais (contagem, erros, soma, máximo) cobrem toda a vida do
+    serviço; p50/p90/p99 são calculados sobre a janela mais recente, para
+    refletir o comportamento atual.
+    """
+
+    def __init__(self, window=2048):
+        self.window = window
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, error=False):
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = self._endpoints[endpoint] = [0, 0, 0.0, 0.0, deque(maxlen=self.window)]
+            entry[0] += 1
+            entry[1] += 1 if error else 0
+            entry[2] += seconds
+            entry[3] = max(entry[3], seconds)
+            entry[4].append(seconds)
+
+    def summary(self):
+        with self._lock:
+            entries = {name: (count, errors, total, peak, sorted(recent))
+                       for name, (count, errors, total, peak, recent) in self._endpoints.items()}
+        report = {}
+        for name, (count, errors, total, peak, recent) in sorted(entries.items()):
+            item = {
+                "count": count,
+                "errors": errors,
+                "mean_seconds": total / count if count else 0.0,
+                "max_seconds": peak
+            }
+            for quantile in _QUANTILES:
+                item[f"p{int(quantile * 100)}_seconds"] = _percentile(recent, quantile)
+            report[name] = item
+        return report
+
+    def to_prometheus(self, prefix="translator_service"):
+        lines = [f"# TYPE {prefix}_request_seconds summary"]
+        for name, item in self.summary().items():
+            for quantile in _QUANTILES:
+                value = item[f"p{int(quantile * 100)}_seconds"]
+                lines.append(f'{prefix}_request_seconds{{endpoint="{name}",quantile="{quantile}"}} {value}')
+            lines.append(f'{prefix}_request_seconds_sum{{endpoint="{name}"}} {item["mean_seconds"] * item["count"]}')
+            lines.append(f'{prefix}_request_seconds_count{{endpoint="{name}"}} {item["count"]}')
+            lines.append(f'{prefix}_request_errors_total{{endpoint="{name}"}} {item["errors"]}')
+        return "\n".join(lines) + "\n"
+
+
+def _percentile(values, quantile):
+    """Percentil pelo método do posto mais próximo; values já ordenados."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(quantile * len(values)) - 1))]
+
+
+class TranslationService:
+    """Mantém um HTMLXMLTranslator aquecido para traduções sob demanda.
+
+    Os trechos (fragment) usam um tradutor de longa duração: o backend, com
+    sua sessão HTTP keep-alive, a memória de tradução e a memória da
+    execução continuam em uso entre requisições. Quando a memória da
+    execução passa de max_memory_entries, ela é esvaziada no primeiro
+    momento sem trechos em andamento. Arquivos e diretórios usam um segundo
+    tradutor, com o mesmo backend e a mesma memória de tradução, e são
+    executados um de cada vez.
+
+    Requisições idênticas em andamento são agrupadas: só a primeira é
+    executada e as demais recebem o mesmo resultado. Os caminhos de
+    arquivos e diretórios são relativos a root; sem root, esses endpoints
+    ficam desativados. O workers pedido para um diretório é limitado a
+    max_workers (padrão: um por núcleo).
+    """
+
+    def __init__(self, backend=None, cache=None, root=None, default_language="pt-br",
+                 max_memory_entries=200000, latency_window=2048, max_workers=None, **options):
+        self.translator = HTMLXMLTranslator(backend=backend, cache=cache, **options)
+        self.job_translator = HTMLXMLTranslator(backend=self.translator.backend, cache=cache, **options)
+        self.cache = cache
+        self.root = os.path.realpath(root) if root else None
+        self.default_language = default_language
+        self.max_memory_entries = max_memory_entries
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.latency = LatencyTracker(latency_window)
+        self.started = time.time()
+        self.coalesced = 0
+        self.memory_clears = 0
+        self._inflight = {}
+        self._active = 0
+        self._lock = threading.Lock()
+        self._job_lock = threading.Lock()
+
+    def handle(self, endpoint, payload):
+        """Executa uma requisição (fragment, file ou directory) e devolve a resposta em dicionário."""
+        handlers = {
+            "fragment": self._fragment,
+            "file": self._file,
+            "directory": self._directory
+        }
+        handler = handlers.get(endpoint)
+        if handler is None:
+            raise ServiceError(f"Endpoint desconhecido: {endpoint}", 404)
+        if not isinstance(payload, dict):
+            raise ServiceError("O corpo da requisição deve ser um objeto JSON")
+        start = time.perf_counter()
+        error = True
+        try:
+            key = (endpoint, json.dumps(payload, sort_keys=True, ensure_ascii=False))
+            result = self._coalesce(key, lambda: handler(payload))
+            error = False
+            return result
+        finally:
+            self.latency.record(endpoint, time.perf_counter() - start, error)
+
+    def _coalesce(self, key, function):
+        """Executa function, ou espera o resultado de uma execução idêntica em andamento."""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def translate_fragment(self, content, language=None, kind="html"):
+        """Traduz um trecho HTML ou XML com o tradutor aquecido."""
+        with self._lock:
+            self._active += 1
+        try:
+            return self.translator.translate_fragment(content, language or self.default_language, kind)
+        finally:
+            with self._lock:
+                self._active -= 1
+                if not self._active and self.translator.run_memory_size() > self.max_memory_entries:
+                    self.translator.clear_run_memory()
+                    self.memory_clears += 1
+
+    def _fragment(self, payload):
+        content = payload.get("content")
+        kind = payload.get("kind", "html")
+        if not isinstance(content, str):
+            raise ServiceError("Campo 'content' ausente")
+        if kind not in ("html", "xml"):
+            raise ServiceError(f"Tipo de trecho inválido: {kind}")
+        try:
+            return {"content": self.translate_fragment(content, self._language(payload), kind)}
+        except (ET.ParseError, ExpatError) as e:
+            raise ServiceError(f"Trecho XML inválido: {str(e)}")
+
+    def _file(self, payload):
+        source = self._path(payload, "source")
+        target = self._path(payload, "target")
+        if not os.path.isfile(source):
+            raise ServiceError(f"Arquivo não encontrado: {payload['source']}", 404)
+        language = self._language(payload)
+        with self._job_lock:
+            self.job_translator.translate_file(source, target, language)
+            return {"target": payload["target"], "stats": dict(self.job_translator.stats)}
+
+    def _directory(self, payload):
+        source = self._path(payload, "source")
+        target = self._path(payload, "target")
+        if not os.path.isdir(source):
+            raise ServiceError(f"Diretório não encontrado: {payload['source']}", 404)
+        workers = payload.get("workers", 1)
+        if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+            raise ServiceError(f"Campo 'workers' deve ser um inteiro positivo: {workers!r}")
+        language = self._language(payload)
+        with self._job_lock:
+            self.job_translator.translate_directory(
+                source,
+                target,
+                language,
+                dedupe=payload.get("dedupe", True),
+                workers=min(workers, self.max_workers),
+                incremental=payload.get("incremental", True)
+            )
+            return {"target": payload["target"], "stats": dict(self.job_translator.stats)}
+
+    def _language(self, payload):
+        """Idioma de destino da requisição; sem o campo, vale o idioma padrão do serviço."""
+        language = payload.get("lang")
+        if language is None:
+            return self.default_language
+        if not isinstance(language, str) or not language.strip():
+            raise ServiceError(f"Campo 'lang' deve ser um texto não vazio: {language!r}")
+        return language
+
+    def _path(self, payload, field):
+        """Resolve um caminho da requisição dentro de root, recusando o que sair dele."""
+        if self.root is None:
+            raise ServiceError("Tradução de arquivos desativada: inicie o serviço com root", 403)
+        value = payload.get(field)
+        if not isinstance(value, str) or not value:
+            raise ServiceError(f"Campo '{field}' ausente")
+        path = os.path.realpath(os.path.join(self.root, value))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ServiceError(f"Caminho fora da raiz do serviço: {value}", 403)
+        return path
+
+    def stats(self):
+        with self._lock:
+            coalesced = self.coalesced
+            in_flight = len(self._inflight)
+            memory_clears = self.memory_clears
+        report = {
+            "uptime_seconds": time.time() - self.started,
+            "in_flight": in_flight,
+            "coalesced": coalesced,
+            "memory_entries": self.translator.run_memory_size(),
+            "memory_clears": memory_clears,
+            "fragment_segments": self.translator.stats["segments"],
+            "backend_calls": self.translator.stats["backend_calls"],
+            "cache_hits": self.translator.stats["cache_hits"],
+            "connections": self.translator.backend.connection_stats(),
+            "endpoints": self.latency.summary()
+        }
+        if self.cache is not None:
+            report["cache"] = self.cache.stats()
+        return report
+
+    def to_prometheus(self, prefix="translator_service"):
+        stats = self.stats()
+        lines = [
+            f"{prefix}_in_flight {stats['in_flight']}",
+            f"{prefix}_coalesced_total {stats['coalesced']}",
+            f"{prefix}_memory_entries {stats['memory_entries']}",
+            f"{prefix}_backend_calls_total {stats['backend_calls']}"
+        ]
+        return "\n".join(lines) + "\n" + self.latency.to_prometheus(prefix)
+
+    def close(self):
+        self.translator.close()
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._reply(200, service.stats())
+        elif self.path == "/metrics":
+            self._send(200, service.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._reply(404, {"error": f"Endpoint desconhecido: {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                raise ServiceError("JSON inválido")
+            self._reply(200, self.server.service.handle(self.path.strip("/"), payload))
+        except ServiceError as e:
+            self._reply(e.status_code, {"error": str(e)})
+        except Exception as e:
+            print(f"Erro no serviço de tradução: {str(e)}")
+            self._reply(500, {"error": str(e)})
+
+    def _reply(self, status, body):
+        self._send(status, json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def _send(self, status, data, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service, host="127.0.0.1", port=8080, socket_path=None):
+    """Cria o servidor HTTP do serviço, em TCP ou, com socket_path, num socket Unix.
+
+    Endpoints: POST /fragment, /file e /directory com corpo JSON; GET
+    /stats (JSON), /metrics (Prometheus) e /health.
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _UnixHTTPServer(socket_path, _ServiceHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), _ServiceHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
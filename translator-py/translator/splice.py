@@ -0,0 +1,604 @@
+import codecs
+import io
+import re
+import shutil
+import xml.parsers.expat
+from collections import deque
+from html.parser import HTMLParser
+
+from translator.rules import PathNode
+from translator.segmentation import decode_inline, encode_inline, strip_placeholders
+from translator.segments import (_ATTR_TAGS, _ATTRS, _INLINE_TAGS, _META_CONTENT, _SKIP_PARENTS,
+                                 is_translatable, normalize)
+
+_CHUNK_SIZE = 1024 * 1024
+_VOID_TAGS = frozenset([
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr', 'image',
+    'img', 'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid', 'param', 'source',
+    'spacer', 'track', 'wbr'
+])
+_ESCAPED_BYTES = re.compile('[\udc80-\udcff]')
+_HTML_ATTR = re.compile(r'''([^\s/>"'=]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>"'][^\s>]*))?''')
+_HTML_TAG_NAME = re.compile(r'<[^\s/>]*')
+_XML_START_TAG = re.compile(rb'''<[^\s/>]+(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|'[^']*'))*\s*/?>''')
+_XML_ATTR = re.compile(rb'''([^\s=/>]+)\s*=\s*("[^"]*"|'[^']*')''')
+
+
+class Span:
+    """Um segmento traduzível localizado por posições no arquivo de origem.
+
+    kind é 'text', 'attr' ou 'unit' (bloco com elementos inline, como em
+    extract_html_segments). start/end delimitam o trecho substituído: o
+    texto, o valor do atributo sem as aspas ou o conteúdo do bloco. lead e
+    trail são os espaços preservados ao redor da tradução.
+    """
+    __slots__ = ('text', 'kind', 'start', 'end', 'quote', 'lead', 'trail', 'inline', 'owner', 'index')
+
+    def __init__(self, text, kind, start, end, quote=None, lead='', trail=''):
+        self.text = text
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.quote = quote
+        self.lead = lead
+        self.trail = trail
+        self.inline = None
+        self.owner = None
+        self.index = None
+
+
+def _surrounding_space(text):
+    stripped = text.strip()
+    if not stripped:
+        return text, ''
+    start = text.index(stripped[0])
+    end = text.rindex(stripped[-1]) + 1
+    return text[:start], text[end:]
+
+
+def _escape_text(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _escape_attr(text, quote):
+    text = _escape_text(text)
+    return text.replace(quote, '&quot;' if quote == '"' else '&#39;')
+
+
+class SpanDocument:
+    """Arquivo analisado cujos segmentos guardam as posições na origem.
+
+    write() percorre a origem em blocos e copia tudo o que está fora dos
+    segmentos traduzidos exatamente como estava, inserindo só as traduções.
+    O custo além da cópia depende do número de segmentos, não do tamanho do
+    documento, e um arquivo sem traduções sai idêntico ao original. Em HTML
+    as posições são de caracteres do texto decodificado com
+    surrogateescape; em XML, de bytes. Um documento analisado em memória
+    (scan_html_text, scan_xml_bytes) guarda o conteúdo em content, sem path.
+    """
+
+    def __init__(self, path, kind, segments, encoding='utf-8', content=None):
+        self.path = path
+        self.kind = kind
+        self.segments = segments
+        self.encoding = encoding
+        self.content = content
+        for index, segment in enumerate(segments):
+            segment.index = index
+
+    def _source(self):
+        if self.content is not None:
+            return io.BytesIO(self.content) if self.kind == 'xml' else io.StringIO(self.content, newline='')
+        if self.kind == 'xml':
+            return open(self.path, 'rb')
+        return open(self.path, 'r', encoding='utf-8', errors='surrogateescape', newline='')
+
+    def write(self, target_file, translations):
+        """Grava em target_file a origem com as traduções aplicadas."""
+        edits = self._edits(translations)
+        if self.kind == 'xml':
+            with self._source() as source, open(target_file, 'wb') as out:
+                self._splice(source, out, edits)
+        else:
+            with self._source() as source, \
+                    open(target_file, 'w', encoding='utf-8', errors='surrogateescape', newline='') as out:
+                self._splice(source, out, edits)
+
+    def render(self, translations):
+        """Devolve a origem com as traduções aplicadas: str em HTML, bytes em XML."""
+        edits = self._edits(translations)
+        out = io.BytesIO() if self.kind == 'xml' else io.StringIO(newline='')
+        with self._source() as source:
+            self._splice(source, out, edits)
+        return out.getvalue()
+
+    def _splice(self, source, out, edits):
+        position = 0
+        for start, end, replacement in edits:
+            _copy(source, out, start - position)
+            out.write(replacement)
+            _copy(source, None, end - start)
+            position = end
+        shutil.copyfileobj(source, out, _CHUNK_SIZE)
+
+    def _edits(self, translations):
+        """Lista ordenada de (início, fim, substituto) das traduções que mudam o texto."""
+        rendered = {}
+        for segment in self.segments:
+            if segment.kind == 'unit':
+                translated = translations[segment.index]
+                if translated and translated != segment.text:
+                    content = self._render_unit(segment, translated, translations)
+                    if content is None:
+                        print(f"Marcação inline perdida na tradução, mantendo o original: {segment.text}")
+                    else:
+                        rendered[segment.index] = content
+        edits = []
+        for segment in self.segments:
+            if segment.index in rendered:
+                edits.append((segment.start, segment.end, self._encode(rendered[segment.index])))
+                continue
+            if segment.kind == 'unit' or (segment.owner is not None and segment.owner.index in rendered):
+                continue
+            translated = translations[segment.index]
+            if translated and translated != segment.text:
+                edits.append((segment.start, segment.end, self._encode(self._render(segment, translated))))
+        edits.sort(key=lambda edit: edit[0])
+        return edits
+
+    def _render(self, segment, translated):
+        if segment.kind != 'attr':
+            return segment.lead + _escape_text(translated) + segment.trail
+        if segment.quote:
+            return _escape_attr(translated, segment.quote)
+        return '"' + _escape_attr(translated, '"') + '"'
+
+    def _render_unit(self, segment, translated, translations):
+        """Monta o novo conteúdo do bloco, ou None se a tradução perdeu placeholders."""
+        pieces = decode_inline(translated, len(segment.inline))
+        if pieces is None:
+            return None
+        parts = [segment.lead]
+        for piece in pieces:
+            if isinstance(piece, tuple):
+                index, inner = piece
+                tag = segment.inline[index - 1]
+                parts.append(self._render_start_tag(tag, translations))
+                parts.append(_escape_text(inner))
+                parts.append(tag.end_raw)
+            else:
+                parts.append(_escape_text(piece))
+        parts.append(segment.trail)
+        return ''.join(parts)
+
+    def _render_start_tag(self, tag, translations):
+        raw = tag.raw
+        for segment in sorted(tag.attr_segments, key=lambda segment: segment.start, reverse=True):
+            translated = translations[segment.index]
+            if translated and translated != segment.text:
+                start = segment.start - tag.start
+                end = segment.end - tag.start
+                raw = raw[:start] + self._render(segment, translated) + raw[end:]
+        return raw
+
+    def _encode(self, text):
+        if self.kind == 'xml':
+            return text.encode(self.encoding, 'xmlcharrefreplace')
+        return text
+
+
+def _copy(source, out, count):
+    """Copia (ou descarta, sem out) count unidades da posição atual de source."""
+    while count > 0:
+        data = source.read(min(count, _CHUNK_SIZE))
+        if not data:
+            return
+        if out is not None:
+            out.write(data)
+        count -= len(data)
+
+
+class _Element:
+    """Elemento HTML aberto durante a varredura.
+
+    pieces acumula o conteúdo enquanto o elemento ainda pode virar um bloco
+    com elementos inline; vira None assim que aparece um filho que impede
+    isso, e os textos pendentes passam a ser segmentos comuns. end_raw é a
+    tag de fechamento como está na origem, ou None se o elemento foi
+    fechado implicitamente.
+    """
+    __slots__ = ('name', 'raw', 'start', 'content_start', 'pieces', 'pending', 'inline', 'simple',
+                 'attr_segments', 'attrs', 'parent', 'protected', 'end_raw')
+
+    def __init__(self, name, raw, start, attrs=None, parent=None, rules=None):
+        self.name = name
+        self.raw = raw
+        self.start = start
+        self.content_start = start + len(raw)
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.protected = parent is not None and (parent.protected or (rules is not None and rules.protects(self)))
+        self.pieces = [] if name not in _SKIP_PARENTS and not self.protected else None
+        self.pending = []
+        self.inline = []
+        self.simple = True
+        self.attr_segments = []
+        self.end_raw = None
+
+
+class _HTMLSpanScanner(HTMLParser):
+    """Extrai os segmentos de um HTML com as mesmas regras de extract_html_segments.
+
+    Usa o HTMLParser da biblioteca padrão, alimentado em blocos, e só
+    mantém em memória os elementos abertos e os segmentos encontrados.
+    """
+
+    def __init__(self, rules=None):
+        super().__init__(convert_charrefs=True)
+        self.rules = rules if rules is not None and rules.protects_elements else None
+        self.segments = []
+        self.escaped = False
+        self._fed = 0
+        self._line = 1
+        self._line_start = 0
+        self._line_starts = deque()
+        self._stack = [_Element('[document]', '', 0)]
+        self._text = None
+
+    def feed(self, data):
+        if _ESCAPED_BYTES.search(data):
+            self.escaped = True
+        position = data.find('\n')
+        while position != -1:
+            self._line_starts.append(self._fed + position + 1)
+            position = data.find('\n', position + 1)
+        self._fed += len(data)
+        super().feed(data)
+
+    def close(self):
+        super().close()
+        self._end_text(self._fed)
+        while self._stack:
+            self._close_element(self._fed)
+
+    def _offset(self):
+        line, column = self.getpos()
+        while self._line < line:
+            self._line_start = self._line_starts.popleft()
+            self._line += 1
+        return self._line_start + column
+
+    def _markup(self):
+        """Fecha o texto em andamento e devolve a posição da marcação atual."""
+        offset = self._offset()
+        self._end_text(offset)
+        return offset
+
+    def handle_data(self, data):
+        if self._text is None:
+            self._text = [self._offset(), data]
+        else:
+            self._text.append(data)
+
+    def _end_text(self, end):
+        if self._text is None:
+            return
+        start = self._text[0]
+        raw = ''.join(self._text[1:])
+        self._text = None
+        parent = self._stack[-1]
+        if parent.name in _SKIP_PARENTS or parent.protected:
+            return
+        text = normalize(raw)
+        if parent.pieces is not None:
+            parent.pieces.append(raw)
+        if text and is_translatable(text):
+            lead, trail = _surrounding_space(raw)
+            segment = Span(text, 'text', start, end, lead=lead, trail=trail)
+            if parent.pieces is not None:
+                parent.pending.append(segment)
+            else:
+                self.segments.append(segment)
+
+    def handle_starttag(self, tag, attrs):
+        element = self._open(tag, attrs)
+        if tag in _VOID_TAGS:
+            self._close_element(element.content_start)
+
+    def handle_startendtag(self, tag, attrs):
+        element = self._open(tag, attrs)
+        self._close_element(element.content_start)
+
+    def _open(self, tag, attrs):
+        start = self._markup()
+        values = dict(attrs)
+        element = _Element(tag, self.get_starttag_text(), start, values, self._stack[-1], self.rules)
+        if not element.protected:
+            self._attr_segments(element, values)
+        self._stack.append(element)
+        return element
+
+    def handle_endtag(self, tag):
+        end = self._markup()
+        if not any(element.name == tag for element in self._stack[1:]):
+            return
+        while True:
+            element = self._stack[-1]
+            if element.name == tag:
+                element.end_raw = self._endtag_text(end)
+            self._close_element(end)
+            if element.name == tag:
+                return
+
+    def _endtag_text(self, offset):
+        """Texto da tag de fechamento que começa em offset, ainda em rawdata."""
+        start = offset - (self._fed - len(self.rawdata))
+        return self.rawdata[start:self.rawdata.index('>', start) + 1]
+
+    def _other(self):
+        self._markup()
+        self._disqualify(self._stack[-1])
+
+    def handle_comment(self, data):
+        self._other()
+
+    def handle_decl(self, decl):
+        self._other()
+
+    def handle_pi(self, data):
+        self._other()
+
+    def unknown_decl(self, data):
+        self._other()
+
+    def _disqualify(self, element):
+        if element.pieces is not None:
+            element.pieces = None
+            self.segments.extend(element.pending)
+            element.pending = []
+        element.simple = False
+
+    def _attr_segments(self, element, values):
+        if element.name not in _ATTR_TAGS or not values:
+            return
+        names = [attr for attr in _ATTRS if values.get(attr)]
+        if element.name == 'meta' and values.get('name') in _META_CONTENT and values.get('content'):
+            names.append('content')
+        wanted = {}
+        for name in names:
+            text = normalize(values[name])
+            if is_translatable(text):
+                wanted[name] = text
+        if not wanted:
+            return
+        positions = {}
+        tag_name = _HTML_TAG_NAME.match(element.raw)
+        for match in _HTML_ATTR.finditer(element.raw, tag_name.end() if tag_name else 0):
+            name = match.group(1).lower()
+            if name in wanted and match.group(2) is not None:
+                positions[name] = match
+        for name, text in wanted.items():
+            match = positions.get(name)
+            if match is None:
+                continue
+            start, end = match.span(2)
+            quote = match.group(2)[0] if match.group(2)[0] in '"\'' else None
+            if quote:
+                start, end = start + 1, end - 1
+            segment = Span(text, 'attr', element.start + start, element.start + end, quote)
+            element.attr_segments.append(segment)
+            self.segments.append(segment)
+
+    def _close_element(self, end):
+        self._end_text(end)
+        element = self._stack.pop()
+        parent = self._stack[-1] if self._stack else None
+        if element.pieces is not None and element.inline and any(
+                isinstance(piece, str) and not piece.isspace() for piece in element.pieces):
+            self._finish_unit(element, end)
+            element.pending = []
+        elif parent is not None and element.name in _INLINE_TAGS and element.simple and not element.inline \
+                and element.pieces is not None and parent.pieces is not None and element.end_raw is not None:
+            parent.pieces.append(element)
+            parent.inline.append(element)
+            parent.pending.extend(element.pending)
+            return
+        else:
+            self._disqualify(element)
+        if parent is not None:
+            self._disqualify(parent)
+
+    def _finish_unit(self, element, end):
+        pieces = []
+        full_text = []
+        count = 0
+        for piece in element.pieces:
+            if isinstance(piece, str):
+                pieces.append(piece)
+                full_text.append(piece)
+            else:
+                count += 1
+                inner = ''.join(piece.pieces)
+                pieces.append((count, inner))
+                full_text.append(inner)
+        text = normalize(encode_inline(pieces))
+        if not is_translatable(strip_placeholders(text)):
+            self._disqualify(element)
+            return
+        lead, trail = _surrounding_space(''.join(full_text))
+        segment = Span(text, 'unit', element.content_start, end, lead=lead, trail=trail)
+        segment.inline = element.inline
+        for tag in element.inline:
+            for attr_segment in tag.attr_segments:
+                attr_segment.owner = segment
+        self.segments.append(segment)
+
+
+def _scan_html(file, rules):
+    scanner = _HTMLSpanScanner(rules)
+    while True:
+        data = file.read(_CHUNK_SIZE)
+        if not data:
+            break
+        scanner.feed(data)
+    scanner.close()
+    if scanner.escaped:
+        return None
+    return sorted(scanner.segments, key=lambda segment: segment.start)
+
+
+def scan_html(path, rules=None):
+    """Analisa um HTML e devolve o SpanDocument, ou None se ele não estiver em UTF-8."""
+    with open(path, 'r', encoding='utf-8', errors='surrogateescape', newline='') as file:
+        segments = _scan_html(file, rules)
+    return None if segments is None else SpanDocument(path, 'html', segments)
+
+
+def scan_html_text(content, rules=None):
+    """Analisa um HTML já em memória, como um fragmento recebido pelo serviço."""
+    segments = _scan_html(io.StringIO(content, newline=''), rules)
+    return None if segments is None else SpanDocument(None, 'html', segments, content=content)
+
+
+class _XMLSpanScanner:
+    """Extrai texto de elementos e atributos de um XML com as posições em bytes.
+
+    Segue as regras de extract_xml_segments: o texto de cada elemento antes
+    do primeiro filho e os valores de atributos, fora dos elementos
+    protegidos pelas regras. Usa o expat diretamente,
+    alimentado em blocos; só os bytes desde o último evento ficam guardados,
+    para localizar os atributos dentro da tag de abertura.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None and rules.protects_elements else None
+        self.segments = []
+        self.encoding = 'utf-8'
+        self._node = None
+        self._parser = xml.parsers.expat.ParserCreate()
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._data
+        self._parser.StartCdataSectionHandler = self._cdata
+        self._parser.CommentHandler = self._other
+        self._parser.ProcessingInstructionHandler = self._other
+        self._parser.XmlDeclHandler = self._declaration
+        self._buffer = b''
+        self._buffer_start = 0
+        self._last_event = 0
+        self._text = None
+        self._in_text = False
+
+    def feed(self, data, final=False):
+        self._buffer += data
+        self._parser.Parse(data, final)
+        keep = self._last_event - self._buffer_start
+        if keep > 0:
+            self._buffer = self._buffer[keep:]
+            self._buffer_start = self._last_event
+
+    def _declaration(self, version, encoding, standalone):
+        if encoding:
+            self.encoding = encoding
+
+    def _markup(self):
+        """Fecha o texto em andamento e devolve a posição da marcação atual."""
+        position = self._parser.CurrentByteIndex
+        self._last_event = position
+        if self._text is not None:
+            start = self._text[0]
+            raw = ''.join(self._text[1:])
+            self._text = None
+            text = normalize(raw)
+            if not raw.isspace() and is_translatable(text):
+                lead, trail = _surrounding_space(raw)
+                self.segments.append(Span(text, 'text', start, position, lead=lead, trail=trail))
+        return position
+
+    def _data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+        elif self._in_text:
+            self._last_event = self._parser.CurrentByteIndex
+            self._text = [self._last_event, data]
+
+    def _cdata(self):
+        if self._text is None and self._in_text:
+            self._last_event = self._parser.CurrentByteIndex
+            self._text = [self._last_event]
+
+    def _other(self, *args):
+        self._markup()
+
+    def _end(self, name):
+        self._markup()
+        self._in_text = False
+        if self.rules is not None:
+            self._node = self._node.parent
+
+    def _start(self, name, attrs):
+        position = self._markup()
+        self._in_text = True
+        if self.rules is not None:
+            parent = self._node
+            self._node = PathNode(name, attrs, parent)
+            self._node.protected = (parent is not None and parent.protected) or self.rules.protects(self._node)
+            if self._node.protected:
+                self._in_text = False
+                return
+        wanted = {}
+        for attr, value in attrs.items():
+            if attr == 'xmlns' or attr.startswith('xmlns:'):
+                continue
+            text = normalize(value)
+            if is_translatable(text):
+                wanted[attr.encode(self.encoding)] = text
+        if not wanted:
+            return
+        offset = position - self._buffer_start
+        tag = _XML_START_TAG.match(self._buffer, offset)
+        if tag is None:
+            return
+        for match in _XML_ATTR.finditer(self._buffer, offset, tag.end()):
+            text = wanted.get(match.group(1))
+            if text is not None:
+                start, end = match.span(2)
+                quote = match.group(2)[:1].decode()
+                self.segments.append(Span(text, 'attr', self._buffer_start + start + 1,
+                                          self._buffer_start + end - 1, quote))
+
+
+def _scan_xml(file, rules):
+    scanner = _XMLSpanScanner(rules)
+    data = file.read(_CHUNK_SIZE)
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return None
+    while data:
+        scanner.feed(data)
+        data = file.read(_CHUNK_SIZE)
+    scanner.feed(b'', True)
+    try:
+        if '<a>'.encode(scanner.encoding) != b'<a>':
+            return None
+    except LookupError:
+        return None
+    return sorted(scanner.segments, key=lambda segment: segment.start), scanner.encoding
+
+
+def scan_xml(path, rules=None):
+    """Analisa um XML e devolve o SpanDocument, ou None se a codificação não for compatível com ASCII."""
+    with open(path, 'rb') as file:
+        scanned = _scan_xml(file, rules)
+    if scanned is None:
+        return None
+    segments, encoding = scanned
+    return SpanDocument(path, 'xml', segments, encoding)
+
+
+def scan_xml_bytes(content, rules=None):
+    """Analisa um XML já em memória (bytes); mesmas regras de scan_xml."""
+    scanned = _scan_xml(io.BytesIO(content), rules)
+    if scanned is None:
+        return None
+    segments, encoding = scanned
+    return SpanDocument(None, 'xml', segments, encoding, content=content)
@@ -1,12 +1,34 @@
+import asyncio
+import codecs
 import os
-import re
-from bs4 import BeautifulSoup
-from deep_translator import GoogleTranslator
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 import xml.etree.ElementTree as ET
+from translator.backends import GoogleBackend, NullBackend, chunk_segments
+from translator.control import TranslationCancelled
+from translator.fastcopy import copy_file, timed_copy
+from translator.instrument import NO_STAGE, Instrumentation
+from translator.journal import JobJournal
+from translator.manifest import Manifest, file_hash
+from translator.progress import ProgressTracker
+from translator.ratelimit import AdaptiveRateLimiter, backoff_delay, is_throttle_error
+from translator.scan import file_kind, scan_directory
+from translator.rules import strip_tokens
+from translator.segmentation import split_sentences, strip_placeholders
+from translator.segments import (extract_html_segments, extract_xml_segments, is_translatable,
+                                 normalize, parse_html, undo_write_back, write_back_html, write_back_xml)
+from translator.splice import scan_html, scan_html_text, scan_xml, scan_xml_bytes
+from translator.xml_stream import StreamingXMLTranslator
 
 
 class HTMLXMLTranslator:
-    def __init__(self):
+    engine_version = "2.1"
+    
+    def __init__(self, backend=None, batch_size=200, batch_chars=4500, cache=None, io_workers=1,
+                 rate_limiter=None, max_retries=5, xml_stream_threshold=64 * 1024 * 1024, asset_link=None,
+                 html_parser='html.parser', instrumentation=None, language_detector=None, lossless=True,
+                 rules=None):
 
         self.language_map = {
             "pt-br": "pt",  # Portuguese
@@ -16,165 +38,1192 @@ class HTMLXMLTranslator:
             "de": "de",     # German
             "it": "it"      # Italian
         }
+        self.backend = backend if backend is not None else GoogleBackend(pool_size=max(10, io_workers))
+        self.batch_size = batch_size
+        self.batch_chars = batch_chars
+        self.cache = cache
+        self.io_workers = io_workers
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.xml_stream_threshold = xml_stream_threshold
+        self.asset_link = asset_link
+        self.html_parser = html_parser
+        self.instrumentation = instrumentation
+        self.language_detector = language_detector
+        self.lossless = lossless
+        self.rules = rules
+        self._lock = threading.Lock()
+        self._task_state = threading.local()
+        self._reset_run()
         
+    @property
+    def output_version(self):
+        """Versão gravada no manifesto e no diário; muda junto com o formato da saída."""
+        version = self.engine_version if self.lossless else f"{self.engine_version}-tree"
+        if self.rules is not None:
+            version = f"{version}-rules-{self.rules.fingerprint}"
+        return version
+    
     def count_files(self, directory):
         """Conta o número de arquivos HTML e XML no diretório e subdiretórios."""
-        count = 0
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.lower().endswith(('.html', '.htm', '.xml')):
-                    count += 1
-        return count
-    
-    def translate_directory(self, source_dir, target_dir, target_language="pt-br", progress_callback=None):
-        """Traduz todos os arquivos HTML e XML de um diretório para outro."""
+        return scan_directory(directory).translatable_count
+    
+    def translate_directory(self, source_dir, target_dir, target_language="pt-br", progress_callback=None,
+                            dedupe=True, workers=1, executor="process", deterministic=False,
+                            incremental=True, resume=False, control=None,
+                            stats_callback=None, stats_interval=0.25, file_index=None):
+        """Traduz todos os arquivos HTML e XML de um diretório para outro.
+        
+        Com dedupe ativo, uma passagem prévia coleta os segmentos únicos de
+        toda a árvore e traduz cada um uma única vez; os arquivos depois
+        reaproveitam essas traduções.
+        
+        Com workers > 1, a leitura, o parse e a gravação dos arquivos são
+        distribuídos num pool de processos (executor="process") ou de threads
+        (executor="thread"), enquanto as chamadas ao backend usam io_workers
+        threads. Os processos do pool só aplicam traduções já conhecidas, por
+        isso com executor="process" a passagem prévia é feita mesmo sem
+        dedupe. O progress_callback é sempre chamado pela thread que invocou
+        este método. O modo deterministic executa tudo em série e em ordem
+        alfabética, para execuções reproduzíveis.
+        
+        Com incremental ativo, um manifesto no diretório de destino guarda o
+        hash de cada origem; arquivos inalterados desde a última execução com
+        o mesmo idioma e versão do motor são pulados, e saídas de origens
+        apagadas são removidas.
+        
+        Durante a execução, um diário no destino registra os segmentos
+        traduzidos e os arquivos concluídos. Com resume, um trabalho
+        interrompido continua do último ponto registrado, sem reenviar ao
+        backend segmentos já traduzidos.
+        
+        Um JobControl em control permite pausar ou cancelar a execução de
+        outra thread. Pausa e cancelamento valem antes de cada lote enviado ao
+        backend, inclusive no meio de um arquivo: o cancelamento levanta
+        TranslationCancelled sem gravar os arquivos incompletos, que não
+        entram no diário como concluídos, enquanto os lotes já traduzidos
+        ficam registrados e não são pedidos de novo ao retomar.
+        
+        O stats_callback recebe, no máximo a cada stats_interval segundos,
+        um dicionário com segmentos e bytes concluídos e totais, chamadas ao
+        backend por segundo, taxa de acerto da memória de tradução e tempo
+        restante estimado (veja ProgressTracker). Ao contrário do
+        progress_callback, pode ser chamado de threads de trabalho.
+        
+        Um FileIndex já montado por scan_directory para source_dir pode ser
+        passado em file_index para evitar uma nova varredura da árvore.
+        
+        Se o tradutor tiver uma Instrumentation, cada etapa (leitura, parse,
+        extração, backend, esperas, serialização, gravação, cópia) é medida
+        por arquivo e para a execução inteira.
+        """
         if not os.path.exists(target_dir):
             os.makedirs(target_dir)
         
-        if target_language in self.language_map:
-            googletrans_lang = self.language_map[target_language]
-        else:
-            googletrans_lang = target_language
+        with self._run_scope():
+            dest_lang = self._resolve_language(target_language)
+            self._reset_run()
+            self._control = control
+            self._start_progress(stats_callback, stats_interval, dedupe)
+            if deterministic:
+                workers = 1
+                self._run_io_workers = 1
+            
+            tasks = self._plan_directory(source_dir, target_dir, file_index)
+            manifest = None
+            if incremental:
+                tasks, manifest = self._skip_unchanged(tasks, source_dir, target_dir, target_language, progress_callback)
+            
+            pending = self._open_journal(tasks, source_dir, target_dir, target_language, resume, progress_callback)
+            if self._progress is not None:
+                self._progress.set_files([task[1] for task in pending if task[0] != 'copy'], self._index)
+            try:
+                if dedupe or (workers > 1 and executor == "process"):
+                    self._prepass([task for task in pending if task[0] != 'copy'], dest_lang, workers, executor)
+            
+                self._run_tasks(pending, dest_lang, progress_callback, workers, executor)
+            finally:
+                self._journal.close()
+            self._finish_copy_stats()
+            self._finish_connection_stats()
+            if self._progress is not None:
+                self._progress.update(force=True)
+            
+            if manifest is not None:
+                self._record_manifest(manifest, tasks, source_dir)
+            self._journal.finish()
+    
+    async def translate_directory_async(self, source_dir, target_dir, target_language="pt-br",
+                                        progress_callback=None, concurrency=8, rate_limiter=None,
+                                        incremental=True, resume=False, control=None,
+                                        stats_callback=None, stats_interval=0.25, file_index=None):
+        """Versão assíncrona de translate_directory.
+            
+        Mantém até `concurrency` lotes em andamento no backend, respeitando um
+        AdaptiveRateLimiter que reduz a taxa em erros 429/5xx e volta a
+        acelerar quando eles param. Leitura, parse e gravação dos arquivos
+        rodam no executor padrão do loop. O diário, o resume, o
+        stats_callback e o file_index funcionam como em translate_directory.
+        """
+        if not os.path.exists(target_dir):
+            os.makedirs(target_dir)
+            
+        with self._run_scope():
+            loop = asyncio.get_running_loop()
+            dest_lang = self._resolve_language(target_language)
+            self._reset_run()
+            self._control = control
+            self._start_progress(stats_callback, stats_interval, True)
+            limiter = rate_limiter or self.rate_limiter or AdaptiveRateLimiter()
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            tasks = self._plan_directory(source_dir, target_dir, file_index)
+            manifest = None
+            if incremental:
+                tasks, manifest = self._skip_unchanged(tasks, source_dir, target_dir, target_language, progress_callback)
             
-        for root, dirs, files in os.walk(source_dir):
-            rel_path = os.path.relpath(root, source_dir)
-            target_root = os.path.join(target_dir, rel_path) if rel_path != '.' else target_dir
+            pending = self._open_journal(tasks, source_dir, target_dir, target_language, resume, progress_callback)
+            if self._progress is not None:
+                self._progress.set_files([task[1] for task in pending if task[0] != 'copy'], self._index)
+            try:
+                per_file = await asyncio.gather(*[
+                    loop.run_in_executor(None, self._collect_texts, source_file)
+                    for kind, source_file, _ in pending if kind != 'copy'
+                ])
             
+                chunks = self._pending_chunks(self._unique_segments(per_file), dest_lang)
+                await asyncio.gather(*[
+                    self._call_backend_async(chunk, dest_lang, limiter, semaphore) for chunk in chunks
+                ])
+            
+                async def process(task):
+                    if self._control is not None:
+                        await self._control.checkpoint_async()
+                    result = await loop.run_in_executor(None, self._process_task, task, dest_lang)
+                    self._task_finished(task, result, progress_callback)
+            
+                await asyncio.gather(*[process(task) for task in pending])
+            finally:
+                self._journal.close()
+            self._finish_copy_stats()
+            self._finish_connection_stats()
+            if self._progress is not None:
+                self._progress.update(force=True)
+            
+            if manifest is not None:
+                self._record_manifest(manifest, tasks, source_dir)
+            self._journal.finish()
+    
+    def translate_languages(self, source_dir, target_dir, target_languages, progress_callback=None,
+                            dedupe=True, workers=1, executor="process", deterministic=False, incremental=True,
+                            resume=False, control=None, stats_callback=None, stats_interval=0.25, file_index=None):
+        """Traduz a árvore para vários idiomas numa única passagem.
+        
+        Cada idioma é gravado em target_dir/<idioma>. A árvore é varrida uma
+        vez; em cada passagem, cada arquivo é analisado e tem os segmentos
+        extraídos uma única vez, e as traduções de todos os idiomas são
+        pedidas ao backend em paralelo. O documento recebe as traduções de
+        um idioma, é gravado e volta ao original antes do idioma seguinte.
+        Arquivos não traduzíveis são copiados uma vez e ligados (hardlink)
+        nas saídas dos demais idiomas, quando o sistema de arquivos permite.
+        
+        Manifesto, diário, resume, control e stats_callback funcionam como em
+        translate_directory; o progress_callback é chamado uma vez por
+        arquivo de origem, depois de gravados todos os idiomas. executor vale
+        só para a coleta de segmentos; a gravação usa um pool de threads. O
+        modo deterministic também pede os idiomas ao backend um de cada vez,
+        na ordem recebida.
+        """
+        if not os.path.exists(target_dir):
+            os.makedirs(target_dir)
+        
+        with self._run_scope():
+            languages = list(dict.fromkeys(target_languages))
+            self._reset_run()
+            self._control = control
+            self._start_progress(stats_callback, stats_interval, dedupe)
+            self.stats["languages"] = len(languages)
+            if deterministic:
+                workers = 1
+                self._run_io_workers = 1
+            
+            targets = {}
+            changed = {}
+            manifests = {}
+            for language in languages:
+                language_dir = os.path.join(target_dir, language)
+                tasks = self._plan_directory(source_dir, language_dir, file_index)
+                file_index = self._index
+                if incremental:
+                    tasks, manifests[language] = self._skip_unchanged(tasks, source_dir, language_dir, language)
+                changed[language] = tasks
+                for _, source_file, target_file in tasks:
+                    targets.setdefault(source_file, {})[language] = target_file
+            tasks = [(entry.kind, entry.path, targets[entry.path])
+                     for entry in file_index.entries if entry.path in targets]
+            
+            pending = self._open_journal(tasks, source_dir, target_dir, ",".join(languages), resume,
+                                         progress_callback)
+            if self._progress is not None:
+                self._progress.set_files([task[1] for task in pending if task[0] != 'copy'], self._index)
+            self._language_pool = ThreadPoolExecutor(max_workers=1 if deterministic else len(languages))
+            try:
+                if dedupe:
+                    unique = self._collect_unique([task for task in pending if task[0] != 'copy'],
+                                                  self._resolve_language(languages[0]), workers, executor)
+                    self._translate_languages(unique, languages, protect=False)
+                
+                self._run_tasks(pending, None, progress_callback, workers, "thread", self._process_fanout)
+            finally:
+                self._language_pool.shutdown()
+                self._journal.close()
+            self._finish_copy_stats()
+            self._finish_connection_stats()
+            if self._progress is not None:
+                self._progress.update(force=True)
+            
+            hashes = {}
+            for language, manifest in manifests.items():
+                self._record_manifest(manifest, changed[language], source_dir, hashes)
+            self._journal.finish()
+    
+    def translate_file(self, source_file, target_file, target_language="pt-br"):
+        """Traduz um único arquivo HTML ou XML; outros tipos são copiados."""
+        target_dir = os.path.dirname(os.path.abspath(target_file))
+        if not os.path.exists(target_dir):
+            os.makedirs(target_dir)
+        
+        with self._run_scope():
+            self._reset_run()
+            kind = file_kind(source_file)
+            self._process_task((kind, source_file, target_file), self._resolve_language(target_language))
+            if kind != 'copy':
+                self.stats["files"] = 1
+            self._finish_connection_stats()
+    
+    def translate_fragment(self, content, target_language="pt-br", kind="html"):
+        """Traduz um trecho HTML ou XML em memória e devolve o texto traduzido.
+        
+        Não zera a execução: as traduções ficam na memória da execução e
+        servem aos próximos trechos, o que faz do tradutor um cache quente
+        para o modo serviço (veja clear_run_memory). Como nos arquivos, tudo
+        fora dos textos traduzidos é mantido; XML fora de UTF-8 e HTML com
+        caracteres inválidos passam pela árvore do BeautifulSoup ou do
+        ElementTree.
+        """
+        dest_lang = self._resolve_language(target_language)
+        document = None
+        if self.lossless:
+            if kind == 'html':
+                document = scan_html_text(content, self.rules)
+            else:
+                document = scan_xml_bytes(content.encode('utf-8'), self.rules)
+                if document is not None and codecs.lookup(document.encoding).name != 'utf-8':
+                    document = None
+        if document is not None:
+            translations = self._translate_fragment_segments(document.segments, dest_lang)
+            rendered = document.render(translations)
+            return rendered if kind == 'html' else rendered.decode('utf-8')
+        
+        if kind == 'html':
+            root = parse_html(content, self.html_parser)
+            segments = extract_html_segments(root, rules=self.rules)
+        else:
+            root = ET.fromstring(content)
+            segments = extract_xml_segments(root, self.rules)
+        translations = self._translate_fragment_segments(segments, dest_lang)
+        (write_back_html if kind == 'html' else write_back_xml)(segments, translations, [])
+        return str(root) if kind == 'html' else ET.tostring(root, encoding='unicode')
+    
+    def _translate_fragment_segments(self, segments, dest_lang):
+        with self._lock:
+            self.stats["segments"] += len(segments)
+        return self._translate_segments([segment.text for segment in segments], dest_lang)
+    
+    def run_memory_size(self):
+        """Número de traduções guardadas na memória da execução, somando os idiomas."""
+        with self._lock:
+            return sum(len(memo) for memo in self._memo.values())
+    
+    def clear_run_memory(self):
+        """Esvazia a memória da execução; não pode haver tradução em andamento."""
+        with self._lock:
+            self._memo = {}
+            self._long_parts = {}
+    
+    def _plan_directory(self, source_dir, target_dir, file_index=None):
+        """Lista as tarefas (tipo, origem, destino) da árvore e cria as pastas de destino.
+        
+        Usa o file_index informado, se for da mesma origem, ou faz uma
+        varredura; as tarefas seguem a ordem do índice, que é alfabética.
+        """
+        if file_index is None or file_index.source_dir != source_dir:
+            file_index = scan_directory(source_dir, self._control)
+        self._index = file_index
+        
+        for rel_dir in file_index.directories:
+            target_root = target_dir if rel_dir == '.' else os.path.join(target_dir, *rel_dir.split('/'))
             if not os.path.exists(target_root):
                 os.makedirs(target_root)
+        
+        return [
+            (entry.kind, entry.path, os.path.join(target_dir, *entry.rel_path.split('/')))
+            for entry in file_index.entries
+        ]
+    
+    def _skip_unchanged(self, tasks, source_dir, target_dir, target_language, progress_callback=None):
+        """Remove das tarefas as origens inalteradas e apaga saídas de origens removidas.
+        
+        Arquivos HTML/XML pulados também contam no progress_callback. O
+        índice serve só para o planejamento: a decisão de pular usa um
+        os.stat atual da origem, porque um índice reaproveitado pode ser
+        anterior a uma edição; origens apagadas desde a varredura saem das
+        tarefas e têm a saída removida.
+        """
+        manifest = Manifest.load(target_dir, target_language, self.output_version)
+        current = set()
+        changed = []
+        for task in tasks:
+            kind, source_file, target_file = task
+            rel_path = os.path.relpath(source_file, source_dir).replace(os.sep, '/')
+            try:
+                source_stat = os.stat(source_file)
+            except FileNotFoundError:
+                continue
+            current.add(rel_path)
+            if manifest.is_unchanged(rel_path, source_file, target_file, source_stat):
+                self.stats["skipped_files"] += 1
+                if kind != 'copy' and progress_callback:
+                    progress_callback()
+            else:
+                changed.append(task)
+        
+        for rel_path in list(manifest.files):
+            if rel_path not in current:
+                target_file = os.path.join(target_dir, *rel_path.split('/'))
+                if os.path.exists(target_file):
+                    os.remove(target_file)
+                manifest.forget(rel_path)
+                self.stats["removed_files"] += 1
+        return changed, manifest
+    
+    def _open_journal(self, tasks, source_dir, target_dir, target_language, resume, progress_callback=None):
+        """Abre o diário do trabalho e devolve as tarefas que ainda faltam.
+        
+        Ao retomar, as traduções registradas voltam para a memória da
+        execução e os arquivos já concluídos contam no progress_callback.
+        """
+        self._journal = JobJournal(source_dir, target_dir, target_language, self.output_version)
+        completed, translations = self._journal.open(resume)
+        for lang, pairs in translations.items():
+            self._memo.setdefault(lang, {}).update(pairs)
+            self.stats["resumed_segments"] += len(pairs)
+        
+        pending = []
+        for task in tasks:
+            if self._journal.relative(task[1]) in completed:
+                self.stats["resumed_files"] += 1
+                if task[0] != 'copy' and progress_callback:
+                    progress_callback()
+            else:
+                pending.append(task)
+        return pending
+    
+    def _record_manifest(self, manifest, tasks, source_dir, hashes=None):
+        """Registra as tarefas no manifesto; hashes guarda os hashes já calculados entre manifestos.
+        
+        Arquivos com lotes que falharam no backend ficam fora do manifesto,
+        para serem traduzidos de novo na próxima execução.
+        """
+        for _, source_file, _ in tasks:
+            if source_file in self._failed_files:
+                manifest.forget(os.path.relpath(source_file, source_dir).replace(os.sep, '/'))
+                continue
+            digest = None
+            if hashes is not None:
+                digest = hashes.get(source_file)
+                if digest is None:
+                    digest = hashes[source_file] = file_hash(source_file)
+            manifest.record(os.path.relpath(source_file, source_dir).replace(os.sep, '/'), source_file, digest)
+        manifest.save()
+    
+    def _run_tasks(self, tasks, dest_lang, progress_callback, workers, executor, process=None):
+        """Processa as tarefas em série ou no pool configurado.
+        
+        process substitui _process_task na execução em série ou por threads.
+        """
+        process = process or self._process_task
+        if workers <= 1:
+            for task in tasks:
+                self._checkpoint()
+                result = process(task, dest_lang)
+                self._task_finished(task, result, progress_callback)
+            return
+        
+        local = []
+        if executor == "thread":
+            pool = ThreadPoolExecutor(max_workers=workers)
+            run = process
+        else:
+            # XML em streaming fica fora da passagem prévia e precisa do backend
+            # real, que os processos do pool não têm: roda neste processo.
+            local = [task for task in tasks if task[0] == 'xml' and self._should_stream_xml(task[1])]
+            if local:
+                tasks = [task for task in tasks if task not in local]
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self._memo.get(dest_lang, {}), dest_lang, self._worker_options(), self._worker_instrumentation())
+            )
+            run = _worker_process
+        remaining = iter(tasks)
+        futures = {}
+        
+        def submit_next():
+            task = next(remaining, None)
+            if task is not None:
+                futures[pool.submit(run, task, dest_lang)] = task
+        
+        def collect(timeout=None):
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if run is _worker_process:
+                    result, timings, counters, failed = result
+                    self._merge_worker_timings(timings)
+                    self._merge_worker_counters(counters)
+                    if failed:
+                        self._failed_files.add(futures[future][1])
+                self._task_finished(futures.pop(future), result, progress_callback)
+            self._checkpoint()
+            for _ in done:
+                submit_next()
+        
+        with pool:
+            for _ in range(workers * 2):
+                submit_next()
+            try:
+                for task in local:
+                    self._checkpoint()
+                    result = process(task, dest_lang)
+                    self._task_finished(task, result, progress_callback)
+                    if futures:
+                        collect(timeout=0)
+                while futures:
+                    collect()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    
+    def _run_scope(self):
+        """Mede a execução inteira (e aplica o cProfile) quando instrumentado."""
+        if self.instrumentation is None:
+            return NO_STAGE
+        return self.instrumentation.run()
+    
+    def _stage(self, name, file=None):
+        """Mede uma etapa; sem instrumentação devolve um context manager vazio."""
+        if self.instrumentation is None:
+            return NO_STAGE
+        return self.instrumentation.stage(name, file)
+    
+    def _merge_worker_timings(self, timings):
+        if self.instrumentation is not None:
+            self.instrumentation.merge(timings)
+    
+    def _merge_worker_counters(self, counters):
+        with self._lock:
+            for name, value in counters.items():
+                self.stats[name] += value
+    
+    def _start_progress(self, stats_callback, stats_interval, segments_known):
+        """Cria o ProgressTracker da execução, se houver stats_callback."""
+        if stats_callback is None:
+            return
+        self._progress = ProgressTracker(stats_callback, stats_interval, self._progress_extra)
+        self._progress.segments_known = segments_known
+    
+    def _progress_extra(self):
+        """Contadores do motor incluídos em cada evento de estatísticas."""
+        extra = {
+            "backend_calls": self.stats["backend_calls"],
+            "cache_hits": self.stats["cache_hits"],
+            "cache_hit_rate": 0.0,
+            "language_skipped_segments": self.stats["language_skipped_segments"]
+        }
+        if self.cache is not None:
+            lookups = self.cache.hits + self.cache.misses
+            if lookups:
+                extra["cache_hit_rate"] = self.cache.hits / lookups
+        return extra
+    
+    def _checkpoint(self):
+        """Ponto de pausa/cancelamento cooperativo, sem custo quando não há controle."""
+        if self._control is not None:
+            self._control.checkpoint()
+    
+    def _process_task(self, task, dest_lang):
+        """Executa uma tarefa; para cópias devolve (bytes copiados, segundos)."""
+        kind, source_file, target_file = task
+        if kind == 'copy':
+            with self._stage("copy", source_file):
+                return timed_copy(source_file, target_file, self.asset_link)
+        self._task_state.failed = False
+        if kind == 'html':
+            self._translate_html_file(source_file, target_file, dest_lang)
+        else:
+            self._translate_xml_file(source_file, target_file, dest_lang)
+        self._finish_task_state(source_file)
+    
+    def _process_fanout(self, task, _=None):
+        """Executa uma tarefa de translate_languages, cujo destino é {idioma: arquivo}."""
+        kind, source_file, targets = task
+        if kind == 'copy':
+            return self._copy_fanout(source_file, targets)
+        self._task_state.failed = False
+        if kind == 'html':
+            self._translate_fanout(source_file, targets, 'html')
+        else:
+            self._translate_xml_fanout(source_file, targets)
+        self._finish_task_state(source_file)
+    
+    def _finish_task_state(self, source_file):
+        """Guarda o arquivo como falho se algum texto dele ficou sem tradução por erro do backend."""
+        if self._task_state.failed:
+            with self._lock:
+                self._failed_files.add(source_file)
+    
+    def _translate_languages(self, texts, languages, protect=True):
+        """Traduz os textos para cada idioma em paralelo; devolve {idioma: traduções}.
+        
+        Com protect=False os textos já vêm com os termos protegidos (como na
+        passagem prévia) e vão ao backend sem passar pelas regras.
+        """
+        dest_langs = [self._resolve_language(language) for language in languages]
+        protected = None
+        keys = texts
+        if self.rules is not None and protect:
+            protected, keys = self._protect(texts)
+        if len(languages) == 1 or not keys:
+            results = [self._translate_texts(keys, dest_lang) for dest_lang in dest_langs]
+        else:
+            def translate(dest_lang):
+                self._task_state.failed = False
+                return self._translate_texts(keys, dest_lang), self._task_state.failed
             
-            for file in files:
-                if file.lower().endswith(('.html', '.htm')):
-                    self._translate_html_file(
-                        os.path.join(root, file),
-                        os.path.join(target_root, file),
-                        target_language
-                    )
-                    if progress_callback:
-                        progress_callback()
-                        
-                elif file.lower().endswith('.xml'):
-                    self._translate_xml_file(
-                        os.path.join(root, file),
-                        os.path.join(target_root, file),
-                        target_language
-                    )
-                    if progress_callback:
-                        progress_callback()
+            outcomes = list(self._language_pool.map(translate, dest_langs))
+            if any(failed for _, failed in outcomes):
+                self._task_state.failed = True
+            results = [result for result, _ in outcomes]
+        if protected is not None:
+            results = [self._restore(protected, keys, result, dest_lang)
+                       for result, dest_lang in zip(results, dest_langs)]
+        return dict(zip(languages, results))
+    
+    def _translate_fanout(self, source_file, targets, kind):
+        """Analisa o arquivo uma vez e grava uma versão para cada idioma."""
+        try:
+            segments, write = self._load_document(source_file, kind)
+            with self._stage("translate", source_file):
+                translations = self._translate_languages([segment.text for segment in segments], list(targets))
+            for language, target_file in targets.items():
+                write(target_file, translations[language])
+        except TranslationCancelled:
+            raise
+        except Exception as e:
+            print(f"Erro ao traduzir {source_file}: {str(e)}")
+            for target_file in targets.values():
+                copy_file(source_file, target_file, skip_unchanged=False)
+    
+    def _translate_xml_fanout(self, source_file, targets):
+        if self._should_stream_xml(source_file):
+            for language, target_file in targets.items():
+                self._translate_xml_file(source_file, target_file, language)
+            return
+        self._translate_fanout(source_file, targets, 'xml')
+    
+    def _copy_fanout(self, source_file, targets):
+        """Copia o arquivo para o primeiro idioma e o liga nos demais; devolve (bytes, segundos)."""
+        copied = 0
+        seconds = 0.0
+        first = None
+        for target_file in targets.values():
+            with self._stage("copy", source_file):
+                if first is None:
+                    result = timed_copy(source_file, target_file, self.asset_link)
+                    first = target_file
                 else:
-                    source_file = os.path.join(root, file)
-                    target_file = os.path.join(target_root, file)
-                    with open(source_file, 'rb') as src, open(target_file, 'wb') as dst:
-                        dst.write(src.read())
+                    result = timed_copy(first, target_file, "hardlink")
+                    with self._lock:
+                        self.stats["shared_assets"] += 1
+            copied += result[0]
+            seconds += result[1]
+        return copied, seconds
     
-    def _translate_html_file(self, source_file, target_file, target_language):
-        """Traduz um arquivo HTML."""
+    def _task_finished(self, task, result, progress_callback):
+        """Contabiliza uma tarefa concluída; chamado sempre pela thread que coordena a execução."""
+        kind = task[0]
+        if self._journal is not None and task[1] not in self._failed_files:
+            self._journal.record_file(task[1])
+        if kind != 'copy':
+            self.stats["files"] += 1
+            if progress_callback:
+                progress_callback()
+            if self._progress is not None:
+                self._progress.finish_file(task[1])
+        elif result is not None:
+            copied, seconds = result
+            if copied:
+                self.stats["copied_files"] += 1
+                self.stats["copied_bytes"] += copied
+                self.stats["copy_seconds"] += seconds
+            else:
+                self.stats["reused_assets"] += 1
+    
+    def _finish_copy_stats(self):
+        if self.stats["copy_seconds"]:
+            self.stats["copy_bytes_per_sec"] = self.stats["copied_bytes"] / self.stats["copy_seconds"]
+    
+    def _finish_connection_stats(self):
+        """Registra as métricas de conexão HTTP do backend nesta execução."""
+        current = self.backend.connection_stats()
+        if not current:
+            return
+        baseline = self._connection_baseline
+        requests = current["http_requests"] - baseline.get("http_requests", 0)
+        opened = current["connections_opened"] - baseline.get("connections_opened", 0)
+        self.stats["http_requests"] = requests
+        self.stats["connections_opened"] = opened
+        self.stats["connections_reused"] = max(0, requests - opened)
+        if requests:
+            self.stats["connection_reuse_ratio"] = self.stats["connections_reused"] / requests
+    
+    def close(self):
+        """Fecha as conexões mantidas pelo backend ao fim do trabalho."""
+        self.backend.close()
+    
+    def _worker_options(self):
+        """Configurações repassadas ao tradutor de cada processo do pool."""
+        return {
+            "batch_size": self.batch_size,
+            "batch_chars": self.batch_chars,
+            "xml_stream_threshold": self.xml_stream_threshold,
+            "asset_link": self.asset_link,
+            "html_parser": self.html_parser,
+            "lossless": self.lossless,
+            "rules": self.rules
+        }
+    
+    def _worker_instrumentation(self):
+        """Parâmetros da Instrumentation de cada processo do pool, ou None."""
+        if self.instrumentation is None:
+            return None
+        return self.instrumentation.buckets, self.instrumentation.per_file
+    
+    def _reset_run(self):
+        """Zera as estatísticas e a memória de segmentos da execução."""
+        self._memo = {}
+        self._long_parts = {}
+        self._journal = None
+        self._control = None
+        self._progress = None
+        self._index = None
+        self._language_pool = None
+        self._failed_files = set()
+        self._run_io_workers = self.io_workers
+        self._connection_baseline = self.backend.connection_stats()
+        self.stats = {
+            "files": 0,
+            "segments": 0,
+            "unique_segments": 0,
+            "dedup_ratio": 0.0,
+            "backend_calls": 0,
+            "cache_hits": 0,
+            "skipped_files": 0,
+            "removed_files": 0,
+            "copied_files": 0,
+            "copied_bytes": 0,
+            "copy_seconds": 0.0,
+            "copy_bytes_per_sec": 0.0,
+            "reused_assets": 0,
+            "resumed_files": 0,
+            "resumed_segments": 0,
+            "http_requests": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "connection_reuse_ratio": 0.0,
+            "languages": 1,
+            "shared_assets": 0,
+            "language_checked_segments": 0,
+            "language_skipped_segments": 0,
+            "glossary_terms": 0,
+            "protected_segments": 0
+        }
+    
+    def _prepass(self, tasks, dest_lang, workers=1, executor="process"):
+        """Coleta os segmentos únicos das tarefas e traduz cada um uma vez.
+        
+        O dedup_ratio registrado é a fração de ocorrências que não precisou
+        de tradução própria por repetir um segmento já visto. Os textos
+        coletados já vêm com os termos protegidos, então vão direto ao
+        backend; glossary_terms e protected_segments são contados só na
+        tradução de cada arquivo.
+        """
+        self._translate_texts(self._collect_unique(tasks, dest_lang, workers, executor), dest_lang)
+    
+    def _collect_unique(self, tasks, dest_lang, workers=1, executor="process"):
+        """Extrai os textos de todas as tarefas e devolve os únicos, registrando o dedup_ratio."""
+        files = [source_file for _, source_file, _ in tasks]
+        if workers <= 1:
+            per_file = [self._collect_texts(source_file) for source_file in files]
+        elif executor == "thread":
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                per_file = list(pool.map(self._collect_texts, files))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=({}, dest_lang, self._worker_options(),
+                                               self._worker_instrumentation())) as pool:
+                per_file = []
+                for texts, timings in pool.map(_worker_collect, files, chunksize=8):
+                    per_file.append(texts)
+                    self._merge_worker_timings(timings)
+        
+        return self._unique_segments(per_file)
+    
+    def _unique_segments(self, per_file):
+        """Junta os textos de todos os arquivos, registra o dedup_ratio e devolve os únicos."""
+        texts = [text for file_texts in per_file for text in file_texts]
+        unique = list(dict.fromkeys(texts))
+        self.stats["segments"] = len(texts)
+        self.stats["unique_segments"] = len(unique)
+        if texts:
+            self.stats["dedup_ratio"] = 1 - len(unique) / len(texts)
+        return unique
+    
+    def _collect_texts(self, source_file):
+        """Extrai os textos traduzíveis de um arquivo, sem modificá-lo."""
         try:
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as file:
-                content = file.read()
+            if source_file.lower().endswith(('.html', '.htm')):
+                segments, _ = self._load_document(source_file, 'html')
+            elif source_file.lower().endswith('.xml'):
+                if self._should_stream_xml(source_file):
+                    return []
+                segments, _ = self._load_document(source_file, 'xml')
+            else:
+                return []
+        except TranslationCancelled:
+            raise
+        except Exception as e:
+            print(f"Erro ao ler {source_file}: {str(e)}")
+            return []
+        texts = [segment.text for segment in segments]
+        if self.rules is not None:
+            texts = self._protect(texts, count=False)[1]
+        return texts
+    
+    def _resolve_language(self, target_language):
+        """Converte o código de idioma da interface para o código do backend."""
+        return self.language_map.get(target_language, target_language)
+    
+    def _translate_segments(self, texts, dest_lang, remember=True):
+        """Traduz os textos aplicando antes, se configuradas, as regras de glossário."""
+        if self.rules is None:
+            return self._translate_texts(texts, dest_lang, remember)
+        protected, keys = self._protect(texts)
+        return self._restore(protected, keys, self._translate_texts(keys, dest_lang, remember), dest_lang)
+    
+    def _protect(self, texts, count=True):
+        """Troca os termos protegidos por placeholders; devolve (protegidos, textos para o backend).
+        
+        protegidos traz (texto com placeholders, termos) na ordem de texts.
+        Os textos para o backend são os únicos que ainda têm o que traduzir:
+        um segmento formado só por termos protegidos não vai ao backend.
+        """
+        protected = [self.rules.protect(text) for text in texts]
+        keys = [key for key in dict.fromkeys(key for key, _ in protected)
+                if is_translatable(strip_placeholders(strip_tokens(key)))]
+        if count:
+            translatable = set(keys)
+            with self._lock:
+                self.stats["glossary_terms"] += sum(len(terms) for _, terms in protected)
+                self.stats["protected_segments"] += sum(1 for key, _ in protected if key not in translatable)
+        return protected, keys
+    
+    def _restore(self, protected, keys, translations, dest_lang):
+        """Recoloca nos textos traduzidos os termos protegidos por _protect.
+        
+        O glossário pode usar tanto o código do backend quanto os códigos da
+        interface que language_map leva a ele (pt-br para pt, por exemplo).
+        """
+        translated = dict(zip(keys, translations))
+        aliases = [language for language, code in self.language_map.items()
+                   if code == dest_lang and language != dest_lang]
+        results = []
+        for key, terms in protected:
+            value = translated.get(key, key)
+            if terms:
+                restored = self.rules.restore(value, terms, dest_lang, aliases)
+                if restored is None:
+                    print(f"Termo protegido perdido na tradução, mantendo o original: {key}")
+                    restored = self.rules.restore(key, terms, dest_lang, aliases)
+                value = restored
+            results.append(value)
+        return results
+    
+    def _translate_texts(self, texts, dest_lang, remember=True):
+        """Traduz uma lista de textos em lotes limitados por tamanho.
+        
+        Cada texto distinto é traduzido uma vez. Antes do backend são
+        consultadas as traduções já feitas nesta execução e a memória de
+        tradução, se configurada. Textos cujo lote falhar são devolvidos sem
+        tradução, e o arquivo em andamento na thread é marcado como falho.
+        Com remember=False, os textos novos não ficam retidos na memória da
+        execução (a memória de tradução em disco continua sendo alimentada).
+        """
+        fresh = []
+        if not remember:
+            with self._lock:
+                memo = self._memo.setdefault(dest_lang, {})
+                fresh = [text for text in dict.fromkeys(texts) if text not in memo]
+        
+        chunks = self._pending_chunks(texts, dest_lang)
+        if self._run_io_workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self._run_io_workers) as pool:
+                list(pool.map(lambda chunk: self._call_backend(chunk, dest_lang), chunks))
+        else:
+            for chunk in chunks:
+                self._call_backend(chunk, dest_lang)
+        
+        memo = self._memo[dest_lang]
+        results = [self._lookup(memo, text) for text in texts]
+        if any(text not in memo for text in texts):
+            self._task_state.failed = True
+        if fresh:
+            with self._lock:
+                for text in fresh:
+                    memo.pop(text, None)
+        return results
+    
+    def _lookup(self, memo, text):
+        """Busca a tradução de um texto, remontando as partes de textos longos."""
+        translated = memo.get(text)
+        if translated is None:
+            parts = self._long_parts.get(text)
+            if parts is None or not all(part in memo for part in parts):
+                return text
+            translated = ' '.join(memo[part] for part in parts)
+            with self._lock:
+                memo[text] = translated
+        return translated
+    
+    def _pending_chunks(self, texts, dest_lang):
+        """Resolve o que já é conhecido e divide o restante em lotes para o backend.
+        
+        Textos maiores que batch_chars são divididos em frases antes de ir ao
+        backend e remontados por _lookup.
+        """
+        with self._lock:
+            memo = self._memo.setdefault(dest_lang, {})
+            missing = []
+            for text in dict.fromkeys(texts):
+                if text in memo:
+                    continue
+                if len(text) > self.batch_chars:
+                    parts = self._long_parts.get(text)
+                    if parts is None:
+                        parts = self._long_parts[text] = split_sentences(text, self.batch_chars)
+                    missing.extend(part for part in parts if part not in memo)
+                else:
+                    missing.append(text)
+            missing = list(dict.fromkeys(missing))
+        if self._progress is not None:
+            self._progress.add_segments(len(missing))
+        
+        if missing and self.cache is not None:
+            with self._stage("cache"):
+                known = self.cache.get_many(missing, dest_lang)
+            with self._lock:
+                memo.update(known)
+                self.stats["cache_hits"] += len(known)
+            missing = [text for text in missing if text not in known]
+            if self._progress is not None and known:
+                self._progress.advance_segments(len(known))
+        
+        if missing and self.language_detector is not None:
+            missing = self._skip_target_language(missing, dest_lang)
+        
+        return [chunk for _, chunk in chunk_segments(missing, self.batch_size, self.batch_chars)]
+    
+    def _skip_target_language(self, texts, dest_lang):
+        """Separa os textos já escritos no idioma de destino, que não vão ao backend.
+        
+        Esses textos ficam como tradução de si mesmos apenas nesta execução;
+        não entram na memória de tradução nem no diário.
+        """
+        with self._stage("langid"):
+            skipped = [text for text in texts if self.language_detector.is_language(text, dest_lang)]
+        with self._lock:
+            self._memo[dest_lang].update((text, text) for text in skipped)
+            self.stats["language_checked_segments"] += len(texts)
+            self.stats["language_skipped_segments"] += len(skipped)
+        if self._progress is not None and skipped:
+            self._progress.advance_segments(len(skipped))
+        if not skipped:
+            return texts
+        skipped = set(skipped)
+        return [text for text in texts if text not in skipped]
+    
+    def _learn(self, chunk, translated, dest_lang):
+        """Registra as traduções de um lote na execução e na memória de tradução."""
+        if translated is None:
+            return
+        learned = [(text, value) for text, value in zip(chunk, translated) if value]
+        with self._lock:
+            self._memo[dest_lang].update(learned)
+        if self._journal is not None and learned:
+            self._journal.record_segments(learned, dest_lang)
+        if self.cache is not None and learned:
+            with self._stage("cache"):
+                self.cache.put_many(learned, dest_lang)
+    
+    def _call_backend(self, chunk, dest_lang):
+        """Envia um lote ao backend; devolve None em caso de erro.
+        
+        Erros de limite (429/5xx) são repetidos até max_retries vezes com
+        backoff exponencial, com ou sem rate_limiter; com um, cada chamada
+        também espera sua vez e a taxa se ajusta aos erros. As traduções são
+        registradas (memória, diário e cache) assim que o lote volta, para
+        que um cancelamento no meio da execução não perca o que já foi pago.
+        """
+        translated = self._send_chunk(chunk, dest_lang)
+        self._learn(chunk, translated, dest_lang)
+        if self._progress is not None:
+            self._progress.advance_segments(len(chunk))
+        return translated
+    
+    def _send_chunk(self, chunk, dest_lang):
+        limiter = self.rate_limiter
+        for attempt in range(self.max_retries + 1):
+            self._checkpoint()
+            if limiter:
+                with self._stage("sleep"):
+                    limiter.wait()
+            with self._lock:
+                self.stats["backend_calls"] += 1
+            try:
+                with self._stage("backend"):
+                    translated = self.backend.translate_batch(chunk, dest_lang)
+            except Exception as e:
+                if is_throttle_error(e) and attempt < self.max_retries:
+                    if limiter:
+                        limiter.on_throttle()
+                        delay = limiter.backoff(attempt)
+                    else:
+                        delay = backoff_delay(attempt)
+                    with self._stage("sleep"):
+                        if self._control is not None:
+                            self._control.sleep(delay)
+                        else:
+                            time.sleep(delay)
+                    continue
+                print(f"Erro ao traduzir lote de {len(chunk)} textos: {str(e)}")
+                return None
+            if limiter:
+                limiter.on_success()
+            return translated
+    
+    async def _call_backend_async(self, chunk, dest_lang, limiter, semaphore):
+        """Versão assíncrona de _call_backend, limitada pelo semáforo de concorrência."""
+        translated = await self._send_chunk_async(chunk, dest_lang, limiter, semaphore)
+        self._learn(chunk, translated, dest_lang)
+        if self._progress is not None:
+            self._progress.advance_segments(len(chunk))
+        return translated
+    
+    async def _send_chunk_async(self, chunk, dest_lang, limiter, semaphore):
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                if self._control is not None:
+                    await self._control.checkpoint_async()
+                with self._stage("sleep"):
+                    await limiter.acquire()
+                with self._lock:
+                    self.stats["backend_calls"] += 1
+                try:
+                    with self._stage("backend"):
+                        translated = await self.backend.translate_batch_async(chunk, dest_lang)
+                except Exception as e:
+                    if is_throttle_error(e) and attempt < self.max_retries:
+                        limiter.on_throttle()
+                        with self._stage("sleep"):
+                            await asyncio.sleep(limiter.backoff(attempt))
+                        continue
+                    print(f"Erro ao traduzir lote de {len(chunk)} textos: {str(e)}")
+                    return None
+                limiter.on_success()
+                return translated
+    
+    def _load_document(self, source_file, kind):
+        """Analisa um HTML ou XML e devolve (segmentos, gravar).
+        
+        gravar(destino, traduções) escreve uma versão traduzida e pode ser
+        chamada várias vezes, uma por idioma. Com lossless, o arquivo é
+        reescrito trecho a trecho a partir da origem, e tudo fora dos textos
+        traduzidos sai byte a byte igual; arquivos que a varredura não aceita
+        (HTML fora de UTF-8, XML em UTF-16) usam a árvore do BeautifulSoup ou
+        do ElementTree, que é serializada por inteiro.
+        """
+        if self.lossless:
+            with self._stage("parse", source_file):
+                document = scan_html(source_file, self.rules) if kind == 'html' else scan_xml(source_file, self.rules)
+            if document is not None:
+                def write(target_file, translations):
+                    with self._stage("write", source_file):
+                        document.write(target_file, translations)
+                return document.segments, write
+        
+        if kind == 'html':
+            soup = self._parse_html(source_file)
+            with self._stage("extract", source_file):
+                segments = extract_html_segments(soup, rules=self.rules)
+            write_back = write_back_html
             
-            soup = BeautifulSoup(content, 'html.parser')
+            def serialize(target_file):
+                with self._stage("serialize", source_file):
+                    content = str(soup)
+                with self._stage("write", source_file):
+                    with open(target_file, 'w', encoding='utf-8') as file:
+                        file.write(content)
+        else:
+            with self._stage("parse", source_file):
+                tree = ET.parse(source_file)
+            with self._stage("extract", source_file):
+                segments = extract_xml_segments(tree.getroot(), self.rules)
+            write_back = write_back_xml
             
-            if target_language in self.language_map:
-                dest_lang = self.language_map[target_language]
-            else:
-                dest_lang = target_language
-                
-            translator = GoogleTranslator(source='auto', target=dest_lang)
-            
-            for element in soup.find_all(text=True):
-                if element.parent.name not in ['script', 'style', 'meta', 'link']:
-                    text = element.strip()
-                    if text and not re.match(r'^[\s\d\W]+$', text) and len(text) > 1:
-                        try:
-                            import time
-                            time.sleep(0.1)
-                            
-                            translated = translator.translate(text)
-                            if translated:
-                                new_string = soup.new_string(translated)
-                                element.replace_with(new_string)
-                        except Exception as e:
-                            print(f"Erro ao traduzir texto: {text} - {str(e)}")
-            
-            for tag in soup.find_all(['img', 'input', 'button', 'a', 'meta']):
-                if tag.has_attr('title') and tag['title'].strip():
-                    try:
-                        tag['title'] = translator.translate(tag['title'])
-                    except:
-                        pass
-                        
-                if tag.has_attr('alt') and tag['alt'].strip():
-                    try:
-                        tag['alt'] = translator.translate(tag['alt'])
-                    except:
-                        pass
-                        
-                if tag.has_attr('placeholder') and tag['placeholder'].strip():
-                    try:
-                        tag['placeholder'] = translator.translate(tag['placeholder'])
-                    except:
-                        pass
-                        
-                if tag.name == 'meta' and tag.has_attr('content') and tag.has_attr('name'):
-                    if tag['name'] in ['description', 'keywords'] and tag['content'].strip():
-                        try:
-                            tag['content'] = translator.translate(tag['content'])
-                        except:
-                            pass
-            
-            with open(target_file, 'w', encoding='utf-8') as file:
-                file.write(str(soup))
-                
+            def serialize(target_file):
+                with self._stage("write", source_file):
+                    tree.write(target_file, encoding='utf-8', xml_declaration=True)
+        
+        def write(target_file, translations):
+            undo = []
+            with self._stage("write_back", source_file):
+                write_back(segments, translations, undo)
+            serialize(target_file)
+            undo_write_back(undo)
+        return segments, write
+    
+    def _translate_document(self, source_file, target_file, target_language, kind):
+        """Traduz um arquivo HTML ou XML fora do modo streaming."""
+        segments, write = self._load_document(source_file, kind)
+        translations = []
+        if segments:
+            with self._stage("translate", source_file):
+                translations = self._translate_segments([segment.text for segment in segments],
+                                                        self._resolve_language(target_language))
+        write(target_file, translations)
+    
+    def _parse_html(self, source_file):
+        """Lê e analisa um HTML com o parser configurado (html.parser, lxml ou html5lib)."""
+        with self._stage("read", source_file):
+            with open(source_file, 'r', encoding='utf-8', errors='ignore') as file:
+                content = file.read()
+        with self._stage("parse", source_file):
+            return parse_html(content, self.html_parser)
+    
+    def _translate_html_file(self, source_file, target_file, target_language):
+        """Traduz um arquivo HTML."""
+        try:
+            self._translate_document(source_file, target_file, target_language, 'html')
+        except TranslationCancelled:
+            raise
         except Exception as e:
             print(f"Erro ao traduzir {source_file}: {str(e)}")
-            with open(source_file, 'rb') as src, open(target_file, 'wb') as dst:
-                dst.write(src.read())
+            copy_file(source_file, target_file, skip_unchanged=False)
+    
+    def _should_stream_xml(self, source_file):
+        """Arquivos XML acima do limite são traduzidos em modo streaming.
+        
+        Eles ficam fora da passagem de deduplicação e não retêm seus textos na
+        memória da execução, para que o consumo dependa só da profundidade da
+        árvore; as traduções já conhecidas continuam sendo reaproveitadas.
+        """
+        if self.xml_stream_threshold is None:
+            return False
+        entry = self._index.get(source_file) if self._index is not None else None
+        size = entry.size if entry is not None else os.path.getsize(source_file)
+        return size >= self.xml_stream_threshold
+    
+    def _stream_progress(self, source_file):
+        """Callback de bytes lidos para o streaming, ou None sem stats_callback."""
+        if self._progress is None:
+            return None
+        return lambda bytes_read: self._progress.advance_file(source_file, bytes_read)
     
     def _translate_xml_file(self, source_file, target_file, target_language):
         """Traduz um arquivo XML."""
         try:
-            tree = ET.parse(source_file)
-            root = tree.getroot()
-            
-            if target_language in self.language_map:
-                dest_lang = self.language_map[target_language]
-            else:
-                dest_lang = target_language
-            
-            def translate_element(element):
-                if element.text and element.text.strip():
-                    text = element.text.strip()
-                    if not re.match(r'^[\s\d\W]+$', text) and len(text) > 1:
-                        try:
-                            import time
-                            time.sleep(0.1)
-                            
-                            translator = GoogleTranslator(source='auto', target=dest_lang)
-                            translated = translator.translate(text)
-                            if translated:
-                                element.text = translated
-                        except Exception as e:
-                            print(f"Erro ao traduzir texto XML: {text} - {str(e)}")
-                
-                for attr_name, attr_value in element.attrib.items():
-                    if attr_value.strip() and not re.match(r'^[\s\d\W]+$', attr_value) and len(attr_value) > 1:
-                        try:
-                            translator = GoogleTranslator(source='auto', target=dest_lang)
-                            translated = translator.translate(attr_value)
-                            if translated:
-                                element.attrib[attr_name] = translated
-                        except:
-                            pass
-                
-                for child in element:
-                    translate_element(child)
-            
-            translate_element(root)
-            
-            tree.write(target_file, encoding='utf-8', xml_declaration=True)
+            if self._should_stream_xml(source_file):
+                dest_lang = self._resolve_language(target_language)
+                streamer = StreamingXMLTranslator(
+                    lambda texts: self._translate_segments(texts, dest_lang, remember=False),
+                    is_translatable,
+                    normalize,
+                    batch_size=self.batch_size * 4,
+                    on_progress=self._stream_progress(source_file),
+                    rules=self.rules
+                )
+                with self._stage("stream", source_file):
+                    streamer.translate_file(source_file, target_file)
+                return
             
+            self._translate_document(source_file, target_file, target_language, 'xml')
+        except TranslationCancelled:
+            raise
         except Exception as e:
             print(f"Erro ao traduzir {source_file}: {str(e)}")
-            with open(source_file, 'rb') as src, open(target_file, 'wb') as dst:
-                dst.write(src.read())
\ No newline at end of file
+            copy_file(source_file, target_file, skip_unchanged=False)
+
+
+_worker_translator = None
+
+# Estatísticas contadas nos processos do pool e somadas no processo principal.
+_WORKER_COUNTERS = ("glossary_terms", "protected_segments")
+
+
+def _init_worker(memo, dest_lang, options, instrumentation=None):
+    """Prepara o tradutor de cada processo do pool com as traduções da execução."""
+    global _worker_translator
+    if instrumentation is not None:
+        buckets, per_file = instrumentation
+        options = dict(options, instrumentation=Instrumentation(buckets, per_file))
+    _worker_translator = HTMLXMLTranslator(backend=NullBackend(), **options)
+    _worker_translator._memo[dest_lang] = memo
+
+
+def _worker_timings():
+    """Medições acumuladas pelo processo desde a última tarefa, para o processo principal."""
+    if _worker_translator.instrumentation is None:
+        return None
+    return _worker_translator.instrumentation.drain()
+
+
+def _worker_counters():
+    """Contadores das regras acumulados pelo processo desde a última tarefa."""
+    counters = {}
+    for name in _WORKER_COUNTERS:
+        counters[name] = _worker_translator.stats[name]
+        _worker_translator.stats[name] = 0
+    return counters
+
+
+def _worker_collect(source_file):
+    return _worker_translator._collect_texts(source_file), _worker_timings()
+
+
+def _worker_process(task, dest_lang):
+    result = _worker_translator._process_task(task, dest_lang)
+    failed = task[1] in _worker_translator._failed_files
+    _worker_translator._failed_files.discard(task[1])
+    return result, _worker_timings(), _worker_counters(), failed
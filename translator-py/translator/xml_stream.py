@@ -0,0 +1,160 @@
+import os
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+from translator.rules import PathNode
+
+_ATTR_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#09;'}
+
+
+class StreamingXMLTranslator:
+    """Tradução de XML por eventos do iterparse, sem carregar a árvore inteira.
+
+    Cada elemento é escrito assim que seu texto fica disponível e removido
+    do pai logo depois do seu tail, de modo que só a pilha de elementos
+    abertos fica em memória. Os segmentos traduzíveis são acumulados em
+    lotes de batch_size e enviados a `translate` (lista -> lista) antes de
+    a saída correspondente ser gravada. Um lote também é fechado quando a
+    saída pendente passa de max_parts trechos, para que arquivos com poucos
+    textos traduzíveis não fiquem inteiros na memória. Se informado,
+    `on_progress` recebe a cada lote quantos bytes da origem já foram lidos.
+    Elementos protegidos por `rules` (TranslationRules) são copiados sem
+    tradução.
+    """
+
+    def __init__(self, translate, is_translatable, normalize, batch_size=200, on_progress=None, rules=None,
+                 max_parts=65536):
+        self.translate = translate
+        self.is_translatable = is_translatable
+        self.normalize = normalize
+        self.batch_size = batch_size
+        self.max_parts = max_parts
+        self.on_progress = on_progress
+        self.rules = rules if rules is not None and rules.protects_elements else None
+
+    def translate_file(self, source_file, target_file):
+        """Traduz o arquivo gravando num .part, que só substitui o destino ao final."""
+        self._parts = []
+        self._segment_count = 0
+        partial_file = target_file + ".part"
+        try:
+            with open(source_file, 'rb') as source, open(partial_file, 'w', encoding='utf-8') as out:
+                self._source = source
+                self._out = out
+                out.write("<?xml version='1.0' encoding='utf-8'?>\n")
+                self._stream(source)
+                self._flush()
+            os.replace(partial_file, target_file)
+        finally:
+            if os.path.exists(partial_file):
+                os.remove(partial_file)
+
+    def _stream(self, source_file):
+        stack = []
+        prefixes = [{'http://www.w3.org/XML/1998/namespace': 'xml'}]
+        pending_ns = []
+        last_closed = None
+
+        for event, item in ET.iterparse(source_file, events=('start-ns', 'start', 'end')):
+            if event == 'start-ns':
+                pending_ns.append(item)
+                continue
+
+            if last_closed is not None:
+                closed, parent = last_closed
+                if closed.tail:
+                    self._parts.append(escape(closed.tail))
+                if parent is not None:
+                    parent.remove(closed)
+                last_closed = None
+
+            if event == 'start':
+                if stack and not stack[-1][1]:
+                    self._write_head(stack[-1], prefixes)
+                mapping = dict(prefixes[-1])
+                for prefix, uri in pending_ns:
+                    mapping[uri] = prefix
+                prefixes.append(mapping)
+                node = None
+                if self.rules is not None:
+                    parent = stack[-1][3] if stack else None
+                    node = PathNode(item.tag, item.attrib, parent)
+                    node.protected = (parent is not None and parent.protected) or self.rules.protects(node)
+                stack.append([item, False, pending_ns, node])
+                pending_ns = []
+            else:
+                entry = stack[-1]
+                if entry[1]:
+                    self._parts.append(f"</{self._qname(item.tag, prefixes[-1])}>")
+                elif item.text:
+                    self._write_head(entry, prefixes)
+                    self._parts.append(f"</{self._qname(item.tag, prefixes[-1])}>")
+                else:
+                    self._write_head(entry, prefixes, empty=True)
+                stack.pop()
+                prefixes.pop()
+                last_closed = (item, stack[-1][0] if stack else None)
+            self._maybe_flush()
+
+    def _write_head(self, entry, prefixes, empty=False):
+        element, _, ns_decls, node = entry
+        protected = node is not None and node.protected
+        entry[1] = True
+        mapping = prefixes[-1]
+        self._parts.append(f"<{self._qname(element.tag, mapping)}")
+        for prefix, uri in ns_decls:
+            name = f"xmlns:{prefix}" if prefix else "xmlns"
+            self._parts.append(f' {name}="{escape(uri, _ATTR_ENTITIES)}"')
+        for name, value in element.attrib.items():
+            self._parts.append(f" {self._qname(name, mapping)}=\"")
+            self._emit_value(value, attribute=True, protected=protected)
+            self._parts.append('"')
+        if empty:
+            self._parts.append(" />")
+        else:
+            self._parts.append(">")
+            self._emit_text(element.text, protected)
+
+    def _emit_text(self, value, protected=False):
+        if value:
+            if value.strip():
+                self._emit_value(value, protected=protected)
+            else:
+                self._parts.append(escape(value))
+
+    def _emit_value(self, value, attribute=False, protected=False):
+        text = self.normalize(value)
+        if not protected and self.is_translatable(text):
+            self._parts.append((text, value, attribute))
+            self._segment_count += 1
+        else:
+            self._parts.append(escape(value, _ATTR_ENTITIES) if attribute else escape(value))
+
+    def _maybe_flush(self):
+        if self._segment_count >= self.batch_size or len(self._parts) >= self.max_parts:
+            self._flush()
+
+    def _flush(self):
+        segments = [part for part in self._parts if isinstance(part, tuple)]
+        translations = iter(self.translate([text for text, _, _ in segments]) if segments else [])
+        for part in self._parts:
+            if isinstance(part, tuple):
+                text, original, attribute = part
+                translated = next(translations)
+                if not translated or translated == text:
+                    translated = original
+                part = escape(translated, _ATTR_ENTITIES) if attribute else escape(translated)
+            self._out.write(part)
+        self._parts = []
+        self._segment_count = 0
+        if self.on_progress is not None:
+            self.on_progress(self._source.tell())
+
+    def _qname(self, tag, mapping):
+        if tag[:1] != '{':
+            return tag
+        uri, local = tag[1:].split('}', 1)
+        prefix = mapping.get(uri)
+        if prefix is None:
+            raise ValueError(f"Namespace sem prefixo: {uri}")
+        return f"{prefix}:{local}" if prefix else local
@@ -16,10 +16,18 @@ class LanguageManager:
                 "theme": "Tema:",
                 "progress": "Progresso:",
                 "translate_button": "Traduzir",
+                "resume_button": "Retomar trabalho",
+                "pause_button": "Pausar",
+                "continue_button": "Continuar",
+                "cancel_button": "Cancelar",
                 "warning": "Aviso",
                 "select_folders": "Selecione as pastas de origem e destino.",
                 "success": "Sucesso",
                 "translation_complete": "Tradução concluída com sucesso!",
+                "scanning": "Analisando a pasta de origem...",
+                "scan_summary": "{files} arquivos HTML/XML · {megabytes:.1f} MB · cerca de {segments} segmentos",
+                "stats_summary": "{segments_done}/{segments_total} segmentos · {files_done}/{files_total} arquivos · {megabytes:.1f} MB · {calls_per_sec:.1f} chamadas/s · memória {cache_hit_rate:.0f}% · restante {eta}",
+                "translation_cancelled": "Tradução cancelada. Use \"Retomar trabalho\" para continuar de onde parou.",
                 "error": "Erro",
                 "no_html_xml": "A pasta selecionada não contém arquivos HTML ou XML para tradução.",
                 "select_source": "Selecionar Pasta de Origem",
@@ -45,10 +53,18 @@ class LanguageManager:
                 "theme": "Theme:",
                 "progress": "Progress:",
                 "translate_button": "Translate",
+                "resume_button": "Resume job",
+                "pause_button": "Pause",
+                "continue_button": "Continue",
+                "cancel_button": "Cancel",
                 "warning": "Warning",
                 "select_folders": "Please select source and target folders.",
                 "success": "Success",
                 "translation_complete": "Translation completed successfully!",
+                "scanning": "Scanning the source folder...",
+                "scan_summary": "{files} HTML/XML files · {megabytes:.1f} MB · about {segments} segments",
+                "stats_summary": "{segments_done}/{segments_total} segments · {files_done}/{files_total} files · {megabytes:.1f} MB · {calls_per_sec:.1f} calls/s · cache {cache_hit_rate:.0f}% · ETA {eta}",
+                "translation_cancelled": "Translation cancelled. Use \"Resume job\" to continue where it stopped.",
                 "error": "Error",
                 "no_html_xml": "The selected folder does not contain HTML or XML files for translation.",
                 "select_source": "Select Source Folder",
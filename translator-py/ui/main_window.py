@@ -5,6 +5,9 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QIcon
 from translator.translator import HTMLXMLTranslator
+from translator.journal import JobJournal
+from translator.control import JobControl, TranslationCancelled
+from translator.scan import scan_directory
 from ui.theme_manager import ThemeManager
 from ui.language_manager import LanguageManager
 import sys  
@@ -12,35 +15,61 @@ import traceback
 
 class TranslationThread(QThread):
     progress_signal = pyqtSignal(int)
+    stats_signal = pyqtSignal(dict)
     finished_signal = pyqtSignal(bool, str)
+    cancelled_signal = pyqtSignal()
+    stats_interval = 0.25
     
-    def __init__(self, source_dir, target_dir, target_language):
+    def __init__(self, source_dir, target_dir, target_language, resume=False):
         super().__init__()
         self.source_dir = source_dir
         self.target_dir = target_dir
         self.target_language = target_language
+        self.resume = resume
+        self.control = JobControl()
         
     def run(self):
+        translator = None
         try:
             translator = HTMLXMLTranslator()
-            total_files = translator.count_files(self.source_dir)
-            processed = 0
             
-            def progress_callback():
-                nonlocal processed
-                processed += 1
-                progress = int((processed / total_files) * 100)
-                self.progress_signal.emit(progress)
+            def stats_callback(event):
+                self.progress_signal.emit(int(event["percent"]))
+                self.stats_signal.emit(event)
             
             translator.translate_directory(
                 self.source_dir, 
                 self.target_dir, 
                 self.target_language,
-                progress_callback
+                resume=self.resume,
+                control=self.control,
+                stats_callback=stats_callback,
+                stats_interval=self.stats_interval
             )
             self.finished_signal.emit(True, "Tradução concluída com sucesso!")
+        except TranslationCancelled:
+            self.cancelled_signal.emit()
         except Exception as e:
             self.finished_signal.emit(False, f"Erro durante a tradução: {str(e)}")
+        finally:
+            if translator is not None:
+                translator.close()
+
+class ScanThread(QThread):
+    """Varre a pasta de origem fora da thread da interface."""
+    finished_signal = pyqtSignal(str, object)
+    
+    def __init__(self, source_dir, parent=None):
+        super().__init__(parent)
+        self.source_dir = source_dir
+        
+    def run(self):
+        try:
+            index = scan_directory(self.source_dir)
+        except Exception as e:
+            print(f"Erro ao varrer {self.source_dir}: {str(e)}")
+            index = None
+        self.finished_signal.emit(self.source_dir, index)
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -48,6 +77,8 @@ class MainWindow(QMainWindow):
         
         self.source_dir = ""
         self.target_dir = ""
+        self.file_index = None
+        self.scanning = False
         self.theme_manager = ThemeManager()
         self.language_manager = LanguageManager()
         
@@ -126,14 +157,28 @@ class MainWindow(QMainWindow):
         self.progress_label = QLabel(self.language_manager.get_text("progress"))
         self.progress_bar = QProgressBar()
         self.progress_bar.setValue(0)
+        self.stats_label = QLabel("")
         progress_layout.addWidget(self.progress_label)
         progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.stats_label)
 
         action_layout = QHBoxLayout()
         self.translate_btn = QPushButton(self.language_manager.get_text("translate_button"))
         self.translate_btn.clicked.connect(self.start_translation)
         self.translate_btn.setEnabled(False)
+        self.resume_btn = QPushButton(self.language_manager.get_text("resume_button"))
+        self.resume_btn.clicked.connect(self.resume_translation)
+        self.resume_btn.setEnabled(False)
+        self.pause_btn = QPushButton(self.language_manager.get_text("pause_button"))
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        self.pause_btn.setEnabled(False)
+        self.cancel_btn = QPushButton(self.language_manager.get_text("cancel_button"))
+        self.cancel_btn.clicked.connect(self.cancel_translation)
+        self.cancel_btn.setEnabled(False)
         action_layout.addStretch()
+        action_layout.addWidget(self.pause_btn)
+        action_layout.addWidget(self.cancel_btn)
+        action_layout.addWidget(self.resume_btn)
         action_layout.addWidget(self.translate_btn)
 
         main_layout.addWidget(dir_group)
@@ -149,23 +194,38 @@ class MainWindow(QMainWindow):
         if dir_path:
             self.source_dir = dir_path
             self.source_path_label.setText(dir_path)
+            self.file_index = None
+            self.stats_label.setText(self.language_manager.get_text("scanning"))
 
-            has_html_xml = self.check_for_html_xml_files(dir_path)
-            if not has_html_xml:
-                QMessageBox.warning(
-                    self, 
-                    self.language_manager.get_text("warning"), 
-                    self.language_manager.get_text("no_html_xml")
-                )
+            # A janela é dona da thread: trocar de pasta no meio de uma varredura
+            # não pode liberar a anterior enquanto ela ainda roda.
+            scan_thread = ScanThread(dir_path, self)
+            scan_thread.finished_signal.connect(self.scan_finished)
+            scan_thread.finished.connect(scan_thread.deleteLater)
+            self.scanning = True
+            scan_thread.start()
             self.update_translate_button()
             
-    def check_for_html_xml_files(self, directory):
-        """Verifica se o diretório contém arquivos HTML ou XML."""
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.lower().endswith(('.html', '.htm', '.xml')):
-                    return True
-        return False
+    def scan_finished(self, source_dir, index):
+        """Recebe o índice da varredura e verifica se há arquivos HTML ou XML."""
+        if source_dir != self.source_dir:
+            return
+        self.scanning = False
+        self.file_index = index
+        self.stats_label.setText("")
+        if index is not None and not index.has_translatable:
+            QMessageBox.warning(
+                self, 
+                self.language_manager.get_text("warning"), 
+                self.language_manager.get_text("no_html_xml")
+            )
+        elif index is not None:
+            self.stats_label.setText(self.language_manager.get_text("scan_summary").format(
+                files=index.translatable_count,
+                megabytes=index.translatable_bytes / (1024 * 1024),
+                segments=index.estimated_segments
+            ))
+        self.update_translate_button()
         
     def select_target_dir(self):
         dir_path = QFileDialog.getExistingDirectory(self, self.language_manager.get_text("select_target"))
@@ -175,7 +235,9 @@ class MainWindow(QMainWindow):
             self.update_translate_button()
             
     def update_translate_button(self):
-        self.translate_btn.setEnabled(bool(self.source_dir and self.target_dir))
+        ready = bool(self.source_dir and self.target_dir) and not self.scanning
+        self.translate_btn.setEnabled(ready)
+        self.resume_btn.setEnabled(ready and JobJournal.exists(self.target_dir))
         
     def toggle_theme(self, state):
         self.theme_manager.set_dark_mode(state == 2) 
@@ -213,11 +275,15 @@ class MainWindow(QMainWindow):
 
                 try:
                     self.progress_label.setText(self.language_manager.get_text("progress"))
+                    self.stats_label.setText("")
                 except AttributeError:
                     pass
 
                 try:
                     self.translate_btn.setText(self.language_manager.get_text("translate_button"))
+                    self.resume_btn.setText(self.language_manager.get_text("resume_button"))
+                    self.cancel_btn.setText(self.language_manager.get_text("cancel_button"))
+                    self.update_pause_button()
                 except AttributeError:
                     pass
 
@@ -229,7 +295,7 @@ class MainWindow(QMainWindow):
                 buttons = self.findChildren(QPushButton)
                 for button in buttons:
                     try:
-                        if button != self.translate_btn and isinstance(button, QPushButton):
+                        if button not in (self.translate_btn, self.resume_btn, self.pause_btn, self.cancel_btn) and isinstance(button, QPushButton):
                             if "Select" in button.text() or "Selecionar" in button.text():
                                 button.setText(self.language_manager.get_text("select_button"))
                     except AttributeError:
@@ -248,7 +314,7 @@ class MainWindow(QMainWindow):
 
                 labels = self.findChildren(QLabel)
                 for label in labels:
-                    if label == self.source_path_label or label == self.target_path_label or label == self.progress_label:
+                    if label in (self.source_path_label, self.target_path_label, self.progress_label, self.stats_label):
                         continue
                     try:
                         if isinstance(label, QLabel):
@@ -292,7 +358,9 @@ class MainWindow(QMainWindow):
                 self.ui_lang_combo.blockSignals(False)  
             except Exception as e:
                 print(f"Error updating UI texts: {str(e)}")
-    def start_translation(self):
+    def resume_translation(self):
+            self.start_translation(resume=True)
+    def start_translation(self, resume=False):
             if not self.source_dir or not self.target_dir:
                 QMessageBox.warning(
                     self, 
@@ -303,20 +371,69 @@ class MainWindow(QMainWindow):
             target_language = self.lang_combo.currentData()
 
             self.translate_btn.setEnabled(False)
+            self.resume_btn.setEnabled(False)
             self.progress_bar.setValue(0)
+            self.stats_label.setText("")
 
+            # O índice da seleção da pasta serve só para o resumo; cada execução
+            # varre a origem de novo para enxergar o que mudou desde então.
             self.translation_thread = TranslationThread(
                 self.source_dir, 
                 self.target_dir, 
-                target_language
+                target_language,
+                resume
             )
             self.translation_thread.progress_signal.connect(self.update_progress)
+            self.translation_thread.stats_signal.connect(self.update_stats)
             self.translation_thread.finished_signal.connect(self.translation_finished)
+            self.translation_thread.cancelled_signal.connect(self.translation_cancelled)
             self.translation_thread.start()
+            self.set_job_running(True)
+    def set_job_running(self, running):
+            self.pause_btn.setEnabled(running)
+            self.cancel_btn.setEnabled(running)
+            self.update_pause_button()
+    def update_pause_button(self):
+            thread = getattr(self, "translation_thread", None)
+            paused = thread is not None and thread.isRunning() and thread.control.paused
+            self.pause_btn.setText(self.language_manager.get_text("continue_button" if paused else "pause_button"))
+    def toggle_pause(self):
+            control = self.translation_thread.control
+            if control.paused:
+                control.resume()
+            else:
+                control.pause()
+            self.update_pause_button()
+    def cancel_translation(self):
+            self.translation_thread.control.cancel()
+            self.pause_btn.setEnabled(False)
+            self.cancel_btn.setEnabled(False)
     def update_progress(self, value):
             self.progress_bar.setValue(value)
+    def update_stats(self, event):
+            eta = event["eta_seconds"]
+            eta_text = "--" if eta is None else f"{int(eta // 60)}:{int(eta % 60):02d}"
+            self.stats_label.setText(self.language_manager.get_text("stats_summary").format(
+                segments_done=event["segments_done"],
+                segments_total=event["segments_total"],
+                files_done=event["files_done"],
+                files_total=event["files_total"],
+                megabytes=event["bytes_done"] / (1024 * 1024),
+                calls_per_sec=event["calls_per_sec"],
+                cache_hit_rate=event["cache_hit_rate"] * 100,
+                eta=eta_text
+            ))
+    def translation_cancelled(self):
+            self.set_job_running(False)
+            self.update_translate_button()
+            QMessageBox.information(
+                self, 
+                self.language_manager.get_text("warning"), 
+                self.language_manager.get_text("translation_cancelled")
+            )
     def translation_finished(self, success, message):
-            self.translate_btn.setEnabled(True)
+            self.set_job_running(False)
+            self.update_translate_button()
             
             if success:
                 QMessageBox.information(